@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Compares VideoAudioExtractor paths: moviepy, ffmpeg transcode and ffmpeg stream copy.
+
+Usage: python benchmarks/bench_audio_extract.py --seconds 300
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from extractAduio import VideoAudioExtractor
+from fixtures import make_test_video
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark audio extraction paths')
+    parser.add_argument('--seconds', type=int, default=300, help='Length of the test video')
+    parser.add_argument('--threads', type=int, default=0, help='ffmpeg thread count')
+    args = parser.parse_args()
+
+    if not shutil.which('ffmpeg'):
+        print("Error: ffmpeg is required for this benchmark", file=sys.stderr)
+        sys.exit(1)
+
+    video_path = make_test_video(seconds=args.seconds, audio=True)
+    extractor = VideoAudioExtractor(video_path)
+    cases = [
+        ('ffmpeg copy (auto)', dict(audio_format='auto', backend='ffmpeg')),
+        ('ffmpeg mp3', dict(audio_format='mp3', backend='ffmpeg')),
+        ('moviepy mp3', dict(audio_format='mp3', backend='moviepy')),
+    ]
+
+    print(f"Video: {video_path}\n")
+    output_dir = tempfile.mkdtemp(prefix='bench_audio_')
+    try:
+        for name, kwargs in cases:
+            output_path = os.path.join(output_dir, 'audio.mp3')
+            start = time.perf_counter()
+            try:
+                result = extractor.extract_audio(output_path, threads=args.threads, **kwargs)
+            except ImportError:
+                print(f"{name:<20} skipped (not installed)")
+                continue
+            elapsed = time.perf_counter() - start
+            print(f"{name:<20} {elapsed:>8.2f}s  {os.path.getsize(result) / 1024:>10.1f} KB  {os.path.basename(result)}")
+            os.remove(result)
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
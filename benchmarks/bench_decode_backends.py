@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Compares the FrameExtractor decode backends (CPU only) on a synthetic video.
+
+Every backend decodes the whole file through iter_frames at full size, scaled
+to --max-dimension, and keyframes only, for each decoder thread count. Decode
+times are reported in seconds with the number of frames decoded.
+
+Usage: python benchmarks/bench_decode_backends.py --seconds 60 --threads 1 0 --max-dimension 320
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from get_frames import DECODE_BACKENDS, FrameExtractor
+from fixtures import make_test_video
+
+
+def _decode(video_path: str, folder: str, backend: str, threads: int, **options):
+    extractor = FrameExtractor(video_path, folder, backend=backend, decode_threads=threads)
+    start = time.perf_counter()
+    frames = sum(1 for _ in extractor.iter_frames(**options))
+    return time.perf_counter() - start, frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark frame decode backends')
+    parser.add_argument('--seconds', type=int, default=60, help='Length of the test video')
+    parser.add_argument('--size', default='1280x720', help='Frame size of the test video (WxH)')
+    parser.add_argument('--gop', type=int, default=50, help='Keyframe interval of the test video')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 0],
+                        help='Decoder thread counts to compare (0 = backend default)')
+    parser.add_argument('--max-dimension', type=int, default=320, help='Longer side for the scaled runs')
+    parser.add_argument('--backends', nargs='+', default=list(DECODE_BACKENDS), choices=DECODE_BACKENDS)
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split('x'))
+    video_path = make_test_video(seconds=args.seconds, size=(width, height), gop=args.gop)
+    print(f"Video: {video_path}\n")
+
+    modes = (
+        ('full', {}),
+        (f'max {args.max_dimension}px', {'max_dimension': args.max_dimension}),
+        ('keyframes', {'keyframes_only': True}),
+    )
+    print(f"{'backend':>8} {'threads':>7} " + " ".join(f"{name:>20}" for name, _ in modes))
+    with tempfile.TemporaryDirectory(prefix='bench_decode_') as folder:
+        for backend in args.backends:
+            for threads in args.threads:
+                cells = []
+                for _, options in modes:
+                    if backend == 'opencv' and options.get('keyframes_only'):
+                        cells.append(f"{'n/a':>20}")
+                        continue
+                    try:
+                        elapsed, frames = _decode(video_path, folder, backend, threads, **options)
+                    except ImportError:
+                        cells.append(f"{'not installed':>20}")
+                        continue
+                    cells.append(f"{elapsed:>8.2f}s {frames:>6} frames")
+                print(f"{backend:>8} {threads:>7} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Compares the FrameExtractor.extract_n_frames read strategies on a synthetic video.
+
+Usage: python benchmarks/bench_extract_n_frames.py --seconds 120 --counts 10 100 500
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from get_frames import FrameExtractor, READ_STRATEGIES
+from fixtures import make_test_video
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark extract_n_frames read strategies')
+    parser.add_argument('--seconds', type=int, default=120, help='Length of the test video')
+    parser.add_argument('--gop', type=int, default=250, help='Keyframe interval of the test video')
+    parser.add_argument('--counts', type=int, nargs='+', default=[10, 100, 500],
+                        help='Numbers of frames to extract')
+    args = parser.parse_args()
+
+    video_path = make_test_video(seconds=args.seconds, gop=args.gop)
+    print(f"Video: {video_path}\n")
+    print(f"{'frames':>8} " + " ".join(f"{s:>12}" for s in READ_STRATEGIES))
+
+    for n in args.counts:
+        timings = []
+        for strategy in READ_STRATEGIES:
+            output_dir = tempfile.mkdtemp(prefix='bench_frames_')
+            try:
+                extractor = FrameExtractor(video_path, output_dir)
+                start = time.perf_counter()
+                extractor.extract_n_frames(n, strategy=strategy)
+                timings.append(time.perf_counter() - start)
+            finally:
+                shutil.rmtree(output_dir, ignore_errors=True)
+        print(f"{n:>8} " + " ".join(f"{t:>11.2f}s" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
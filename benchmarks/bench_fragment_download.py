@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Measures HLS download time against concurrent fragment count.
+
+A local server serves an HLS fixture with per-request latency and a
+per-connection bandwidth cap, the way throttled CDNs behave, so parallel
+fragment fetching is what lets a download fill the link.
+
+Usage: python benchmarks/bench_fragment_download.py --seconds 60 --fragments 1 4 8 16
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from download_yt import download_youtube_video, get_video_info
+from fixtures import make_hls_fixture, make_test_video, serve_folder
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent fragment downloads')
+    parser.add_argument('--seconds', type=int, default=60, help='Length of the test video')
+    parser.add_argument('--fragments', type=int, nargs='+', default=[1, 4, 8, 16],
+                        help='Concurrent fragment counts to compare')
+    parser.add_argument('--latency', type=float, default=0.05, help='Per-request latency in seconds')
+    parser.add_argument('--bandwidth', type=float, default=2.0,
+                        help='Per-connection bandwidth in MB/s')
+    parser.add_argument('--no-keep-alive', action='store_true', help='Close connections after each request')
+    args = parser.parse_args()
+
+    if not shutil.which('ffmpeg'):
+        print("Error: ffmpeg is required for this benchmark", file=sys.stderr)
+        sys.exit(1)
+
+    video_path = make_test_video(seconds=args.seconds, gop=25, audio=True)
+    playlist = make_hls_fixture(video_path, segment_seconds=1)
+    folder = os.path.dirname(playlist)
+    total = sum(os.path.getsize(os.path.join(folder, f)) for f in os.listdir(folder))
+    server, base_url = serve_folder(folder, latency=args.latency, bandwidth=args.bandwidth * 1024 ** 2)
+    url = f"{base_url}/index.m3u8"
+
+    print(f"Playlist: {url} ({len(os.listdir(folder)) - 1} fragments, {total / 1024 ** 2:.1f} MB)")
+    print(f"Latency {args.latency * 1000:.0f} ms, {args.bandwidth:g} MB/s per connection\n")
+    print(f"{'fragments':>9} {'seconds':>9} {'MB/s':>8} {'speedup':>8}")
+
+    info = get_video_info(url)
+    baseline = None
+    try:
+        for count in args.fragments:
+            output_dir = tempfile.mkdtemp(prefix='bench_frag_')
+            try:
+                start = time.perf_counter()
+                download_youtube_video(url, output_dir, info=info, quiet=True,
+                                       concurrent_fragments=count, keep_alive=not args.no_keep_alive)
+                elapsed = time.perf_counter() - start
+            finally:
+                shutil.rmtree(output_dir, ignore_errors=True)
+            baseline = baseline or elapsed
+            print(f"{count:>9} {elapsed:>9.2f} {total / 1024 ** 2 / elapsed:>8.2f} {baseline / elapsed:>7.1f}x")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Load-tests the production server (gunicorn + wsgi.py) at several worker counts.
+
+For each worker count a fresh server is started on a private temp storage, a
+frames job is queued, and concurrent clients then poll that job (answered from
+the shared job store by whichever worker receives the request) and fetch the
+home page. Throughput and latency percentiles are reported per worker count.
+
+Usage: python benchmarks/bench_serving.py --workers 1 2 4 --clients 16 --seconds 10
+"""
+
+import argparse
+import http.client
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fixtures import make_test_video
+
+WEB_APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'webApp'))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(workers: int, threads: int, port: int, temp_dir: str):
+    env = dict(os.environ, TMPDIR=temp_dir)
+    command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--workers', str(workers),
+               '--threads', str(threads), '--bind', f'127.0.0.1:{port}', 'wsgi:app']
+    server = subprocess.Popen(command, cwd=WEB_APP_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return server
+        except OSError:
+            if server.poll() is not None:
+                break
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError('gunicorn did not start (is it installed? pip install gunicorn)')
+
+
+def _queue_job(port: int, video_path: str) -> str:
+    boundary = uuid.uuid4().hex
+    with open(video_path, 'rb') as f:
+        video = f.read()
+    body = b''.join([
+        f'--{boundary}\r\nContent-Disposition: form-data; name="extraction_mode"\r\n\r\nn_frames\r\n'.encode(),
+        f'--{boundary}\r\nContent-Disposition: form-data; name="param_value"\r\n\r\n5\r\n'.encode(),
+        f'--{boundary}\r\nContent-Disposition: form-data; name="video_file"; filename="bench.mp4"\r\n'
+        f'Content-Type: video/mp4\r\n\r\n'.encode(), video, f'\r\n--{boundary}--\r\n'.encode(),
+    ])
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    conn.request('POST', '/api/frames/extract', body,
+                 {'Content-Type': f'multipart/form-data; boundary={boundary}'})
+    response = conn.getresponse()
+    data = json.loads(response.read())
+    conn.close()
+    if 'job_id' not in data:
+        raise RuntimeError(f"Could not queue a job: {data}")
+    return data['job_id']
+
+
+def _client(port: int, paths, stop_at: float, latencies: list, errors: list) -> None:
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    i = 0
+    while time.perf_counter() < stop_at:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException):
+            errors.append('connection')
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def _percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the gunicorn deployment')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='Worker process counts')
+    parser.add_argument('--threads', type=int, default=8, help='Threads per worker')
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent client connections')
+    parser.add_argument('--seconds', type=float, default=10.0, help='Duration of each run')
+    args = parser.parse_args()
+
+    video_path = make_test_video(seconds=5)
+    print(f"{'workers':>8} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for workers in args.workers:
+        temp_dir = tempfile.mkdtemp(prefix='bench_serving_')
+        port = _free_port()
+        server = _start_server(workers, args.threads, port, temp_dir)
+        try:
+            job_id = _queue_job(port, video_path)
+            paths = [f'/api/jobs/{job_id}', '/']
+            latencies, errors = [], []
+            stop_at = time.perf_counter() + args.seconds
+            clients = [threading.Thread(target=_client, args=(port, paths, stop_at, latencies, errors))
+                       for _ in range(args.clients)]
+            for client in clients:
+                client.start()
+            for client in clients:
+                client.join()
+            print(f"{workers:>8} {len(latencies):>9} {len(latencies) / args.seconds:>9.0f} "
+                  f"{_percentile(latencies, 0.5) * 1000:>8.1f} {_percentile(latencies, 0.99) * 1000:>8.1f} "
+                  f"{len(errors):>7}")
+        finally:
+            server.terminate()
+            server.wait()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
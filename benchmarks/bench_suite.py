@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite covering every processing path, with JSON results for comparing runs.
+
+Deterministic test videos (testsrc with a sine audio track) are generated for
+every combination of --seconds, --sizes, --gops and --codecs. For each video
+the suite times get_total_frames, every FrameExtractor mode (per decode
+backend), audio extraction, the frames ZIP endpoint and yt-dlp downloads of
+the progressive file and of an HLS copy served by a local fixture server, so
+no network is needed.
+
+Every run executes in a fresh process, so the reported peak RSS belongs to
+that case alone (the suite's own imports included; ffmpeg subprocesses are
+reported separately). Bytes written is the size of the case's output (for
+the ZIP endpoint, the bytes streamed to the client).
+
+Usage:
+  python benchmarks/bench_suite.py --output before.json
+  python benchmarks/bench_suite.py --quick --cases 'frames:*' --backends opencv pyav
+  python benchmarks/bench_suite.py --compare before.json after.json
+
+--compare exits with status 1 when a case got slower by more than --threshold.
+"""
+
+import argparse
+import datetime
+import fnmatch
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS
+    resource = None
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fixtures import make_hls_fixture, make_test_video, serve_folder
+
+WEB_APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'webApp'))
+
+# Parameters of the frame extraction cases
+N_FRAMES = 50
+EVERY_NTH = 10
+STORYBOARD_TILES = 100
+
+# Relative wall-time change reported as a regression or an improvement by --compare
+COMPARE_THRESHOLD = 0.10
+
+
+def _output_size(path: str) -> int:
+    total = 0
+    for folder, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(folder, name)) for name in files)
+    return total
+
+
+# Each case prepares its inputs and returns the callable that is timed; the
+# callable returns the number of frames produced (None where not applicable)
+# and, optionally, the bytes written when they are not the output folder size
+
+def _total_frames_case(video, work_dir, backend):
+    import get_frames
+
+    def run():
+        get_frames._frame_count_cache.clear()
+        return get_frames.get_total_frames(video), None
+    return run
+
+
+def _frames_case(mode):
+    def case(video, work_dir, backend):
+        from get_frames import FrameExtractor, get_total_frames
+
+        extractor = FrameExtractor(video, work_dir, backend=backend, workers=os.cpu_count() or 1)
+        if mode == 'n_frames':
+            return lambda: (extractor.extract_n_frames(N_FRAMES), None)
+        if mode == 'every_nth':
+            return lambda: (extractor.extract_every_nth(EVERY_NTH), None)
+        if mode == 'all':
+            return lambda: (extractor.extract_frames(), None)
+        if mode == 'scene':
+            return lambda: (extractor.extract_scene_changes(), None)
+        tiles = min(STORYBOARD_TILES, get_total_frames(video))
+        return lambda: (len(extractor.extract_storyboard(tiles)['times']), None)
+    return case
+
+
+def _audio_case(audio_format):
+    def case(video, work_dir, backend):
+        from extractAduio import VideoAudioExtractor
+
+        extractor = VideoAudioExtractor(video)
+        output_path = os.path.join(work_dir, f'audio.{"mka" if audio_format == "auto" else audio_format}')
+
+        def run():
+            extractor.extract_audio(output_path, audio_format=audio_format, backend='ffmpeg')
+            return None, None
+        return run
+    return case
+
+
+def _zip_case(video, work_dir, backend):
+    # The app keeps its temp storage under the system temp folder; point it at the work folder
+    os.environ['TMPDIR'] = work_dir
+    tempfile.tempdir = None
+    sys.path.insert(0, WEB_APP_DIR)
+    import app as web_app
+    from get_frames import FrameExtractor
+
+    folder = tempfile.mkdtemp(prefix='frames_bench_', dir=web_app.TEMP_ROOT)
+    frames = FrameExtractor(video, folder, backend=backend).extract_every_nth(EVERY_NTH)
+    client = web_app.app.test_client()
+
+    def run():
+        response = client.get(f'/api/frames/download-all/{os.path.basename(folder)}')
+        streamed = sum(len(chunk) for chunk in response.response)
+        response.close()
+        return frames, streamed
+    return run
+
+
+def _download_case(kind):
+    def case(video, work_dir, backend):
+        from download_yt import download_youtube_video, get_video_info
+
+        if kind == 'hls':
+            playlist = make_hls_fixture(video, segment_seconds=1)
+            server, base_url = serve_folder(os.path.dirname(playlist))
+            url = f'{base_url}/{os.path.basename(playlist)}'
+        else:
+            server, base_url = serve_folder(os.path.dirname(video))
+            url = f'{base_url}/{os.path.basename(video)}'
+        info = get_video_info(url)
+        output_dir = os.path.join(work_dir, 'download')
+
+        def run():
+            try:
+                download_youtube_video(url, output_dir, info=info, quiet=True)
+            finally:
+                server.shutdown()
+            return None, None
+        return run
+    return case
+
+
+# name -> (case, whether it depends on the decode backend)
+CASES = {
+    'total_frames': (_total_frames_case, False),
+    'frames:n_frames': (_frames_case('n_frames'), True),
+    'frames:every_nth': (_frames_case('every_nth'), True),
+    'frames:all': (_frames_case('all'), True),
+    'frames:scene': (_frames_case('scene'), True),
+    'frames:storyboard': (_frames_case('storyboard'), True),
+    'audio:mp3': (_audio_case('mp3'), False),
+    'audio:copy': (_audio_case('auto'), False),
+    'zip': (_zip_case, False),
+    'download:progressive': (_download_case('progressive'), False),
+    'download:hls': (_download_case('hls'), False),
+}
+
+
+def _run_case(name: str, video: str, backend: str) -> dict:
+    """Runs one case in the current (fresh) process and measures it."""
+    work_dir = tempfile.mkdtemp(prefix='bench_suite_')
+    try:
+        try:
+            run = CASES[name][0](video, work_dir, backend)
+            start = time.perf_counter()
+            frames, written = run()
+            elapsed = time.perf_counter() - start
+        except Exception as e:
+            # Some exceptions (e.g. yt-dlp's) hold tracebacks and cannot be sent back to the suite
+            raise RuntimeError(f'{type(e).__name__}: {e}') from None
+        if written is None:
+            written = _output_size(work_dir)
+        measured = {'wall_seconds': elapsed, 'frames': frames, 'bytes_written': written,
+                    'peak_rss_mb': None, 'peak_child_rss_mb': None}
+        if resource is not None:
+            # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+            unit = 1024 ** 2 if sys.platform == 'darwin' else 1024
+            measured['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit
+            measured['peak_child_rss_mb'] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / unit
+        return measured
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _run_isolated(name: str, video: str, backend: str) -> dict:
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(_run_case, name, video, backend).result()
+
+
+def _available_encoders() -> str:
+    result = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'], capture_output=True, text=True)
+    return result.stdout
+
+
+def _ffmpeg_version() -> str:
+    result = subprocess.run(['ffmpeg', '-version'], capture_output=True, text=True)
+    return result.stdout.splitlines()[0] if result.stdout else ''
+
+
+def run_suite(args) -> dict:
+    encoders = _available_encoders()
+    fixtures = []
+    for codec in args.codecs:
+        if f' {codec} ' not in encoders:
+            print(f"Skipping codec {codec}: not supported by this ffmpeg", file=sys.stderr)
+            continue
+        for seconds in args.seconds:
+            for size in args.sizes:
+                for gop in args.gops:
+                    width, height = (int(v) for v in size.lower().split('x'))
+                    name = f'{seconds}s_{width}x{height}_g{gop}_{codec}'
+                    fixtures.append((name, make_test_video(seconds=seconds, size=(width, height), gop=gop,
+                                                           codec=codec, audio=True)))
+
+    cases = [name for name in CASES if any(fnmatch.fnmatch(name, pattern) for pattern in args.cases)]
+    results = []
+    print(f"{'case':<22} {'fixture':<28} {'backend':>8} {'seconds':>9} {'frames/s':>9} "
+          f"{'RSS MB':>8} {'ffmpeg MB':>9} {'written MB':>10}")
+    for fixture, video in fixtures:
+        for name in cases:
+            backends = args.backends if CASES[name][1] else [None]
+            for backend in backends:
+                entry = {'case': name, 'fixture': fixture, 'backend': backend, 'video': os.path.basename(video)}
+                try:
+                    runs = [_run_isolated(name, video, backend or 'opencv') for _ in range(args.repeat)]
+                except Exception as e:
+                    entry['error'] = str(e)
+                    results.append(entry)
+                    print(f"{name:<22} {fixture:<28} {backend or '-':>8} failed: {entry['error']}")
+                    continue
+
+                wall = statistics.median(run['wall_seconds'] for run in runs)
+                frames = runs[0]['frames']
+                peak = [run['peak_rss_mb'] for run in runs if run['peak_rss_mb'] is not None]
+                child = [run['peak_child_rss_mb'] for run in runs if run['peak_child_rss_mb'] is not None]
+                entry.update({
+                    'wall_seconds': wall,
+                    'runs': [run['wall_seconds'] for run in runs],
+                    'frames': frames,
+                    'frames_per_second': frames / wall if frames and wall > 0 else None,
+                    'peak_rss_mb': max(peak) if peak else None,
+                    'peak_child_rss_mb': max(child) if child else None,
+                    'bytes_written': runs[0]['bytes_written'],
+                })
+                results.append(entry)
+                fps = f"{entry['frames_per_second']:>9.1f}" if entry['frames_per_second'] else f"{'-':>9}"
+                print(f"{name:<22} {fixture:<28} {backend or '-':>8} {wall:>9.3f} {fps} "
+                      f"{entry['peak_rss_mb'] or 0:>8.0f} {entry['peak_child_rss_mb'] or 0:>9.0f} "
+                      f"{entry['bytes_written'] / 1024 ** 2:>10.1f}")
+
+    return {
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'ffmpeg': _ffmpeg_version(),
+        'repeat': args.repeat,
+        'results': results,
+    }
+
+
+def compare(before_path: str, after_path: str, threshold: float = COMPARE_THRESHOLD) -> int:
+    """
+    Prints the wall-time change of every case present in both result files.
+
+    :return: Number of regressions beyond the threshold.
+    """
+    with open(before_path, encoding='utf-8') as f:
+        before = json.load(f)
+    with open(after_path, encoding='utf-8') as f:
+        after = json.load(f)
+
+    def index(report):
+        return {(r['case'], r['fixture'], r['backend']): r for r in report['results'] if 'wall_seconds' in r}
+
+    old, new = index(before), index(after)
+    regressions = 0
+    print(f"{'case':<22} {'fixture':<28} {'backend':>8} {'before':>9} {'after':>9} {'change':>8} "
+          f"{'RSS MB':>13}")
+    for key in sorted(old.keys() & new.keys(), key=lambda k: (k[0], k[1], k[2] or '')):
+        a, b = old[key], new[key]
+        change = b['wall_seconds'] / a['wall_seconds'] - 1 if a['wall_seconds'] > 0 else 0.0
+        mark = ''
+        if change > threshold:
+            mark = '  slower'
+            regressions += 1
+        elif change < -threshold:
+            mark = '  faster'
+        rss = f"{a['peak_rss_mb'] or 0:.0f} -> {b['peak_rss_mb'] or 0:.0f}"
+        print(f"{key[0]:<22} {key[1]:<28} {key[2] or '-':>8} {a['wall_seconds']:>9.3f} {b['wall_seconds']:>9.3f} "
+              f"{change * 100:>+7.1f}% {rss:>13}{mark}")
+    for key in sorted(old.keys() ^ new.keys(), key=lambda k: (k[0], k[1], k[2] or '')):
+        print(f"{key[0]:<22} {key[1]:<28} {key[2] or '-':>8} only in {before_path if key in old else after_path}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the benchmark suite or compare two result files')
+    parser.add_argument('--output', default='bench_results.json', help='JSON file the results are written to')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'),
+                        help='Compare two result files instead of running the suite')
+    parser.add_argument('--threshold', type=float, default=COMPARE_THRESHOLD,
+                        help='Relative wall-time change reported by --compare (default: 0.10)')
+    parser.add_argument('--cases', nargs='+', default=['*'], help='Case name patterns, e.g. "frames:*" audio:mp3')
+    parser.add_argument('--backends', nargs='+', default=['opencv'],
+                        help='Decode backends for the frame cases (opencv, pyav, ffmpeg)')
+    parser.add_argument('--seconds', type=int, nargs='+', default=[20], help='Durations of the test videos')
+    parser.add_argument('--sizes', nargs='+', default=['640x360', '1280x720'], help='Frame sizes (WxH)')
+    parser.add_argument('--gops', type=int, nargs='+', default=[25, 250], help='Keyframe intervals')
+    parser.add_argument('--codecs', nargs='+', default=['libx264', 'mpeg4'], help='ffmpeg video encoders')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per case (the median is reported)')
+    parser.add_argument('--quick', action='store_true', help='One short 360p H.264 video')
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, threshold=args.threshold) else 0)
+
+    if not shutil.which('ffmpeg'):
+        print("Error: ffmpeg is required for this benchmark", file=sys.stderr)
+        sys.exit(1)
+    if args.quick:
+        args.seconds, args.sizes, args.gops, args.codecs = [5], ['640x360'], [25], ['libx264']
+
+    report = run_suite(args)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Synthetic media fixtures for the benchmarks.
+
+Videos are generated with ffmpeg's testsrc when it is available (so GOP size
+and codec can be controlled) and with OpenCV's VideoWriter otherwise. A small
+local HTTP server with simulated latency and per-connection bandwidth stands
+in for a remote media host.
+"""
+
+import functools
+import os
+import shutil
+import subprocess
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+import numpy as np
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.fixtures')
+
+
+def make_test_video(seconds: int = 60, fps: int = 25, size=(640, 360), gop: int = 250,
+                    codec: str = 'libx264', audio: bool = False, folder: str = FIXTURE_DIR) -> str:
+    """
+    Creates (or reuses) a deterministic synthetic test video.
+
+    :param seconds: Duration of the video.
+    :param fps: Frame rate.
+    :param size: (width, height) of the frames.
+    :param gop: Keyframe interval in frames (ffmpeg only).
+    :param codec: ffmpeg video encoder name.
+    :param audio: Add an AAC sine-wave audio track (ffmpeg only).
+    :param folder: Folder where fixtures are cached.
+    :return: Path to the video file.
+    """
+    os.makedirs(folder, exist_ok=True)
+    width, height = size
+    suffix = '_aac' if audio else ''
+    path = os.path.join(folder, f"testsrc_{seconds}s_{fps}fps_{width}x{height}_g{gop}_{codec}{suffix}.mp4")
+    if os.path.exists(path):
+        return path
+
+    if shutil.which('ffmpeg'):
+        command = [
+            'ffmpeg', '-y', '-v', 'error',
+            '-f', 'lavfi', '-i', f'testsrc=duration={seconds}:size={width}x{height}:rate={fps}',
+        ]
+        if audio:
+            command += ['-f', 'lavfi', '-i', f'sine=frequency=440:duration={seconds}', '-c:a', 'aac']
+        command += ['-c:v', codec, '-g', str(gop), '-pix_fmt', 'yuv420p', path]
+        subprocess.run(command, check=True)
+        return path
+
+    if audio:
+        raise RuntimeError("ffmpeg is required to generate a test video with audio.")
+
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    for i in range(seconds * fps):
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        frame[:, :, 0] = (np.arange(width) + i) % 256
+        frame[:, :, 1] = i % 256
+        cv2.putText(frame, str(i), (20, height // 2), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 3)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+def make_hls_fixture(video_path: str, segment_seconds: float = 1.0) -> str:
+    """
+    Splits a video into an HLS playlist of MPEG-TS fragments (streams are copied).
+
+    :param video_path: Source video (e.g. from make_test_video()).
+    :param segment_seconds: Target fragment duration; the GOP should not exceed it.
+    :return: Path to the .m3u8 playlist, next to its fragments.
+    """
+    if not shutil.which('ffmpeg'):
+        raise RuntimeError("ffmpeg is required to generate an HLS fixture.")
+    name = os.path.splitext(os.path.basename(video_path))[0]
+    folder = os.path.join(os.path.dirname(video_path), f"{name}_hls{segment_seconds:g}")
+    playlist = os.path.join(folder, 'index.m3u8')
+    if os.path.exists(playlist):
+        return playlist
+
+    os.makedirs(folder, exist_ok=True)
+    subprocess.run([
+        'ffmpeg', '-y', '-v', 'error', '-i', video_path, '-c', 'copy',
+        '-f', 'hls', '-hls_time', str(segment_seconds), '-hls_list_size', '0',
+        '-hls_segment_filename', os.path.join(folder, 'frag%05d.ts'), playlist,
+    ], check=True)
+    return playlist
+
+
+class _ThrottledHandler(SimpleHTTPRequestHandler):
+    latency = 0.0
+    bandwidth = None  # bytes per second per connection
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_head(self):
+        time.sleep(self.latency)
+        return super().send_head()
+
+    def copyfile(self, source, outputfile):
+        if not self.bandwidth:
+            return super().copyfile(source, outputfile)
+        chunk = max(1024, int(self.bandwidth / 20))
+        while True:
+            data = source.read(chunk)
+            if not data:
+                break
+            outputfile.write(data)
+            time.sleep(len(data) / self.bandwidth)
+
+
+def serve_folder(folder: str, latency: float = 0.0, bandwidth=None):
+    """
+    Serves a folder over HTTP on a random local port from a background thread.
+
+    :param folder: Folder to serve.
+    :param latency: Seconds of delay added before every response.
+    :param bandwidth: Per-connection transfer rate in bytes/s, None for unlimited.
+    :return: (server, base_url); call server.shutdown() when done.
+    """
+    handler = type('Handler', (_ThrottledHandler,), {'latency': latency, 'bandwidth': bandwidth})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(handler, directory=folder))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
@@ -6,17 +6,49 @@ Install: pip install yt-dlp
 """
 
 import argparse
+import copy
+import csv
+import json
 import os
+import re
 import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import urlparse
 
 try:
     import yt_dlp
+    from yt_dlp.utils import download_range_func, parse_bytes
 except ImportError:
     print("Error: yt-dlp is not installed.")
     print("Install it using: pip install yt-dlp")
     sys.exit(1)
 
+# Format selectors (separate streams need FFmpeg to merge)
+FORMAT_WITH_FFMPEG = 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best'
+FORMAT_WITHOUT_FFMPEG = 'best[ext=mp4]/best'
+
+# Lowest-bitrate video stream (no audio), used as a scrubbing proxy; H.264 plays everywhere
+FORMAT_PROXY = 'worstvideo[vcodec^=avc1]/worstvideo/worst'
+
+# Network defaults, tuned so DASH/HLS downloads saturate the link
+DEFAULT_CONCURRENT_FRAGMENTS = 8
+DEFAULT_HTTP_CHUNK_SIZE = '10M'  # also sidesteps per-request throttling on large progressive files
+EXTERNAL_DOWNLOADERS = ('aria2c', 'axel', 'curl', 'wget')
+
+# In-process cache of extracted video metadata
+INFO_CACHE_TTL_SECONDS = 10 * 60  # well below the lifetime of signed format URLs
+INFO_CACHE_MAX_ENTRIES = 256
+
+_YOUTUBE_ID_RE = re.compile(r'(?:[?&]v=|youtu\.be/|/shorts/|/embed/|/live/|/v/)([A-Za-z0-9_-]{11})')
+
+_info_cache = OrderedDict()  # video key -> (expires_at, info)
+_info_inflight = {}  # video key -> _PendingInfo
+_info_lock = threading.Lock()
+
 
 def convert_time_to_seconds(time_str):
     """Convert time string (HH:MM:SS or MM:SS or SS) to seconds."""
@@ -33,6 +65,136 @@ def convert_time_to_seconds(time_str):
         raise ValueError("Invalid time format. Use HH:MM:SS, MM:SS, or SS")
 
 
+def _parse_size(value, name):
+    """Parse a byte size given as an int or a string such as '10M' (None passes through)."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        size = int(value)
+    else:
+        size = parse_bytes(str(value))
+    if not size or size <= 0:
+        raise ValueError(f"Invalid {name}: {value!r}. Use a byte count such as 500K or 10M")
+    return size
+
+
+def network_options(concurrent_fragments=DEFAULT_CONCURRENT_FRAGMENTS, rate_limit=None,
+                    chunk_size=DEFAULT_HTTP_CHUNK_SIZE, external_downloader=None, keep_alive=True):
+    """
+    Build the yt-dlp options controlling how media is fetched.
+    
+    Args:
+        concurrent_fragments: Number of DASH/HLS fragments fetched in parallel
+        rate_limit: Maximum download rate in bytes/s (e.g. '5M'), None for unlimited
+        chunk_size: Size of the ranged HTTP requests used for progressive files
+                    (e.g. '10M'), None to fetch in one request
+        external_downloader: Optional external program (aria2c, axel, curl or wget)
+        keep_alive: Reuse HTTP connections between requests
+    
+    Returns:
+        Dict of yt-dlp options
+    
+    Raises:
+        ValueError: If a value is out of range
+    """
+    concurrent_fragments = int(concurrent_fragments)
+    if concurrent_fragments < 1:
+        raise ValueError("concurrent_fragments must be at least 1")
+    if external_downloader and external_downloader not in EXTERNAL_DOWNLOADERS:
+        raise ValueError(f"Unsupported external downloader: {external_downloader}. "
+                         f"Choose from: {', '.join(EXTERNAL_DOWNLOADERS)}")
+    
+    opts = {
+        'socket_timeout': 30,
+        'retries': 5,
+        'fragment_retries': 5,
+        'concurrent_fragment_downloads': concurrent_fragments,
+    }
+    rate = _parse_size(rate_limit, 'rate limit')
+    if rate:
+        opts['ratelimit'] = rate
+    chunk = _parse_size(chunk_size, 'chunk size')
+    if chunk:
+        opts['http_chunk_size'] = chunk
+    if external_downloader:
+        # Only for the media itself; ffmpeg keeps handling section downloads
+        opts['external_downloader'] = {'default': external_downloader}
+        if external_downloader == 'aria2c':
+            opts['external_downloader_args'] = {'aria2c': ['-x', str(concurrent_fragments),
+                                                           '-s', str(concurrent_fragments), '-k', '1M']}
+    if not keep_alive:
+        opts['http_headers'] = {'Connection': 'close'}
+    return opts
+
+
+def normalize_video_key(url):
+    """Return a cache key for a video URL (the video id for YouTube links)."""
+    match = _YOUTUBE_ID_RE.search(url)
+    if match:
+        return f"youtube:{match.group(1)}"
+    return url.strip()
+
+
+class _PendingInfo:
+    """An extraction in progress that other callers can wait on."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.error = None
+
+
+def get_video_info(url):
+    """
+    Extract video metadata, using a TTL/LRU cache keyed by video id.
+    
+    Concurrent calls for the same video are coalesced so only one extraction
+    runs. The info dict is unprocessed (no format selection), so it can be
+    handed to download_youtube_video with any download options.
+    
+    Args:
+        url: Video URL
+    
+    Returns:
+        A private copy of the yt-dlp info dict
+    """
+    key = normalize_video_key(url)
+    while True:
+        with _info_lock:
+            entry = _info_cache.get(key)
+            if entry and entry[0] > time.time():
+                _info_cache.move_to_end(key)
+                return copy.deepcopy(entry[1])
+            pending = _info_inflight.get(key)
+            leader = pending is None
+            if leader:
+                pending = _info_inflight[key] = _PendingInfo()
+        
+        if not leader:
+            # Another thread is extracting this video; reuse its result
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            continue
+        
+        try:
+            with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True}) as ydl:
+                info = ydl.extract_info(url, download=False, process=False)
+        except Exception as e:
+            pending.error = e
+            raise
+        else:
+            with _info_lock:
+                _info_cache[key] = (time.time() + INFO_CACHE_TTL_SECONDS, info)
+                _info_cache.move_to_end(key)
+                while len(_info_cache) > INFO_CACHE_MAX_ENTRIES:
+                    _info_cache.popitem(last=False)
+            return copy.deepcopy(info)
+        finally:
+            with _info_lock:
+                _info_inflight.pop(key, None)
+            pending.event.set()
+
+
 def check_ffmpeg():
     """Check if FFmpeg is available."""
     import subprocess
@@ -68,7 +230,10 @@ def check_ffmpeg():
     return False
 
 
-def download_youtube_video(url, output_folder="downloads", start_time=None, end_time=None):
+def download_youtube_video(url, output_folder="downloads", start_time=None, end_time=None,
+                           progress_hook=None, info=None, exact_cut=False, quiet=False,
+                           concurrent_fragments=DEFAULT_CONCURRENT_FRAGMENTS, rate_limit=None,
+                           chunk_size=DEFAULT_HTTP_CHUNK_SIZE, external_downloader=None, keep_alive=True):
     """
     Download a YouTube video with optional time range.
     
@@ -77,7 +242,22 @@ def download_youtube_video(url, output_folder="downloads", start_time=None, end_
         output_folder: Folder to save the video
         start_time: Start time (format: HH:MM:SS, MM:SS, or SS)
         end_time: End time (format: HH:MM:SS, MM:SS, or SS)
+        progress_hook: Optional yt-dlp progress hook, called with status dicts
+        info: Optional info dict from get_video_info, so the video is not re-extracted
+        exact_cut: Re-encode around the cut points for frame-accurate ranges
+                   (default: cut at the nearest keyframes and copy the streams)
+        quiet: Suppress console output (used when downloading concurrently)
+        concurrent_fragments, rate_limit, chunk_size, external_downloader, keep_alive:
+            Network settings, see network_options()
+    
+    Returns:
+        Path of the downloaded file, or None if yt-dlp did not report it
+    
+    Raises:
+        Exception: Any yt-dlp error is propagated to the caller
     """
+    say = (lambda *args, **kwargs: None) if quiet else print
+    
     # Create output folder if it doesn't exist
     output_path = Path(output_folder)
     output_path.mkdir(parents=True, exist_ok=True)
@@ -87,9 +267,9 @@ def download_youtube_video(url, output_folder="downloads", start_time=None, end_
     
     # Warn if time range is requested but FFmpeg is not available
     if (start_time or end_time) and not has_ffmpeg:
-        print("⚠ WARNING: FFmpeg is not installed. Time range cutting will not work.")
-        print("The complete video will be downloaded instead.")
-        print("To enable time cutting, install FFmpeg from: https://ffmpeg.org/download.html\n")
+        say("⚠ WARNING: FFmpeg is not installed. Time range cutting will not work.")
+        say("The complete video will be downloaded instead.")
+        say("To enable time cutting, install FFmpeg from: https://ffmpeg.org/download.html\n")
         start_time = None
         end_time = None
     
@@ -97,77 +277,284 @@ def download_youtube_video(url, output_folder="downloads", start_time=None, end_
     if has_ffmpeg:
         # Use best quality with separate video and audio (requires FFmpeg to merge)
         ydl_opts = {
-            'format': 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best',
+            'format': FORMAT_WITH_FFMPEG,
             'outtmpl': str(output_path / '%(title)s.%(ext)s'),
-            'quiet': False,
-            'no_warnings': False,
-            'socket_timeout': 30,
-            'retries': 5,
-            'fragment_retries': 5,
+            'quiet': quiet,
+            'no_warnings': quiet,
+            'noprogress': quiet,
         }
     else:
         # Use pre-merged format (doesn't require FFmpeg)
         ydl_opts = {
-            'format': 'best[ext=mp4]/best',
+            'format': FORMAT_WITHOUT_FFMPEG,
             'outtmpl': str(output_path / '%(title)s.%(ext)s'),
-            'quiet': False,
-            'no_warnings': False,
+            'quiet': quiet,
+            'no_warnings': quiet,
+            'noprogress': quiet,
         }
     
+    ydl_opts.update(network_options(concurrent_fragments, rate_limit, chunk_size,
+                                    external_downloader, keep_alive))
+    
+    if progress_hook:
+        ydl_opts['progress_hooks'] = [progress_hook]
+    
     # Add time range options if provided (requires FFmpeg)
     if start_time or end_time:
-        postprocessor_args = []
+        start_seconds = convert_time_to_seconds(start_time) if start_time else 0
+        end_seconds = convert_time_to_seconds(end_time) if end_time else float('inf')
         
-        if start_time:
-            start_seconds = convert_time_to_seconds(start_time)
-            postprocessor_args.extend(['-ss', str(start_seconds)])
+        # Only fetch the fragments/bytes of the requested section. By default
+        # the cut snaps to keyframes and the streams are copied; exact_cut
+        # re-encodes around the cut points instead.
+        ydl_opts['download_ranges'] = download_range_func(None, [(start_seconds, end_seconds)])
+        ydl_opts['force_keyframes_at_cuts'] = exact_cut
+        ydl_opts['merge_output_format'] = 'mp4'
         
-        if end_time:
-            end_seconds = convert_time_to_seconds(end_time)
-            if start_time:
-                # Calculate duration from start to end
-                duration = end_seconds - start_seconds
-                postprocessor_args.extend(['-t', str(duration)])
-            else:
-                # If only end time is provided, cut from beginning
-                postprocessor_args.extend(['-to', str(end_seconds)])
-        
-        ydl_opts['postprocessor_args'] = postprocessor_args
-        ydl_opts['postprocessors'] = [{
-            'key': 'FFmpegVideoConvertor',
-            'preferedformat': 'mp4',
-        }]
-        
-        print(f"Downloading video segment: ", end="")
+        say(f"Downloading video segment: ", end="")
         if start_time:
-            print(f"from {start_time} ", end="")
+            say(f"from {start_time} ", end="")
         if end_time:
-            print(f"to {end_time}", end="")
-        print()
+            say(f"to {end_time}", end="")
+        say("(exact cut)" if exact_cut else "(cut at keyframes)")
     else:
-        print("Downloading complete video...")
+        say("Downloading complete video...")
     
-    try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            # Extract video info first
-            info = ydl.extract_info(url, download=False)
-            video_title = info.get('title', 'Unknown')
-            print(f"\nVideo: {video_title}")
-            
-            # Download the video
-            ydl.download([url])
-            
-        print(f"\n✓ Download completed successfully!")
-        print(f"Saved to: {output_path.absolute()}")
+    # Extract video info first (cached and shared with other callers)
+    if info is None:
+        info = get_video_info(url)
+    video_title = info.get('title', 'Unknown')
+    say(f"\nVideo: {video_title}")
+    
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        # Download the video from the already extracted info
+        result = ydl.process_ie_result(copy.deepcopy(info), download=True)
+    
+    downloads = result.get('requested_downloads') or [{}]
+    file_path = downloads[0].get('filepath')
+    
+    say(f"\n✓ Download completed successfully!")
+    say(f"Saved to: {output_path.absolute()}")
+    
+    if not has_ffmpeg:
+        say("\n💡 Tip: Install FFmpeg to enable:")
+        say("   - Time range cutting (--start/--end options)")
+        say("   - Better quality video downloads")
+    
+    return file_path
+
+
+def download_proxy(url, output_folder, progress_hook=None, info=None, quiet=True):
+    """
+    Download the lowest-bitrate video stream of a video, e.g. to preview it or to
+    sample thumbnails without fetching the full-quality file.
+    
+    Args:
+        url: Video URL
+        output_folder: Folder to save the proxy (named proxy.<ext>)
+        progress_hook: Optional yt-dlp progress hook, called with status dicts
+        info: Optional info dict from get_video_info, so the video is not re-extracted
+        quiet: Suppress console output
+    
+    Returns:
+        Path of the downloaded proxy, or None if yt-dlp did not report it
+    
+    Raises:
+        Exception: Any yt-dlp error is propagated to the caller
+    """
+    output_path = Path(output_folder)
+    output_path.mkdir(parents=True, exist_ok=True)
+    
+    ydl_opts = {
+        'format': FORMAT_PROXY,
+        'outtmpl': str(output_path / 'proxy.%(ext)s'),
+        'quiet': quiet,
+        'no_warnings': quiet,
+        'noprogress': quiet,
+    }
+    ydl_opts.update(network_options())
+    if progress_hook:
+        ydl_opts['progress_hooks'] = [progress_hook]
+    
+    if info is None:
+        info = get_video_info(url)
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        result = ydl.process_ie_result(copy.deepcopy(info), download=True)
+    
+    downloads = result.get('requested_downloads') or [{}]
+    return downloads[0].get('filepath')
+
+
+def _item_key(item):
+    """Identity of a batch item in the state file."""
+    return json.dumps([item['url'], item.get('start'), item.get('end'), bool(item.get('exact_cut'))])
+
+
+def load_manifest(path):
+    """
+    Read batch items from a CSV or JSONL manifest.
+    
+    CSV files may have a header with url,start,end,exact_cut columns, or list
+    url[,start[,end]] positionally. JSONL files hold one object per line with
+    the same keys.
+    
+    Returns:
+        List of item dicts with url, start, end and exact_cut keys
+    """
+    items = []
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith(('.jsonl', '.json', '.ndjson')):
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    items.append(json.loads(line))
+        else:
+            rows = [row for row in csv.reader(f) if row and not row[0].startswith('#')]
+            header = [c.strip().lower() for c in rows[0]] if rows else []
+            if 'url' in header:
+                rows = [dict(zip(header, row)) for row in rows[1:]]
+            else:
+                rows = [dict(zip(['url', 'start', 'end'], row)) for row in rows]
+            items.extend(rows)
+    
+    for item in items:
+        if not item.get('url'):
+            raise ValueError(f"Manifest entry without url: {item}")
+        item['url'] = item['url'].strip()
+        item['start'] = str(item.get('start') or '').strip() or None
+        item['end'] = str(item.get('end') or '').strip() or None
+        item['exact_cut'] = str(item.get('exact_cut', '')).strip().lower() in ('1', 'true', 'yes')
+    return items
+
+
+def expand_playlist(url):
+    """
+    List the video URLs of a playlist without extracting each video.
+    
+    Returns:
+        List of video URLs (a single-video URL yields itself)
+    """
+    with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True, 'extract_flat': 'in_playlist'}) as ydl:
+        info = ydl.extract_info(url, download=False)
+    if 'entries' not in info:
+        return [url]
+    return [entry.get('url') or entry.get('webpage_url') for entry in info['entries']
+            if entry and (entry.get('url') or entry.get('webpage_url'))]
+
+
+class _HostLimiter:
+    """Caps concurrent downloads per host and spaces out their start times."""
+    
+    def __init__(self, per_host, min_interval):
+        self.per_host = per_host
+        self.min_interval = min_interval
+        self._slots = {}
+        self._next_start = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self, url):
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            slots = self._slots.setdefault(host, threading.Semaphore(self.per_host))
+        slots.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.min_interval
+        time.sleep(start - now)
+        return host
+    
+    def release(self, host):
+        self._slots[host].release()
+
+
+def run_batch(items, output_folder="downloads", workers=4, per_host=2, min_interval=0.0,
+              state_path=None, network=None):
+    """
+    Download many items concurrently, skipping those finished in a previous run.
+    
+    Args:
+        items: Item dicts with url, start, end and exact_cut keys
+        output_folder: Folder to save the videos
+        workers: Number of concurrent downloads
+        per_host: Maximum concurrent downloads per host
+        min_interval: Minimum seconds between download starts on the same host
+        state_path: JSONL file recording finished items (enables resuming)
+        network: Optional dict of network settings passed to download_youtube_video
+    
+    Returns:
+        List of per-item result dicts (status is "done", "skipped" or "failed")
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if per_host < 1:
+        raise ValueError("per_host must be at least 1")
+    
+    finished = set()
+    if state_path and os.path.exists(state_path):
+        with open(state_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # partially written line from a crash
+                if record.get('status') == 'done':
+                    finished.add(record['key'])
+    
+    limiter = _HostLimiter(per_host, min_interval)
+    state_lock = threading.Lock()
+    
+    def run(item):
+        key = _item_key(item)
+        result = {'url': item['url'], 'start': item['start'], 'end': item['end']}
+        if key in finished:
+            return dict(result, status='skipped', seconds=0.0)
         
-        if not has_ffmpeg:
-            print("\n💡 Tip: Install FFmpeg to enable:")
-            print("   - Time range cutting (--start/--end options)")
-            print("   - Better quality video downloads")
+        host = limiter.acquire(item['url'])
+        began = time.monotonic()
+        try:
+            path = download_youtube_video(item['url'], output_folder, item['start'], item['end'],
+                                          exact_cut=item['exact_cut'], quiet=True, **(network or {}))
+            result.update(status='done', file=path)
+        except Exception as e:
+            result.update(status='failed', error=str(e))
+        finally:
+            limiter.release(host)
+        result['seconds'] = time.monotonic() - began
         
-    except Exception as e:
-        print(f"\n✗ Error downloading video: {str(e)}", file=sys.stderr)
-        sys.exit(1)
+        if state_path:
+            with state_lock, open(state_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'key': key, 'status': result['status'],
+                                    'file': result.get('file'), 'error': result.get('error')}) + '\n')
+        
+        mark = {'done': '✓', 'failed': '✗'}[result['status']]
+        print(f"{mark} {item['url']} ({result['seconds']:.1f}s)")
+        return result
+    
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, items))
+
+
+def print_batch_summary(results):
+    """Print one line per item and the totals."""
+    print("\nSummary:")
+    for r in results:
+        detail = r.get('file') or r.get('error') or ''
+        span = f"{r['start'] or ''}-{r['end'] or ''}" if (r['start'] or r['end']) else 'full'
+        print(f"  {r['status']:<8} {r['seconds']:>7.1f}s  {span:<15} {r['url']}  {detail}")
+    counts = {status: sum(1 for r in results if r['status'] == status) for status in ('done', 'skipped', 'failed')}
+    print(f"\n{counts['done']} downloaded, {counts['skipped']} skipped, {counts['failed']} failed")
+
+
+def _positive_int(value):
+    """argparse type for counts that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 def main():
@@ -187,17 +574,67 @@ Examples:
   
   # Download from 2:15 to end
   python script.py https://youtube.com/watch?v=VIDEO_ID --start 2:15
+  
+  # Download every URL/range listed in a CSV or JSONL manifest, 8 at a time
+  python script.py --batch clips.csv --workers 8
+  
+  # Download the first minute of every video in a playlist
+  python script.py https://youtube.com/playlist?list=LIST_ID --playlist --end 1:00
         """
     )
     
-    parser.add_argument('url', help='YouTube video URL')
+    parser.add_argument('url', nargs='?', help='YouTube video (or playlist) URL')
     parser.add_argument('-s', '--start', help='Start time (HH:MM:SS, MM:SS, or SS)')
     parser.add_argument('-e', '--end', help='End time (HH:MM:SS, MM:SS, or SS)')
     parser.add_argument('-o', '--output', default='downloads', 
                         help='Output folder (default: downloads)')
+    parser.add_argument('--exact-cut', action='store_true',
+                        help='Re-encode around --start/--end for frame-accurate cuts '
+                             '(default: cut at keyframes without re-encoding)')
+    
+    net = parser.add_argument_group('network')
+    net.add_argument('-N', '--concurrent-fragments', type=int, default=DEFAULT_CONCURRENT_FRAGMENTS,
+                     help=f'DASH/HLS fragments fetched in parallel (default: {DEFAULT_CONCURRENT_FRAGMENTS})')
+    net.add_argument('-r', '--limit-rate', metavar='RATE',
+                     help='Maximum download rate in bytes/s, e.g. 500K or 5M (default: unlimited)')
+    net.add_argument('--chunk-size', default=DEFAULT_HTTP_CHUNK_SIZE,
+                     help=f'Size of ranged HTTP requests, 0 to disable (default: {DEFAULT_HTTP_CHUNK_SIZE})')
+    net.add_argument('--downloader', choices=EXTERNAL_DOWNLOADERS,
+                     help='Use an external downloader for the media')
+    net.add_argument('--no-keep-alive', action='store_true',
+                     help='Open a new connection for every request')
+    
+    batch = parser.add_argument_group('batch mode')
+    batch.add_argument('-b', '--batch', metavar='MANIFEST',
+                       help='CSV or JSONL manifest of url,start,end[,exact_cut] items')
+    batch.add_argument('--playlist', action='store_true',
+                       help='Treat the URL as a playlist and download every entry')
+    batch.add_argument('-w', '--workers', type=_positive_int, default=4,
+                       help='Concurrent downloads (default: 4)')
+    batch.add_argument('--per-host', type=_positive_int, default=2,
+                       help='Maximum concurrent downloads per host (default: 2)')
+    batch.add_argument('--min-interval', type=float, default=0.0,
+                       help='Minimum seconds between download starts on one host (default: 0)')
+    batch.add_argument('--state', metavar='FILE',
+                       help='Resumable state file (default: OUTPUT/.batch_state.jsonl)')
     
     args = parser.parse_args()
     
+    if not args.url and not args.batch:
+        parser.error('a URL or --batch manifest is required')
+    
+    network = {
+        'concurrent_fragments': args.concurrent_fragments,
+        'rate_limit': args.limit_rate,
+        'chunk_size': None if args.chunk_size == '0' else args.chunk_size,
+        'external_downloader': args.downloader,
+        'keep_alive': not args.no_keep_alive,
+    }
+    try:
+        network_options(**network)
+    except ValueError as e:
+        parser.error(str(e))
+    
     # Validate that if end time is provided with start time, end > start
     if args.start and args.end:
         start_sec = convert_time_to_seconds(args.start)
@@ -206,7 +643,27 @@ Examples:
             print("Error: End time must be greater than start time", file=sys.stderr)
             sys.exit(1)
     
-    download_youtube_video(args.url, args.output, args.start, args.end)
+    if args.batch or args.playlist:
+        if args.batch:
+            items = load_manifest(args.batch)
+        else:
+            items = [{'url': u, 'start': args.start, 'end': args.end, 'exact_cut': args.exact_cut}
+                     for u in expand_playlist(args.url)]
+        
+        os.makedirs(args.output, exist_ok=True)
+        state_path = args.state or os.path.join(args.output, '.batch_state.jsonl')
+        print(f"Downloading {len(items)} item(s) with {args.workers} worker(s)...")
+        results = run_batch(items, args.output, args.workers, args.per_host, args.min_interval, state_path,
+                            network)
+        print_batch_summary(results)
+        sys.exit(1 if any(r['status'] == 'failed' for r in results) else 0)
+    
+    try:
+        download_youtube_video(args.url, args.output, args.start, args.end, exact_cut=args.exact_cut,
+                               **network)
+    except Exception as e:
+        print(f"\n✗ Error downloading video: {str(e)}", file=sys.stderr)
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -1,22 +1,140 @@
-import moviepy as mp
 import os
+import shutil
+import subprocess
+import tempfile
+
+from media_probe import get_audio_codec, get_duration
+
+# Container to use when stream-copying each source audio codec
+COPY_CONTAINERS = {
+    "aac": "m4a",
+    "alac": "m4a",
+    "mp3": "mp3",
+    "opus": "opus",
+    "vorbis": "ogg",
+    "flac": "flac",
+}
+
+# ffmpeg encoder used when transcoding to each output format
+ENCODERS = {
+    "mp3": "libmp3lame",
+    "m4a": "aac",
+    "opus": "libopus",
+    "ogg": "libvorbis",
+    "flac": "flac",
+    "wav": "pcm_s16le",
+}
+
+# Formats that do not take a bitrate
+LOSSLESS_FORMATS = ("flac", "wav")
 
 class VideoAudioExtractor:
     def __init__(self, video_path):
         self.video_path = video_path
 
-    def extract_audio(self, output_path=None):
+    def extract_audio(self, output_path=None, audio_format="mp3", bitrate="192k", threads=0, backend="auto",
+                      progress_callback=None):
         """
         Extracts audio from the video file and saves it as an audio file.
         
+        When the source codec already fits the requested format (or audio_format is
+        "auto"), the audio stream is copied without re-encoding. Otherwise ffmpeg
+        transcodes it directly; moviepy is only used when ffmpeg is unavailable.
+        
         :param output_path: Optional output file path. 
-                            If not provided, saves as same name with .mp3 extension.
+                            If not provided, saves as same name with the format's extension.
+                            For "auto" the extension is replaced with the chosen container.
+        :param audio_format: One of "mp3", "m4a", "opus", "ogg", "flac", "wav", or "auto"
+                             to keep the source codec in a matching container (m4a/opus/mka...).
+        :param bitrate: Target bitrate for lossy transcodes (e.g. "192k").
+        :param threads: ffmpeg thread count (0 lets ffmpeg decide).
+        :param backend: "auto" (ffmpeg if installed), "ffmpeg" or "moviepy".
+        :param progress_callback: Optional callable receiving (seconds_done, seconds_total) as
+                                  ffmpeg reports progress (about twice a second); seconds_total
+                                  is 0 when the duration is unknown. Not called by moviepy.
         :return: Path to saved audio file.
         """
+        if audio_format != "auto" and audio_format not in ENCODERS:
+            raise ValueError(f"Unsupported audio format: {audio_format}")
+        if backend not in ("auto", "ffmpeg", "moviepy"):
+            raise ValueError(f"Unknown backend: {backend}")
+
+        use_ffmpeg = backend == "ffmpeg" or (backend == "auto" and shutil.which("ffmpeg"))
+        if not use_ffmpeg:
+            return self._extract_with_moviepy(output_path, "mp3" if audio_format == "auto" else audio_format,
+                                              bitrate)
+
+        codec = get_audio_codec(self.video_path)
+        if codec == "":
+            raise ValueError("This video does not contain an audio track.")
+
+        # Stream copy when the source codec already fits the requested container
+        copy_format = COPY_CONTAINERS.get(codec, "mka" if codec else None)
+        if audio_format == "auto":
+            stream_copy = copy_format is not None
+            audio_format = copy_format if stream_copy else "mp3"
+        else:
+            stream_copy = copy_format == audio_format
+
+        base, ext = os.path.splitext(output_path or self.video_path)
+        if output_path is None or ext.lstrip(".").lower() != audio_format:
+            output_path = base + "." + audio_format
+
+        command = ["ffmpeg", "-y", "-v", "error", "-i", self.video_path, "-map", "0:a:0", "-vn"]
+        if stream_copy:
+            command += ["-c:a", "copy"]
+        else:
+            command += ["-c:a", ENCODERS[audio_format]]
+            if bitrate and audio_format not in LOSSLESS_FORMATS:
+                command += ["-b:a", str(bitrate)]
+        if threads:
+            command += ["-threads", str(threads)]
+        if progress_callback is not None:
+            command += ["-progress", "pipe:1", "-nostats"]
+        command.append(output_path)
+
+        if progress_callback is None:
+            result = subprocess.run(command, capture_output=True, text=True)
+            returncode, message = result.returncode, result.stderr.strip()
+        else:
+            returncode, message = self._run_with_progress(command, progress_callback)
+        if returncode != 0:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            if "matches no streams" in message:
+                raise ValueError("This video does not contain an audio track.")
+            raise RuntimeError(f"ffmpeg failed to extract audio: {message}")
+
+        return output_path
+
+    def _run_with_progress(self, command, progress_callback):
+        """
+        Runs ffmpeg with ``-progress pipe:1`` and forwards its output position.
+
+        :return: (return code, stderr text)
+        """
+        total = get_duration(self.video_path) or 0
+        # stderr goes to a file so a chatty ffmpeg cannot block on a full pipe
+        with tempfile.TemporaryFile(mode="w+") as stderr:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr, text=True)
+            for line in process.stdout:
+                key, _, value = line.strip().partition("=")
+                if key == "out_time_us" and value.isdigit():
+                    progress_callback(int(value) / 1e6, total)
+                elif key == "progress" and value == "end" and total:
+                    progress_callback(total, total)
+            returncode = process.wait()
+            stderr.seek(0)
+            return returncode, stderr.read().strip()
+
+    def _extract_with_moviepy(self, output_path, audio_format, bitrate):
+        """Fallback path that decodes and re-encodes the audio through moviepy."""
+        import moviepy as mp
+
         # If no output file is given, create one
         if output_path is None:
             base, _ = os.path.splitext(self.video_path)
-            output_path = base + ".mp3"
+            output_path = base + "." + audio_format
 
         # Load video
         video = mp.VideoFileClip(self.video_path)
@@ -26,7 +144,7 @@ class VideoAudioExtractor:
             if video.audio is None:
                 raise ValueError("This video does not contain an audio track.")
 
-            video.audio.write_audiofile(output_path)
+            video.audio.write_audiofile(output_path, bitrate=None if audio_format in LOSSLESS_FORMATS else bitrate)
         finally:
             # Crucial: Close both clip and its reader to release the file lock
             video.close()
@@ -1,145 +1,1294 @@
 import os
+import bisect
 import cv2
+import io
 import math
+import multiprocessing
+import queue
+import re
+import subprocess
+import threading
+import time
+import numpy as np
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
-def get_total_frames(video_path: str) -> int:
+from media_probe import count_video_packets, get_duration, get_keyframe_indices, get_stream_frame_count
+
+# Strategies accepted by FrameExtractor.extract_n_frames
+READ_STRATEGIES = ("auto", "sequential", "seek")
+
+# Fallback seek threshold when keyframes cannot be probed (typical H.264 GOP length)
+SEEK_GAP_FRAMES = 250
+
+# Seeking has a fixed cost, so only seek when it skips at least this many decodes
+MIN_SEEK_SKIP_FRAMES = 16
+
+# Segments shorter than this are not worth a separate decoder process
+MIN_SEGMENT_FRAMES = 300
+
+# Minimum seconds between progress callbacks from the decode loops
+PROGRESS_INTERVAL_SECONDS = 0.2
+
+# Number of files whose frame count is remembered by get_total_frames
+FRAME_COUNT_CACHE_SIZE = 256
+
+# Color conversions accepted by FrameExtractor.iter_frames (frames decode as BGR)
+COLOR_CONVERSIONS = {
+    "rgb": cv2.COLOR_BGR2RGB,
+    "gray": cv2.COLOR_BGR2GRAY,
+    "hsv": cv2.COLOR_BGR2HSV,
+    "lab": cv2.COLOR_BGR2LAB,
+    "yuv": cv2.COLOR_BGR2YUV,
+}
+
+# Image formats the extractor can write, with the OpenCV quality flag of each
+IMAGE_QUALITY_FLAGS = {
+    ".jpg": cv2.IMWRITE_JPEG_QUALITY,
+    ".jpeg": cv2.IMWRITE_JPEG_QUALITY,
+    ".webp": cv2.IMWRITE_WEBP_QUALITY,
+    ".png": None,  # lossless
+}
+
+# Preview tier: JPEGs written to this subfolder of the output folder
+THUMBNAIL_FOLDER = "thumbs"
+THUMBNAIL_QUALITY = 70
+
+# Storyboards: longer side of each tile, and tiles per sprite sheet (columns x rows)
+STORYBOARD_TILE_SIZE = 160
+STORYBOARD_COLUMNS = 10
+STORYBOARD_ROWS = 10
+
+# Scene-change sampling: minimum difference from the last kept frame (0..1) and output cap
+SCENE_THRESHOLD = 0.3
+SCENE_MAX_FRAMES = 200
+
+# Frames are compared as 36x32 grayscale thumbnails: a 16-bin histogram and a
+# 64-bit difference hash over 8x9 blocks of 4x4 pixels
+_SIGNATURE_SIZE = (36, 32)
+_HISTOGRAM_BINS = 16
+
+# Bytes written to ffmpeg's stdin per call when decoding from memory or a stream
+PIPE_FEED_CHUNK_SIZE = 1024 * 1024
+
+# Decoders accepted by FrameExtractor: FFmpeg through OpenCV, PyAV, or an ffmpeg subprocess
+DECODE_BACKENDS = ("opencv", "pyav", "ffmpeg")
+
+# Seconds to wait for ffmpeg to report the timestamp of a frame it has already output
+PIPE_LOG_TIMEOUT_SECONDS = 10.0
+
+_OUTPUT_VIDEO_RE = re.compile(r'Video: rawvideo.*?, (\d+)x(\d+)')
+_INPUT_FPS_RE = re.compile(r'Video: .*?([\d.]+) (?:fps|tbr)')
+_DURATION_RE = re.compile(r'Duration: (\d+):(\d+):([\d.]+)')
+_SHOWINFO_TIME_RE = re.compile(r'Parsed_showinfo.*? n:\s*\d+ pts:\s*-?\d+ pts_time:(-?[\d.]+)')
+
+_frame_count_cache = OrderedDict()
+_frame_count_lock = threading.Lock()
+
+def _frame_count_key(video_path: str):
+    try:
+        st = os.stat(video_path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return (os.path.abspath(video_path), st.st_size, st.st_mtime_ns)
+
+
+def get_total_frames(video_path: str, cap=None) -> int:
     """
     Returns the total number of frames in a given video file.
 
+    The count is resolved in tiers, cheapest first: container metadata,
+    then demux-only packet counting with ffprobe, then decoding every frame.
+    Results are cached per file by (path, size, mtime).
+
     :param video_path: Path to the video file.
+    :param cap: Optional already-open cv2.VideoCapture for the same file; it is
+                left open and at its current position.
     :return: Total number of frames in the video.
     :raises: IOError if the video cannot be opened.
     """
+    key = _frame_count_key(video_path)
+    with _frame_count_lock:
+        if key in _frame_count_cache:
+            _frame_count_cache.move_to_end(key)
+            return _frame_count_cache[key]
+
+    owns_cap = cap is None
+    if owns_cap:
+        cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Could not open video file: {video_path}")
+
+    try:
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if total <= 0:
+            total = get_stream_frame_count(video_path) or count_video_packets(video_path) or 0
+
+        # If frame count not available, count manually (slower but reliable)
+        if total <= 0:
+            print("Warning: Unable to get frame count via metadata, counting manually...")
+            position = cap.get(cv2.CAP_PROP_POS_FRAMES)
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            total = 0
+            while cap.grab():
+                total += 1
+            # Restore the frame position for future use
+            cap.set(cv2.CAP_PROP_POS_FRAMES, position)
+    finally:
+        if owns_cap:
+            cap.release()
+
+    if key is not None and total > 0:
+        with _frame_count_lock:
+            _frame_count_cache[key] = total
+            while len(_frame_count_cache) > FRAME_COUNT_CACHE_SIZE:
+                _frame_count_cache.popitem(last=False)
+    return total
+
+
+def get_video_duration(video_path: str) -> float:
+    """
+    Returns the duration of a video in seconds: the container duration when ffprobe
+    reports it, otherwise the frame count divided by the frame rate.
+
+    :param video_path: Path to the video file.
+    :return: Duration in seconds (0.0 if the frame rate is unknown).
+    :raises: IOError if the video cannot be opened.
+    """
+    duration = get_duration(video_path)
+    if duration:
+        return duration
     cap = cv2.VideoCapture(video_path)
     if not cap.isOpened():
         raise IOError(f"Could not open video file: {video_path}")
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        total = get_total_frames(video_path, cap=cap)
+    finally:
+        cap.release()
+    return total / fps if fps > 0 else 0.0
+
+
+class _PipeCapture:
+    def __init__(self, source, threads: int = 0, max_dimension: int = None, keyframes_only: bool = False):
+        """
+        Minimal cv2.VideoCapture look-alike decoding through an ffmpeg subprocess.
+
+        BGR frames are read back from ffmpeg as raw video, so nothing touches the
+        disk. A path is opened by ffmpeg itself; any other source is fed to
+        ``-i pipe:0`` and must be streamable (e.g. MP4 with the index at the front).
+        Input is decoded once and in order: seeking forward decodes the frames in
+        between, seeking backward fails.
+
+        :param source: Path, video as bytes-like data, or a binary file-like object with read().
+        :param threads: Decoder threads (0 = ffmpeg's default).
+        :param max_dimension: Scale frames inside ffmpeg so the longer side is at most this size.
+        :param keyframes_only: Decode keyframes only (``-skip_frame nokey``); frame indices
+                               are then derived from the reported frame timestamps.
+        """
+        self._source = source
+        self._pos = 0
+        self._width = self._height = 0
+        self._fps = 0.0
+        self._duration = 0.0
+        self._log = []
+        self._keyframe_times = queue.Queue() if keyframes_only else None
+        self._process = None
+
+        command = ['ffmpeg', '-hide_banner']
+        if threads:
+            command += ['-threads', str(threads)]
+        if keyframes_only:
+            command += ['-skip_frame', 'nokey']
+        command += ['-i', 'file:' + os.fspath(source) if _is_path(source) else 'pipe:0', '-map', '0:v:0']
+        filters = []
+        if keyframes_only:
+            filters.append('showinfo')  # logs the timestamp of every decoded frame
+        if max_dimension:
+            filters.append(f"scale=w='min(iw,{max_dimension})':h='min(ih,{max_dimension})'"
+                           f":force_original_aspect_ratio=decrease:flags=area")
+        if filters:
+            command += ['-vf', ','.join(filters)]
+        # rawvideo output defaults to constant frame rate, which duplicates or drops
+        # frames on timestamp gaps and VFR input; pass every decoded frame through once
+        command += ['-fps_mode', 'passthrough', '-f', 'rawvideo', '-pix_fmt', 'bgr24', 'pipe:1']
+        try:
+            self._process = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL if _is_path(source) else subprocess.PIPE,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            )
+        except OSError:
+            return
+        if not _is_path(source):
+            threading.Thread(target=self._feed, daemon=True).start()
+        self._read_header()
+        self._frame = bytearray(self._width * self._height * 3)
+
+    def _feed(self) -> None:
+        stdin = self._process.stdin
+        try:
+            if hasattr(self._source, 'read'):
+                while True:
+                    chunk = self._source.read(PIPE_FEED_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    stdin.write(chunk)
+            else:
+                view = memoryview(self._source)
+                for i in range(0, len(view), PIPE_FEED_CHUNK_SIZE):
+                    stdin.write(view[i:i + PIPE_FEED_CHUNK_SIZE])
+        except (BrokenPipeError, ValueError, OSError):
+            pass  # ffmpeg stopped reading (released or failed)
+        finally:
+            try:
+                stdin.close()
+            except OSError:
+                pass
+
+    def _log_line(self, raw: bytes) -> str:
+        line = raw.decode('utf-8', 'replace').strip()
+        if self._keyframe_times is not None:
+            match = _SHOWINFO_TIME_RE.search(line)
+            if match:
+                self._keyframe_times.put(float(match.group(1)))
+                return line
+        self._log.append(line)
+        return line
+
+    def _read_header(self) -> None:
+        """Parses ffmpeg's stream report up to the output stream, then drains stderr."""
+        in_output = False
+        for raw in self._process.stderr:
+            line = self._log_line(raw)
+            match = _DURATION_RE.search(line)
+            if match:
+                h, m, sec = match.groups()
+                self._duration = int(h) * 3600 + int(m) * 60 + float(sec)
+            if line.startswith('Output #0'):
+                in_output = True
+            elif not in_output and not self._fps:
+                match = _INPUT_FPS_RE.search(line)
+                if match:
+                    self._fps = float(match.group(1))
+            elif in_output:
+                match = _OUTPUT_VIDEO_RE.search(line)
+                if match:
+                    self._width, self._height = int(match.group(1)), int(match.group(2))
+                    break
+        # Keep reading so ffmpeg never blocks on a full stderr pipe
+        threading.Thread(target=self._drain_log, daemon=True).start()
+
+    def _drain_log(self) -> None:
+        for raw in self._process.stderr:
+            self._log_line(raw)
+            del self._log[:-20]
+
+    def error(self) -> str:
+        """Last lines of ffmpeg's log, for error messages."""
+        return '\n'.join(self._log[-5:])
+
+    def isOpened(self) -> bool:
+        return self._process is not None and self._width > 0 and self._height > 0
+
+    def grab(self) -> bool:
+        if not self.isOpened():
+            return False
+        view = memoryview(self._frame)
+        filled = 0
+        while filled < len(view):
+            n = self._process.stdout.readinto(view[filled:])
+            if not n:
+                return False
+            filled += n
+        if self._keyframe_times is None:
+            self._pos += 1
+            return True
+        # showinfo logs each frame before it is written, so its time is already on its way
+        try:
+            seconds = self._keyframe_times.get(timeout=PIPE_LOG_TIMEOUT_SECONDS)
+        except queue.Empty:
+            return False
+        self._pos = int(round(seconds * self._fps)) + 1
+        return True
+
+    def retrieve(self, image=None):
+        frame = np.frombuffer(self._frame, dtype=np.uint8).reshape(self._height, self._width, 3)
+        # The read buffer is reused by the next grab(), so always hand out a copy
+        if image is not None and image.shape == frame.shape and image.dtype == frame.dtype:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame.copy()
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def get(self, prop) -> float:
+        if prop == cv2.CAP_PROP_FPS:
+            return self._fps
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self._width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self._height)
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._pos)
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            # Estimated from the container duration (0 when the stream does not report it)
+            return float(round(self._duration * self._fps))
+        return 0.0
+
+    def set(self, prop, value) -> bool:
+        if prop != cv2.CAP_PROP_POS_FRAMES or value < self._pos:
+            return False
+        while self._pos < value:
+            if not self.grab():
+                return False
+        return True
+
+    def release(self) -> None:
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+        if self._process is not None:
+            self._process.wait()
+            self._process.stdout.close()
+
+
+class _PyAVCapture:
+    def __init__(self, source, threads: int = 0, max_dimension: int = None, keyframes_only: bool = False):
+        """
+        Minimal cv2.VideoCapture look-alike decoding in-process with PyAV.
+
+        Unlike _PipeCapture it can seek (on paths and seekable file objects), and
+        frames are scaled by swscale straight into the BGR output.
 
-    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        :param source: Path, video as bytes-like data, or a binary file-like object.
+        :param threads: Decoder threads (0 = one per core); frame and slice threading are enabled.
+        :param max_dimension: Scale frames during conversion so the longer side is at most this size.
+        :param keyframes_only: Skip non-keyframes in the decoder.
+        :raises: ImportError if PyAV is not installed, IOError if the video cannot be opened.
+        """
+        try:
+            import av
+        except ImportError:
+            raise ImportError("The pyav decode backend requires PyAV (pip install av).") from None
+        if not _is_path(source) and not hasattr(source, 'read'):
+            source = io.BytesIO(source)
+        try:
+            self._container = av.open(os.fspath(source) if _is_path(source) else source)
+        except av.FFmpegError as e:
+            raise IOError(f"Could not open video file: {e}") from None
+        if not self._container.streams.video:
+            self._container.close()
+            raise IOError("Could not open video file: no video stream")
+        self._errors = (av.FFmpegError,)
+        self._stream = stream = self._container.streams.video[0]
+        stream.thread_type = 'AUTO'
+        stream.codec_context.thread_count = threads
+        if keyframes_only:
+            stream.codec_context.skip_frame = 'NONKEY'
+        self._time_base = stream.time_base
+        self._start = float(stream.start_time * stream.time_base) if stream.start_time is not None else 0.0
+        self._fps = float(stream.average_rate or stream.guessed_rate or 0)
+        width, height = stream.codec_context.width, stream.codec_context.height
+        self._width, self._height = _fit_size(width, height, max_dimension) or (width, height)
+        if stream.frames:
+            self._count = stream.frames
+        elif self._container.duration:
+            self._count = int(round(self._container.duration / 1e6 * self._fps))
+        else:
+            self._count = 0
+        self._frames = self._container.decode(stream)
+        self._frame = None
+        self._peeked = None
+        self._pos = 0
+        self._time = 0.0
+
+    def _next(self):
+        try:
+            return next(self._frames, None)
+        except self._errors:
+            return None  # corrupt or truncated data ends the stream like EOF
+
+    def _index(self, frame) -> int:
+        if frame.time is None or self._fps <= 0:
+            return self._pos
+        return int(round((frame.time - self._start) * self._fps))
+
+    def isOpened(self) -> bool:
+        return self._width > 0 and self._height > 0
+
+    def grab(self) -> bool:
+        frame, self._peeked = self._peeked or self._next(), None
+        if frame is None:
+            return False
+        self._frame = frame
+        self._pos = self._index(frame) + 1
+        self._time = (frame.time - self._start) if frame.time is not None else 0.0
+        return True
+
+    def retrieve(self, image=None):
+        if self._frame is None:
+            return False, None
+        frame = self._frame.to_ndarray(format='bgr24', width=self._width, height=self._height,
+                                       interpolation='AREA')
+        if image is not None and image.shape == frame.shape and image.dtype == frame.dtype:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def get(self, prop) -> float:
+        if prop == cv2.CAP_PROP_FPS:
+            return self._fps
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self._width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self._height)
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._pos)
+        if prop == cv2.CAP_PROP_POS_MSEC:
+            return self._time * 1000.0
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self._count)
+        return 0.0
 
-    # If frame count not available, count manually (slower but reliable)
-    if total <= 0:
-        print("Warning: Unable to get frame count via metadata, counting manually...")
-        total = 0
+    def set(self, prop, value) -> bool:
+        """Seeks to a frame index: back to the keyframe before it, then decodes forward."""
+        if prop != cv2.CAP_PROP_POS_FRAMES or self._fps <= 0:
+            return False
+        value = int(value)
+        seconds = self._start + value / self._fps
+        try:
+            self._container.seek(int(seconds / self._time_base), stream=self._stream, backward=True)
+        except self._errors:
+            return False
+        self._frames = self._container.decode(self._stream)
+        self._peeked = None
         while True:
-            success, _ = cap.read()
+            frame = self._next()
+            if frame is None:
+                return False
+            if self._index(frame) >= value:
+                self._peeked = frame
+                self._pos = value
+                return True
+
+    def release(self) -> None:
+        self._container.close()
+
+
+def _is_path(video) -> bool:
+    return isinstance(video, (str, os.PathLike))
+
+
+def open_capture(video, backend: str = "opencv", threads: int = 0, max_dimension: int = None,
+                 keyframes_only: bool = False):
+    """
+    Opens a video for decoding with the given backend.
+
+    "opencv" opens paths with OpenCV's FFmpeg backend and hands in-memory/streamed
+    video to an ffmpeg pipe; "ffmpeg" always decodes through an ffmpeg subprocess;
+    "pyav" decodes in-process with PyAV. Only the PyAV and ffmpeg decoders can scale
+    while decoding (max_dimension) or skip non-keyframes; OpenCV ignores max_dimension.
+
+    :param video: Path, bytes-like data, or a binary file-like object.
+    :param backend: One of DECODE_BACKENDS.
+    :param threads: Decoder threads (0 = the backend's default).
+    :param max_dimension: Longer side of the decoded frames, for backends that scale.
+    :param keyframes_only: Decode keyframes only (pyav and ffmpeg backends).
+    :raises: ValueError for an unknown backend or an unsupported option,
+             IOError if the video cannot be opened.
+    """
+    if backend not in DECODE_BACKENDS:
+        raise ValueError(f"Unknown decode backend '{backend}', expected one of {DECODE_BACKENDS}.")
+    if backend == "pyav":
+        return _PyAVCapture(video, threads, max_dimension, keyframes_only)
+    if backend == "opencv" and _is_path(video):
+        if keyframes_only:
+            raise ValueError("keyframes_only requires the pyav or ffmpeg decode backend.")
+        if threads:
+            cap = cv2.VideoCapture(os.fspath(video), cv2.CAP_FFMPEG, [cv2.CAP_PROP_N_THREADS, threads])
+        else:
+            cap = cv2.VideoCapture(os.fspath(video))
+        if not cap.isOpened():
+            cap.release()
+            raise IOError(f"Could not open video file: {video}")
+        return cap
+    cap = _PipeCapture(video, threads, max_dimension, keyframes_only)
+    if not cap.isOpened():
+        message = cap.error()
+        cap.release()
+        raise IOError(f"Could not decode video stream: {message or 'ffmpeg unavailable'}")
+    return cap
+
+
+def _fit_size(width: int, height: int, max_dimension):
+    """(width, height) scaled so the longer side is at most max_dimension, or None if it fits."""
+    scale = max_dimension / float(max(width, height)) if max_dimension else 1.0
+    if scale >= 1.0:
+        return None
+    return max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+
+
+def _fit(frame, max_dimension):
+    """Downscales a frame so its longer side is at most max_dimension."""
+    size = _fit_size(frame.shape[1], frame.shape[0], max_dimension)
+    if size is None:
+        return frame
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+class FrameEncoding:
+    def __init__(self, extension: str = ".jpg", quality: int = None, max_dimension: int = None,
+                 grayscale: bool = False, thumbnail_size: int = None):
+        """
+        How extracted frames are written: format, quality, size, color and preview tier.
+
+        Instances are called as ``encoding(filename, frame)`` from the writer threads
+        (and pickled into segment worker processes).
+
+        :param extension: Image format by extension (".jpg", ".webp", ".png" or any other
+                          format OpenCV can write, without quality control).
+        :param quality: 1-100 for JPEG/WebP (OpenCV's default when None; ignored for PNG).
+        :param max_dimension: Downscale frames so the longer side is at most this many pixels.
+        :param grayscale: Write single-channel images.
+        :param thumbnail_size: Also write a JPEG thumbnail with this longer side into
+                               the THUMBNAIL_FOLDER subfolder (None = no thumbnails);
+                               skipped for frames that are no larger than that.
+        """
+        if quality is not None and not 1 <= quality <= 100:
+            raise ValueError("quality must be between 1 and 100.")
+        for name, value in (("max_dimension", max_dimension), ("thumbnail_size", thumbnail_size)):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be a positive integer.")
+        self.extension = extension
+        self.quality = quality
+        self.max_dimension = max_dimension
+        self.grayscale = grayscale
+        self.thumbnail_size = thumbnail_size
+        flag = IMAGE_QUALITY_FLAGS.get(extension.lower())
+        self._params = [flag, quality] if flag is not None and quality is not None else []
+
+    @staticmethod
+    def thumbnail_path(filename: str) -> str:
+        folder, name = os.path.split(filename)
+        return os.path.join(folder, THUMBNAIL_FOLDER, os.path.splitext(name)[0] + ".jpg")
+
+    def __call__(self, filename: str, frame) -> None:
+        frame = _fit(frame, self.max_dimension)
+        if self.grayscale and frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if not cv2.imwrite(filename, frame, self._params):
+            raise IOError(f"Could not write frame: {filename}")
+        if self.thumbnail_size and max(frame.shape[:2]) > self.thumbnail_size:
+            # Derived from the (possibly already downscaled) output frame; frames that
+            # are already thumbnail-sized serve as their own preview
+            thumbnail = _fit(frame, self.thumbnail_size)
+            cv2.imwrite(self.thumbnail_path(filename), thumbnail, [cv2.IMWRITE_JPEG_QUALITY, THUMBNAIL_QUALITY])
+
+
+class _FrameWriter:
+    def __init__(self, workers: int = 1, queue_size: int = None, encode=None):
+        """
+        Encodes and writes frames, optionally on a pool of threads.
+
+        cv2.imwrite releases the GIL while encoding, so threads scale across cores.
+        At most ``queue_size`` frames are held in memory; write() blocks beyond that.
+
+        :param workers: Number of encoder threads (1 = write inline).
+        :param queue_size: Maximum number of frames waiting to be written
+                           (defaults to twice the worker count).
+        :param encode: Callable ``encode(filename, frame)`` writing one frame
+                       (defaults to cv2.imwrite).
+        """
+        self._encode = encode or cv2.imwrite
+        self._pool = None
+        self._error = None
+        if workers > 1:
+            self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='frame-writer')
+            self._slots = threading.BoundedSemaphore(queue_size or workers * 2)
+
+    def write(self, filename: str, frame):
+        """
+        Queues one frame for writing.
+
+        :returns: the Future of the write, or None when it was written inline;
+                  ``frame`` must not be modified until the Future is done
+        """
+        if self._error is not None:
+            raise self._error
+        if self._pool is None:
+            self._encode(filename, frame)
+            return None
+        self._slots.acquire()
+        try:
+            future = self._pool.submit(self._encode, filename, frame)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future) -> None:
+        self._slots.release()
+        if future.exception() is not None and self._error is None:
+            self._error = future.exception()
+
+    def close(self) -> None:
+        """Waits for pending writes and re-raises the first encoding error."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+
+class _FrameRing:
+    def __init__(self, buffers: int, size=None, color=None):
+        """
+        Output arrays cycled through by FrameExtractor.iter_frames.
+
+        Decoding, resizing and color conversion write into preallocated arrays
+        (allocated on first use), so steady-state iteration allocates nothing.
+
+        :param buffers: Number of output arrays (0 = allocate a new array per frame).
+        :param size: Optional (width, height) to resize to.
+        :param color: Optional cv2 color conversion code.
+        """
+        self._ring = [None] * max(buffers, 1)
+        self._reuse = buffers > 0
+        self._next = 0
+        self._size = tuple(size) if size is not None else None
+        self._color = color
+        self._decoded = None  # scratch arrays for the intermediate steps
+        self._resized = None
+
+    def retrieve(self, cap):
+        """
+        Retrieves the grabbed frame, transformed into the next output array.
+
+        The ring only advances on success, so the k-th yielded frame always
+        lives in slot ``k % buffers``.
+        """
+        slot = self._next
+        out = self._ring[slot] if self._reuse else None
+
+        if self._size is None and self._color is None:
+            success, frame = cap.retrieve(out)
+        else:
+            success, frame = cap.retrieve(self._decoded if self._reuse else None)
             if not success:
-                break
-            total += 1
-        # Reset frame position to start for future use
-        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                return False, None
+            if self._reuse:
+                self._decoded = frame
+            if self._size is not None:
+                dst = out if self._color is None else (self._resized if self._reuse else None)
+                frame = cv2.resize(frame, self._size, dst=dst, interpolation=cv2.INTER_AREA)
+                if self._color is not None and self._reuse:
+                    self._resized = frame
+            if self._color is not None:
+                frame = cv2.cvtColor(frame, self._color, dst=out)
 
-    cap.release()
-    return total
+        if success:
+            self._next = (slot + 1) % len(self._ring)
+            if self._reuse:
+                self._ring[slot] = frame
+        return success, frame
 
 
+def frame_signature(frame):
+    """
+    Computes a compact content signature of a frame for similarity checks.
+
+    :param frame: BGR or grayscale image.
+    :return: (normalized 16-bin intensity histogram, 64-element boolean difference hash)
+    """
+    small = cv2.resize(frame, _SIGNATURE_SIZE, interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    histogram = np.bincount((small >> 4).ravel(), minlength=_HISTOGRAM_BINS) / small.size
+    blocks = small.reshape(8, 4, 9, 4).mean(axis=(1, 3))
+    dhash = (blocks[:, 1:] > blocks[:, :-1]).ravel()
+    return histogram, dhash
+
+
+def signature_distance(a, b) -> float:
+    """
+    Difference between two frame signatures, from 0 (identical) to 1.
+
+    Takes the larger of the histogram distance (catches cuts and lighting
+    changes) and the hash distance (catches layout changes with similar tones).
+    """
+    histogram = 0.5 * np.abs(a[0] - b[0]).sum()
+    dhash = np.count_nonzero(a[1] != b[1]) / a[1].size
+    return max(float(histogram), dhash)
+
+
+def _extract_segment(video_path: str, output_folder: str, prefix: str, extension: str,
+                     start: int, stop, n: int, workers: int, encoding=None) -> int:
+    """
+    Saves every n-th frame of the range [start, stop) using global frame indices.
+
+    Runs in a worker process for segmented extraction, so it must stay a
+    module-level function. ``start`` must be a keyframe so the seek is exact.
+
+    :param stop: End index (exclusive), or None to read until the end of the file.
+    :param encoding: Optional FrameEncoding used to write the frames.
+    :returns: number of frames saved
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Could not open video file: {video_path}")
+    
+    if start:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    
+    count = start
+    saved = 0
+    try:
+        with _FrameWriter(workers, encode=encoding) as writer:
+            while stop is None or count < stop:
+                if count % n:
+                    # Frames that are not saved only need decoding, not conversion
+                    if not cap.grab():
+                        break
+                else:
+                    success, frame = cap.read()
+                    if not success:
+                        break
+                    filename = os.path.join(output_folder, f"{prefix}{count:06d}{extension}")
+                    writer.write(filename, frame)
+                    saved += 1
+                count += 1
+    finally:
+        cap.release()
+    return saved
+
 
 class FrameExtractor:
-    def __init__(self, video_path: str, output_folder: str, prefix: str = "frame", extension: str = ".jpg"):
+    def __init__(self, video_path: str, output_folder: str, prefix: str = "frame", extension: str = ".jpg",
+                 progress_callback=None, workers: int = 1, queue_size: int = None, quality: int = None,
+                 max_dimension: int = None, grayscale: bool = False, thumbnail_size: int = None,
+                 backend: str = "opencv", decode_threads: int = 0):
         """
         Initializes the frame extractor.
         
-        :param video_path: Path to input video file.
+        :param video_path: Path to input video file, or the video itself as bytes or a
+                           binary file-like object. Such sources are decoded through an
+                           ffmpeg pipe without a temporary file; they are read once and
+                           sequentially (no seeking or segments) and must be streamable.
         :param output_folder: Folder where extracted frames will be saved.
         :param prefix: Filename prefix for saved frames.
-        :param extension: File extension for saved images.
+        :param extension: File extension for saved images (".jpg", ".webp" or ".png").
+        :param progress_callback: Optional callable receiving (frames_done, frames_total);
+                                  frames_total is 0 when the length is unknown. Calls are
+                                  rate-limited to one per PROGRESS_INTERVAL_SECONDS, plus
+                                  the final one.
+        :param workers: Number of threads encoding and writing frames in parallel with decoding.
+        :param queue_size: Maximum number of decoded frames waiting to be written
+                           (defaults to twice the worker count).
+        :param quality: JPEG/WebP quality from 1 to 100 (OpenCV's default when None).
+        :param max_dimension: Downscale saved frames so the longer side is at most this size.
+        :param grayscale: Save single-channel images.
+        :param thumbnail_size: Also save a small JPEG of each frame (longer side in pixels)
+                               into ``output_folder/thumbs`` during the same pass.
+        :param backend: Decoder, one of DECODE_BACKENDS (see open_capture). With "pyav" and
+                        "ffmpeg", max_dimension is applied by the decoder instead of after
+                        decoding. Segmented extraction always decodes with OpenCV, and the
+                        "ffmpeg" backend reads sequentially (no seeking).
+        :param decode_threads: Decoder threads (0 = the backend's default).
         """
+        if backend not in DECODE_BACKENDS:
+            raise ValueError(f"Unknown decode backend '{backend}', expected one of {DECODE_BACKENDS}.")
+        if decode_threads < 0:
+            raise ValueError("decode_threads must be zero or a positive integer.")
+        self.encoding = FrameEncoding(extension, quality, max_dimension, grayscale, thumbnail_size)
         self.video_path = video_path
         self.output_folder = output_folder
         self.prefix = prefix
         self.extension = extension
+        self.progress_callback = progress_callback
+        self._next_report = 0.0
+        if workers <= 0:
+            raise ValueError("workers must be a positive integer.")
+        self.workers = workers
+        self.queue_size = queue_size
+        self.backend = backend
+        self.decode_threads = decode_threads
 
         # Create output folder if it does not exist
         os.makedirs(self.output_folder, exist_ok=True)
+        if thumbnail_size:
+            os.makedirs(os.path.join(self.output_folder, THUMBNAIL_FOLDER), exist_ok=True)
+    
+    @property
+    def _streamed(self) -> bool:
+        return not _is_path(self.video_path)
+    
+    @property
+    def _seekable(self) -> bool:
+        return not self._streamed and self.backend != "ffmpeg"
     
+    def _open(self, max_dimension: int = None, keyframes_only: bool = False):
+        return open_capture(self.video_path, self.backend, self.decode_threads, max_dimension, keyframes_only)
     
+    def _decode_dimension(self):
+        # OpenCV cannot scale while decoding; then FrameEncoding resizes on the writer threads
+        if self.backend == "opencv" and not self._streamed:
+            return None
+        return self.encoding.max_dimension
     
-    def extract_frames(self):
+    def _writer(self) -> _FrameWriter:
+        return _FrameWriter(self.workers, self.queue_size, encode=self.encoding)
+    
+    def _report(self, done: int, total: int) -> None:
+        if self.progress_callback is None:
+            return
+        now = time.monotonic()
+        if now >= self._next_report or done == total:
+            self._next_report = now + PROGRESS_INTERVAL_SECONDS
+            self.progress_callback(done, total)
+    
+    
+    def _segment_bounds(self, segments: int) -> list:
         """
-        Extracts *all* frames from the video and saves them sequentially.
-        
-        :returns: number of frames saved
+        Splits the video into at most ``segments`` ranges starting on keyframes.
+
+        :returns: list of (start, stop) index pairs; the last stop is None (end of file).
+                  A single range is returned when keyframes cannot be probed.
         """
         cap = cv2.VideoCapture(self.video_path)
         if not cap.isOpened():
             raise IOError(f"Could not open video file: {self.video_path}")
+        total = get_total_frames(self.video_path, cap=cap)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        cap.release()
         
-        count = 0
-        success, frame = cap.read()
-        while success:
-            filename = os.path.join(self.output_folder, f"{self.prefix}{count:06d}{self.extension}")
-            cv2.imwrite(filename, frame)
-            count += 1
-            success, frame = cap.read()
+        segments = min(segments, total // MIN_SEGMENT_FRAMES)
+        keyframes = get_keyframe_indices(self.video_path, fps) if segments > 1 else None
+        if not keyframes:
+            return [(0, None)]
         
-        cap.release()
-        return count
+        # Snap each evenly spaced cut point to the nearest following keyframe
+        cuts = []
+        for i in range(1, segments):
+            k = bisect.bisect_left(keyframes, total * i // segments)
+            if k < len(keyframes) and 0 < keyframes[k] < total and (not cuts or keyframes[k] > cuts[-1]):
+                cuts.append(keyframes[k])
+        
+        starts = [0] + cuts
+        return list(zip(starts, cuts + [None]))
     
-    def extract_every_nth(self, n: int) -> int:
+    def _extract_segmented(self, n: int, segments: int) -> int:
         """
-        Extracts every n-th frame from the video and saves them.
+        Saves every n-th frame, decoding keyframe-aligned segments in parallel processes.
         
-        :param n: interval of frames to save (e.g., n=10 => save every 10th frame)
         :returns: number of frames saved
         """
-        if n <= 0:
-            raise ValueError("n must be a positive integer.")
+        bounds = self._segment_bounds(segments)
+        # Share the writer threads between the decoder processes
+        workers = max(1, self.workers // len(bounds))
+        args = (self.video_path, self.output_folder, self.prefix, self.extension)
         
-        cap = cv2.VideoCapture(self.video_path)
-        if not cap.isOpened():
-            raise IOError(f"Could not open video file: {self.video_path}")
+        if len(bounds) == 1:
+            return _extract_segment(*args, 0, None, n, self.workers, self.encoding)
         
-        count = 0
         saved = 0
-        success, frame = cap.read()
-        while success:
-            if count % n == 0:
-                filename = os.path.join(self.output_folder, f"{self.prefix}{count:06d}{self.extension}")
-                cv2.imwrite(filename, frame)
-                saved += 1
-            count += 1
-            success, frame = cap.read()
-
-        cap.release()
+        # Spawned, not forked: the caller may be multithreaded (web app, writer pools)
+        # and a forked child could inherit locks held by other threads
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=len(bounds), mp_context=context) as pool:
+            futures = [pool.submit(_extract_segment, *args, start, stop, n, workers, self.encoding)
+                       for start, stop in bounds]
+            for done, future in enumerate(as_completed(futures), start=1):
+                saved += future.result()
+                self._report(done, len(bounds))
         return saved
     
-    def extract_n_frames(self, n: int) -> int:
+    def iter_frames(self, every: int = 1, n: int = None, timestamps=None, size=None, color=None,
+                    strategy: str = "auto", buffers: int = 1, max_dimension: int = None,
+                    keyframes_only: bool = False):
         """
-        Extract exactly N frames uniformly spaced across the video.
+        Lazily decodes frames, yielding ``(index, timestamp, frame)`` tuples.
         
-        :param n: number of frames you want to extract
-        :returns: number of frames actually saved
-        :raises: ValueError if requested n > total frames
+        Frames are selected by ``n`` (N frames uniformly spaced across the video),
+        ``timestamps`` (the frame at each time, in seconds) or otherwise ``every``
+        (every n-th frame; 1 = all frames). Arguments are validated and the video is
+        opened when this is called, not on the first iteration.
+        
+        :param every: interval of frames to yield when neither n nor timestamps is given
+        :param n: number of uniformly spaced frames to yield
+        :param timestamps: iterable of times in seconds; frames are yielded in ascending
+                           order and times past the end are skipped
+        :param size: optional (width, height) each frame is resized to during decode
+        :param color: optional conversion applied during decode, a COLOR_CONVERSIONS name
+                      ("rgb", "gray", ...) or a cv2.COLOR_BGR2* code
+        :param strategy: how to reach N-uniform/timestamp targets (see extract_n_frames)
+        :param buffers: number of output arrays cycled through, so no array is allocated
+                        per frame; a yielded frame is overwritten once ``buffers`` more
+                        frames have been yielded (copy frames kept longer, or pass 0 to
+                        get a new array every time)
+        :param max_dimension: downscale frames so the longer side is at most this size; the
+                              pyav and ffmpeg backends scale while decoding (ignored when
+                              size is given)
+        :param keyframes_only: yield only keyframes (every n-th keyframe with ``every``),
+                               skipping the decode of all other frames; needs the pyav or
+                               ffmpeg backend and cannot be combined with n or timestamps
+        :returns: generator of (frame index, timestamp in seconds, ndarray)
+        :raises: ValueError for invalid arguments or if n exceeds the frame count,
+                 RuntimeError if the frame count needed for n is unavailable
         """
-        cap = cv2.VideoCapture(self.video_path)
-        if not cap.isOpened():
+        if n is not None and timestamps is not None:
+            raise ValueError("Pass either n or timestamps, not both.")
+        if every <= 0:
+            raise ValueError("every must be a positive integer.")
+        if n is not None and n <= 0:
+            raise ValueError("n must be a positive integer.")
+        if strategy not in READ_STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}', expected one of {READ_STRATEGIES}.")
+        if isinstance(color, str):
+            if color not in COLOR_CONVERSIONS:
+                raise ValueError(f"Unknown color '{color}', expected one of {tuple(COLOR_CONVERSIONS)}.")
+            color = COLOR_CONVERSIONS[color]
+        if buffers < 0:
+            raise ValueError("buffers must be zero or a positive integer.")
+        if max_dimension is not None and max_dimension <= 0:
+            raise ValueError("max_dimension must be a positive integer.")
+        if keyframes_only and (n is not None or timestamps is not None):
+            raise ValueError("keyframes_only cannot be combined with n or timestamps.")
+        
+        cap = self._open(max_dimension if size is None else None, keyframes_only)
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            if n is not None:
+                indices = self._uniform_indices(cap, n)
+            elif timestamps is not None:
+                if fps <= 0:
+                    raise RuntimeError("Could not determine the frame rate of the video.")
+                indices = sorted({int(round(t * fps)) for t in timestamps if t >= 0})
+            else:
+                indices = None
+            if size is None and max_dimension:
+                # No-op for decoders that already scaled
+                size = _fit_size(int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                                 int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)), max_dimension)
+        except Exception:
             cap.release()
-            raise IOError(f"Could not open video file: {self.video_path}")
+            raise
         
-        total_frames = get_total_frames(self.video_path)
+        ring = _FrameRing(buffers, size, color)
+        if indices is None:
+            return self._iter_every(cap, every, fps, ring, keyframes_only)
+        return self._iter_targets(cap, indices, strategy, fps, ring)
+    
+    def _uniform_indices(self, cap, n: int) -> list:
+        if self._streamed:
+            # Streams cannot be rewound for counting; use the container duration
+            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        else:
+            total_frames = get_total_frames(self.video_path, cap=cap if self.backend == "opencv" else None)
         if total_frames == 0:
-            cap.release()
             raise RuntimeError("Could not determine total frame count for the video.")
         
         if n > total_frames:
-            cap.release()
             raise ValueError(f"Requested {n} frames, but video only has {total_frames} frames.")
         
         # Compute the interval between frames (in terms of frame count) to pick
         interval = total_frames / float(n)
+        return [int(math.floor(i * interval)) for i in range(n)]
+    
+    @staticmethod
+    def _timestamp(cap, index: int, fps: float) -> float:
+        if fps > 0:
+            return index / fps
+        return cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+    
+    def _iter_every(self, cap, every: int, fps: float, ring, keyframes_only: bool = False):
+        total = max(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), 0)
+        count = 0
+        try:
+            while cap.grab():
+                # With keyframes only, the decoder skips ahead and reports where it is
+                index = int(cap.get(cv2.CAP_PROP_POS_FRAMES)) - 1 if keyframes_only else count
+                if count % every == 0:
+                    # Frames that are not yielded only need decoding, not conversion
+                    success, frame = ring.retrieve(cap)
+                    if not success:
+                        break
+                    yield index, self._timestamp(cap, index, fps), frame
+                count += 1
+                self._report(index + 1, total)
+        finally:
+            cap.release()
+    
+    def _iter_targets(self, cap, indices, strategy: str, fps: float, ring):
+        seeks = self._plan_seeks(cap, indices, strategy)
+        n = len(indices)
+        pos = 0  # index of the next frame the decoder will return
+        try:
+            for i, frame_idx in enumerate(indices):
+                if seeks[i]:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+                    pos = frame_idx
+                else:
+                    # Decode and drop the frames in between without converting them
+                    while pos < frame_idx and cap.grab():
+                        pos += 1
+                
+                success = pos == frame_idx and cap.grab()
+                if success:
+                    pos += 1
+                    success, frame = ring.retrieve(cap)
+                self._report(i + 1, n)
+                if not success:
+                    # if it fails, you can skip or break; here we skip
+                    continue
+                yield frame_idx, self._timestamp(cap, frame_idx, fps), frame
+        finally:
+            cap.release()
+    
+    def iter_scene_changes(self, threshold: float = SCENE_THRESHOLD, max_frames: int = SCENE_MAX_FRAMES,
+                           every: int = 1, buffers: int = 1, max_dimension: int = None):
+        """
+        Lazily yields ``(index, timestamp, frame)`` for frames with new content.
         
-        saved = 0
-        for i in range(n):
-            # compute the frame index to capture
-            frame_idx = int(math.floor(i * interval))
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-            success, frame = cap.read()
-            if not success:
-                # if it fails, you can skip or break; here we skip
-                continue
-            filename = os.path.join(self.output_folder, f"{self.prefix}{saved:06d}{self.extension}")
-            cv2.imwrite(filename, frame)
-            saved += 1
+        The first frame is always yielded; after that a frame is yielded when its
+        signature (see frame_signature) differs from the last yielded frame by more
+        than ``threshold``, so scene cuts are kept and near-duplicates are dropped
+        before anything is encoded. Iteration stops after ``max_frames`` frames.
         
-        cap.release()
+        :param threshold: minimum signature distance (0..1) from the last kept frame
+        :param max_frames: maximum number of frames to yield (the first ones in the video)
+        :param every: only consider every n-th frame (1 = all frames)
+        :param buffers: as in iter_frames, counted over the yielded frames only
+        :param max_dimension: as in iter_frames
+        :returns: generator of (frame index, timestamp in seconds, ndarray)
+        :raises: ValueError for invalid arguments
+        """
+        if not 0 <= threshold <= 1:
+            raise ValueError("threshold must be between 0 and 1.")
+        if max_frames <= 0:
+            raise ValueError("max_frames must be a positive integer.")
+        frames = self.iter_frames(every=every, max_dimension=max_dimension)
+        return self._select_novel(frames, threshold, max_frames, buffers)
+    
+    @staticmethod
+    def _select_novel(frames, threshold: float, max_frames: int, buffers: int):
+        # Decoded frames are overwritten by the next decode, so kept frames are
+        # copied into a ring of their own. Like _FrameRing, the k-th yielded frame
+        # lives in slot k % buffers, which is what _save relies on to wait for a
+        # slot's write before it is reused
+        ring = [None] * max(buffers, 1)
+        kept = 0
+        last = None
+        try:
+            for index, timestamp, frame in frames:
+                signature = frame_signature(frame)
+                if last is not None and signature_distance(signature, last) <= threshold:
+                    continue
+                last = signature
+                slot = kept % len(ring)
+                if buffers and ring[slot] is not None and ring[slot].shape == frame.shape:
+                    np.copyto(ring[slot], frame)
+                else:
+                    ring[slot] = frame.copy()
+                yield index, timestamp, ring[slot]
+                kept += 1
+                if kept >= max_frames:
+                    break
+        finally:
+            frames.close()
+    
+    def _save(self, frames, name_by_index: bool) -> int:
+        """
+        Writes frames from iter_frames() to the output folder.
+        
+        :param name_by_index: name files by frame index instead of by save order
+        :returns: number of frames saved
+        """
+        saved = 0
+        # Writes finish in any order, but the ring hands out its arrays in yield
+        # order: before the next frame is decoded, every frame except the last
+        # ``ring - 1`` must be written, or its array would be overwritten mid-encode
+        ring = self._ring_size()
+        pending = deque()
+        with self._writer() as writer:
+            for index, _, frame in frames:
+                number = index if name_by_index else saved
+                filename = os.path.join(self.output_folder, f"{self.prefix}{number:06d}{self.extension}")
+                future = writer.write(filename, frame)
+                saved += 1
+                if future is not None:
+                    pending.append(future)
+                    while len(pending) >= ring:
+                        # Errors are raised by the writer on the next write or on close
+                        pending.popleft().exception()
         return saved
-    
\ No newline at end of file
+    
+    def _ring_size(self) -> int:
+        # Arrays of frames still being written plus the one being decoded
+        return self._writer_capacity() + 1
+    
+    def _writer_capacity(self) -> int:
+        if self.workers <= 1:
+            return 0
+        return self.queue_size or self.workers * 2
+    
+    def extract_frames(self, segments: int = 1):
+        """
+        Extracts *all* frames from the video and saves them sequentially.
+        
+        :param segments: number of decoder processes; the video is split into that many
+                         keyframe-aligned ranges (filenames match single-process output)
+        :returns: number of frames saved
+        """
+        if segments > 1 and not self._streamed:
+            return self._extract_segmented(1, segments)
+        frames = self.iter_frames(buffers=self._ring_size(), max_dimension=self._decode_dimension())
+        return self._save(frames, name_by_index=True)
+    
+    def extract_every_nth(self, n: int, segments: int = 1) -> int:
+        """
+        Extracts every n-th frame from the video and saves them.
+        
+        :param n: interval of frames to save (e.g., n=10 => save every 10th frame)
+        :param segments: number of decoder processes; the video is split into that many
+                         keyframe-aligned ranges (filenames match single-process output)
+        :returns: number of frames saved
+        """
+        if n <= 0:
+            raise ValueError("n must be a positive integer.")
+        
+        if segments > 1 and not self._streamed:
+            return self._extract_segmented(n, segments)
+        frames = self.iter_frames(every=n, buffers=self._ring_size(), max_dimension=self._decode_dimension())
+        return self._save(frames, name_by_index=True)
+    
+    def _plan_seeks(self, cap, indices, strategy: str) -> list:
+        """
+        Decides, for each target index, whether to seek to it or grab forward.
+
+        :returns: list of booleans, True where a seek should be issued
+        """
+        if strategy == "seek" and self._seekable:
+            return [True] * len(indices)
+        if strategy == "sequential" or not self._seekable:
+            return [False] * len(indices)
+
+        keyframes = get_keyframe_indices(self.video_path, cap.get(cv2.CAP_PROP_FPS))
+        plan = []
+        pos = 0
+        for frame_idx in indices:
+            if keyframes:
+                # A seek restarts decoding at the last keyframe before the target, so it
+                # only pays off when that keyframe lies well beyond the current position
+                k = bisect.bisect_right(keyframes, frame_idx)
+                keyframe = keyframes[k - 1] if k else 0
+                plan.append(keyframe - pos > MIN_SEEK_SKIP_FRAMES)
+            else:
+                plan.append(frame_idx - pos > SEEK_GAP_FRAMES)
+            pos = frame_idx + 1
+        return plan
+
+    def extract_scene_changes(self, threshold: float = SCENE_THRESHOLD, max_frames: int = SCENE_MAX_FRAMES,
+                              every: int = 1) -> int:
+        """
+        Saves the frames where the content changes, skipping near-duplicates.
+        
+        :param threshold: minimum difference (0..1) from the last saved frame;
+                          lower keeps more frames
+        :param max_frames: maximum number of frames to save
+        :param every: only consider every n-th frame (1 = all frames)
+        :returns: number of frames saved (files are named by frame index)
+        """
+        frames = self.iter_scene_changes(threshold, max_frames, every, buffers=self._ring_size(),
+                                         max_dimension=self._decode_dimension())
+        return self._save(frames, name_by_index=True)
+    
+    def extract_n_frames(self, n: int, strategy: str = "auto") -> int:
+        """
+        Extract exactly N frames uniformly spaced across the video.
+        
+        :param n: number of frames you want to extract
+        :param strategy: how to reach each target frame:
+                         "sequential" decodes the file once and keeps only the targets,
+                         "seek" seeks to every target,
+                         "auto" grabs forward while no keyframe lies between the current
+                         position and the next target, and seeks otherwise
+                         (streamed sources and the ffmpeg backend always read sequentially)
+        :returns: number of frames actually saved
+        :raises: ValueError if requested n > total frames or strategy is unknown
+        """
+        frames = self.iter_frames(n=n, strategy=strategy, buffers=self._ring_size(),
+                                  max_dimension=self._decode_dimension())
+        return self._save(frames, name_by_index=False)
+
+    def extract_storyboard(self, n: int, tile_size: int = STORYBOARD_TILE_SIZE, columns: int = STORYBOARD_COLUMNS,
+                           rows: int = STORYBOARD_ROWS, strategy: str = "auto") -> dict:
+        """
+        Saves N frames uniformly spaced across the video as tiles of sprite sheets.
+
+        Frames are sampled as in extract_n_frames and scaled while decoding where the
+        backend supports it. Tiles fill each sheet row by row, so tile i is on sheet
+        ``i // (columns * rows)`` at column ``i % columns`` of row ``i // columns % rows``;
+        the last sheet is cropped to the rows it uses. Sheets are named like frames
+        (prefix + number) and written with the extractor's format, quality and grayscale
+        settings (max_dimension does not apply).
+
+        :param n: number of tiles
+        :param tile_size: longer side of each tile in pixels
+        :param columns: tiles per sheet row
+        :param rows: tile rows per sheet
+        :param strategy: how to reach each sampled frame (see extract_n_frames)
+        :returns: dict with "sheets" (file names), "times" (timestamp in seconds of each
+                  tile), "tile_width", "tile_height", "columns" and "rows"
+        :raises: ValueError for invalid arguments or if n exceeds the frame count
+        """
+        if tile_size <= 0 or columns <= 0 or rows <= 0:
+            raise ValueError("tile_size, columns and rows must be positive integers.")
+        encode = FrameEncoding(self.extension, self.encoding.quality, grayscale=self.encoding.grayscale)
+        per_sheet = columns * rows
+        sheets, times = [], []
+        sheet = None
+        tile_height = tile_width = 0
+
+        def write_sheet(used: int) -> None:
+            filename = f"{self.prefix}{len(sheets):03d}{self.extension}"
+            encode(os.path.join(self.output_folder, filename), sheet[:math.ceil(used / columns) * tile_height])
+            sheets.append(filename)
+
+        for _, timestamp, frame in self.iter_frames(n=n, strategy=strategy, max_dimension=tile_size):
+            slot = len(times) % per_sheet
+            if slot == 0:
+                if sheet is not None:
+                    write_sheet(per_sheet)
+                tile_height, tile_width = frame.shape[:2]
+                sheet = np.zeros((rows * tile_height, columns * tile_width) + frame.shape[2:], frame.dtype)
+            row, column = divmod(slot, columns)
+            sheet[row * tile_height:(row + 1) * tile_height, column * tile_width:(column + 1) * tile_width] = frame
+            times.append(round(timestamp, 3))
+        if sheet is not None:
+            write_sheet((len(times) - 1) % per_sheet + 1)
+
+        return {
+            "sheets": sheets,
+            "times": times,
+            "tile_width": tile_width,
+            "tile_height": tile_height,
+            "columns": columns,
+            "rows": rows,
+        }
@@ -0,0 +1,140 @@
+"""
+Lightweight container inspection helpers built on ffprobe.
+
+Every helper returns None when ffprobe is missing or fails, so callers can
+fall back to slower OpenCV-based approaches.
+"""
+
+import shutil
+import subprocess
+
+FFPROBE_TIMEOUT_SECONDS = 120
+
+
+def has_ffprobe() -> bool:
+    """Check if ffprobe is available on PATH."""
+    return shutil.which('ffprobe') is not None
+
+
+def _run_ffprobe(args, video_path: str):
+    """
+    Runs ffprobe quietly and returns its stdout lines.
+
+    :return: List of non-empty output lines, or None on failure.
+    """
+    if not has_ffprobe():
+        return None
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', *args, video_path],
+            capture_output=True,
+            text=True,
+            timeout=FFPROBE_TIMEOUT_SECONDS,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+
+
+def get_keyframe_indices(video_path: str, fps: float):
+    """
+    Lists the frame indices of the keyframes in the first video stream.
+
+    Only packet headers are read (no decoding), so this is cheap even for
+    long files.
+
+    :param video_path: Path to the video file.
+    :param fps: Frame rate used to convert packet timestamps to indices.
+    :return: Sorted list of keyframe indices, or None if unavailable.
+    """
+    if fps <= 0:
+        return None
+    lines = _run_ffprobe(
+        ['-select_streams', 'v:0', '-show_entries', 'packet=pts_time,flags', '-of', 'csv=print_section=0'],
+        video_path,
+    )
+    if not lines:
+        return None
+
+    times = []
+    keyframe_times = []
+    for line in lines:
+        pts_time, _, flags = line.partition(',')
+        try:
+            t = float(pts_time)
+        except ValueError:
+            continue
+        times.append(t)
+        if flags.startswith('K'):
+            keyframe_times.append(t)
+
+    if not keyframe_times:
+        return None
+    start = min(times)
+    return sorted({int(round((t - start) * fps)) for t in keyframe_times})
+
+
+def get_stream_frame_count(video_path: str):
+    """
+    Reads the frame count stored in the container header of the first video stream.
+
+    :return: Frame count, or None if the container does not record it.
+    """
+    lines = _run_ffprobe(
+        ['-select_streams', 'v:0', '-show_entries', 'stream=nb_frames', '-of', 'csv=p=0'],
+        video_path,
+    )
+    try:
+        count = int(lines[0])
+    except (TypeError, IndexError, ValueError):
+        return None
+    return count if count > 0 else None
+
+
+def count_video_packets(video_path: str):
+    """
+    Counts the packets of the first video stream by demuxing without decoding.
+
+    :return: Packet count (one per frame for common codecs), or None on failure.
+    """
+    lines = _run_ffprobe(
+        ['-select_streams', 'v:0', '-count_packets', '-show_entries', 'stream=nb_read_packets', '-of', 'csv=p=0'],
+        video_path,
+    )
+    try:
+        count = int(lines[0])
+    except (TypeError, IndexError, ValueError):
+        return None
+    return count if count > 0 else None
+
+
+def get_audio_codec(video_path: str):
+    """
+    Reads the codec name of the first audio stream.
+
+    :return: Codec name (e.g. "aac"), an empty string if the file has no audio
+             stream, or None if ffprobe is unavailable or fails.
+    """
+    lines = _run_ffprobe(
+        ['-select_streams', 'a:0', '-show_entries', 'stream=codec_name', '-of', 'csv=p=0'],
+        video_path,
+    )
+    if lines is None:
+        return None
+    return lines[0] if lines else ''
+
+
+def get_duration(video_path: str):
+    """
+    Reads the container duration.
+
+    :return: Duration in seconds, or None if unavailable.
+    """
+    lines = _run_ffprobe(['-show_entries', 'format=duration', '-of', 'csv=p=0'], video_path)
+    try:
+        duration = float(lines[0])
+    except (TypeError, IndexError, ValueError):
+        return None
+    return duration if duration > 0 else None
@@ -0,0 +1,84 @@
+"""
+Every decode path must yield the same frames, at the same indices, for one input.
+
+The ffmpeg pipe (streamed uploads and the "ffmpeg" backend) used to run at
+ffmpeg's default constant output rate, duplicating frames across timestamp
+gaps and shifting every later index. The fixtures are Matroska files, the
+kind of upload that is decoded through the pipe.
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+try:
+    import av
+except ImportError:  # the pyav backend is optional
+    av = None
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from get_frames import FrameExtractor
+
+pytestmark = pytest.mark.skipif(shutil.which('ffmpeg') is None, reason='ffmpeg is required')
+
+
+def _encode(path, video_filter=None):
+    command = ['ffmpeg', '-y', '-v', 'error', '-f', 'lavfi', '-i', 'testsrc=duration=4:size=160x120:rate=25']
+    if video_filter:
+        command += ['-vf', video_filter, '-fps_mode', 'passthrough']
+    command += ['-c:v', 'libx264', '-g', '25', '-pix_fmt', 'yuv420p', path]
+    subprocess.run(command, check=True)
+    return path
+
+
+@pytest.fixture(scope='module')
+def gap_video(tmp_path_factory):
+    # Half a second without frames after frame 50, as in clips with dropped frames
+    return _encode(str(tmp_path_factory.mktemp('video') / 'gap.mkv'), 'setpts=(N*0.04+gte(N\\,50)*0.5)/TB')
+
+
+@pytest.fixture(scope='module')
+def remuxed_video(tmp_path_factory):
+    folder = tmp_path_factory.mktemp('video')
+    source = _encode(str(folder / 'source.mp4'))
+    path = str(folder / 'remux.mkv')
+    subprocess.run(['ffmpeg', '-y', '-v', 'error', '-i', source, '-c', 'copy', path], check=True)
+    return path
+
+
+def _frames(source, tmp_path, backend='opencv', **selection):
+    extractor = FrameExtractor(source, str(tmp_path), backend=backend)
+    return [(index, hashlib.sha256(frame.tobytes()).hexdigest())
+            for index, _, frame in extractor.iter_frames(buffers=0, **selection)]
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('selection', [{}, {'every': 7}, {'timestamps': [0.0, 1.5, 2.2, 2.5, 3.9]}])
+def test_pipe_matches_opencv(gap_video, tmp_path, selection):
+    expected = _frames(gap_video, tmp_path, **selection)
+    assert _frames(_read(gap_video), tmp_path, **selection) == expected
+
+
+def test_pipe_matches_opencv_for_n_frames(remuxed_video, tmp_path):
+    expected = _frames(remuxed_video, tmp_path, n=10)
+    assert len(_frames(remuxed_video, tmp_path)) == 100
+    assert _frames(_read(remuxed_video), tmp_path, n=10) == expected
+
+
+@pytest.mark.parametrize('backend', [
+    'ffmpeg',
+    pytest.param('pyav', marks=pytest.mark.skipif(av is None, reason='PyAV is required')),
+])
+@pytest.mark.parametrize('selection', [{}, {'every': 7}])
+def test_backends_match_opencv(gap_video, tmp_path, backend, selection):
+    expected = _frames(gap_video, tmp_path, **selection)
+    assert _frames(gap_video, tmp_path, backend=backend, **selection) == expected
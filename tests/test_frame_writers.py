@@ -0,0 +1,66 @@
+"""
+Multi-threaded frame writing must save exactly what single-threaded writing saves.
+
+The decode loops reuse a ring of output arrays while writer threads are still
+encoding earlier frames, and writes finish out of order. An encoder that is
+slow for some frames forces that reordering, so an array reused too early
+shows up as a saved frame that differs from the single-worker output.
+"""
+
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from get_frames import FrameExtractor
+
+FRAMES = 60
+SIZE = (64, 48)
+
+
+@pytest.fixture(scope='module')
+def video(tmp_path_factory):
+    # Random content per frame, so every frame differs and is kept as a scene change
+    path = str(tmp_path_factory.mktemp('video') / 'noise.avi')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 25, SIZE)
+    rng = np.random.default_rng(0)
+    for _ in range(FRAMES):
+        writer.write(rng.integers(0, 256, (SIZE[1], SIZE[0], 3), dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def _slow_every_third(encoding):
+    def encode(filename, frame):
+        if int(filename[-10:-4]) % 3 == 0:
+            time.sleep(0.01)
+        encoding(filename, frame)
+    return encode
+
+
+def _extract(video, folder, workers, method, *args):
+    extractor = FrameExtractor(video, str(folder), extension='.png', workers=workers, queue_size=2)
+    extractor.encoding = _slow_every_third(extractor.encoding)
+    saved = getattr(extractor, method)(*args)
+    return saved, {name: (folder / name).read_bytes() for name in sorted(os.listdir(folder))}
+
+
+@pytest.mark.parametrize('method, args', [
+    ('extract_frames', ()),
+    ('extract_every_nth', (2,)),
+    ('extract_n_frames', (20, 'sequential')),
+    ('extract_scene_changes', (0.0, FRAMES)),
+])
+def test_multi_worker_output_matches_single_worker(video, tmp_path, method, args):
+    saved_single, single = _extract(video, tmp_path / 'single', 1, method, *args)
+    saved_multi, multi = _extract(video, tmp_path / 'multi', 4, method, *args)
+
+    assert saved_multi == saved_single > 0
+    assert multi.keys() == single.keys()
+    mismatched = [name for name in single if multi[name] != single[name]]
+    assert mismatched == []
@@ -1,4 +1,6 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file
+from werkzeug.utils import send_file as send_file_offloaded
+from urllib.parse import quote
 import os
 import sys
 import subprocess
@@ -9,6 +11,10 @@ import time
 import tempfile
 import uuid
 import shutil
+import hashlib
+import json
+import math
+import multiprocessing
 
 app = Flask(__name__)
 
@@ -20,9 +26,82 @@ sys.path.append(PROJECT_ROOT)
 TEMP_ROOT = os.path.join(tempfile.gettempdir(), 'videopy')
 os.makedirs(TEMP_ROOT, exist_ok=True)
 
-# Cleanup settings (seconds)
+# Cleanup settings (seconds): artifacts expire this long after their last access
 FILE_TTL_SECONDS = 30 * 60  # 30 minutes
-CLEANUP_INTERVAL_SECONDS = 10 * 60  # 10 minutes
+JOB_PRUNE_INTERVAL_SECONDS = 10 * 60  # 10 minutes
+
+from jobs import FAILED, FINISHED, JobQueue, QueueFullError
+from shared_state import (HostLock, JobStore, SharedArtifactRegistry, SharedArtifactStore, SharedDatabase,
+                          SharedResultCache, SharedTransferTracker)
+
+# Set (by wsgi.py) when several worker processes serve the app: jobs and the
+# artifact registry then live in a SQLite database all of them can see
+SHARED_STATE = os.environ.get('VIDEOPY_SHARED_STATE') == '1'
+shared_database = SharedDatabase(os.path.join(TEMP_ROOT, 'state.sqlite3')) if SHARED_STATE else None
+
+# Background pool for downloads and extractions (see jobs.py for tuning)
+job_queue = JobQueue(store=JobStore(shared_database) if SHARED_STATE else None)
+
+# Threads encoding/writing JPEGs per frame extraction job
+FRAME_WRITER_THREADS = int(os.environ.get('VIDEOPY_FRAME_WRITERS', os.cpu_count() or 1))
+
+# Decoder processes per all-frames / every-nth job (segments split on keyframes)
+FRAME_DECODE_PROCESSES = int(os.environ.get('VIDEOPY_FRAME_PROCESSES', '1'))
+
+# Frame decoder ("opencv", "pyav" or "ffmpeg", see get_frames.DECODE_BACKENDS) and its threads (0 = default)
+FRAME_DECODE_BACKEND = os.environ.get('VIDEOPY_DECODE_BACKEND', 'opencv')
+FRAME_DECODE_THREADS = int(os.environ.get('VIDEOPY_DECODE_THREADS', '0'))
+
+# Job event streams: longest wait for a change, and idle time before a keep-alive comment
+JOB_EVENT_WAIT_SECONDS = 1.0
+JOB_EVENT_HEARTBEAT_SECONDS = 15.0
+
+# Longer side of the preview thumbnails written next to extracted frames
+PREVIEW_THUMBNAIL_SIZE = 320
+
+# Storyboards for picking a YouTube cut: one tile every STORYBOARD_INTERVAL_SECONDS,
+# spread out further for videos that would need more than STORYBOARD_MAX_TILES
+STORYBOARD_INTERVAL_SECONDS = 2.0
+STORYBOARD_MAX_TILES = 400
+
+# Keep the low-resolution proxy the storyboard was sampled from, for a seekable preview
+STORYBOARD_KEEP_PROXY = os.environ.get('VIDEOPY_STORYBOARD_PROXY', '1') == '1'
+
+# Image formats offered for extracted frames
+FRAME_FORMATS = ('jpg', 'webp', 'png')
+
+# ffmpeg threads per audio extraction job (0 lets ffmpeg decide)
+AUDIO_FFMPEG_THREADS = int(os.environ.get('VIDEOPY_AUDIO_THREADS', '0'))
+
+# Read size used when streaming frames into a zip response
+ZIP_STREAM_CHUNK_SIZE = 256 * 1024
+
+# Read size used when copying (and hashing) uploads
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Hand large file transfers to the front-end server: "X-Sendfile" (Apache,
+# lighttpd) or "X-Accel-Redirect" (nginx, with an internal location at
+# ACCEL_REDIRECT_PREFIX aliased to TEMP_ROOT); empty serves them from Python
+SENDFILE_HEADER = os.environ.get('VIDEOPY_SENDFILE', '')
+ACCEL_REDIRECT_PREFIX = os.environ.get('VIDEOPY_ACCEL_PREFIX', '/_videopy_temp/')
+
+# How long an offloaded transfer keeps its file from being deleted (its end is not observable)
+OFFLOAD_HOLD_SECONDS = 30 * 60
+
+# Largest accepted request body (larger uploads are refused with 413)
+MAX_UPLOAD_BYTES = int(os.environ.get('VIDEOPY_MAX_UPLOAD_BYTES', str(4 * 1024 ** 3)))
+
+from uploads import StreamingRequest, UploadFile, UploadRejected, is_streamable
+from werkzeug.exceptions import RequestEntityTooLarge
+
+# Stream uploaded files straight into the temp storage instead of a spooled copy
+app.request_class = StreamingRequest
+app.config['UPLOAD_FOLDER'] = TEMP_ROOT
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES
+
+# Uploads up to this size are kept in memory; streamable ones are decoded for
+# frame extraction without ever being written to the temp storage
+app.config['UPLOAD_MEMORY_LIMIT'] = int(os.environ.get('VIDEOPY_UPLOAD_MEMORY_BYTES', str(64 * 1024 ** 2)))
 
 
 def _resolve_temp_path(*parts) -> Path:
@@ -33,27 +112,184 @@ def _resolve_temp_path(*parts) -> Path:
     return target
 
 
-def _cleanup_temp_storage() -> None:
+def _parse_flag(value, default: bool = False) -> bool:
+    """Read a boolean request field sent as JSON (true/false) or as a form string ("1", "true", "on", ...)"""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'on', 'yes')
+    return bool(value)
+
+
+def _artifact_exists(name: str) -> bool:
+    return _resolve_temp_path(name).exists()
+
+
+def _remove_artifact(name: str) -> None:
+    """Delete a top-level file or folder from the temp storage"""
+    try:
+        path = _resolve_temp_path(name)
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        elif path.exists():
+            path.unlink()
+    except Exception:
+        pass
+
+
+def _save_upload(file_storage, allow_memory=False):
+    """
+    Take over an uploaded file and return (source, SHA-256 digest).
+    
+    The source is a path in the temp storage, or the video bytes when
+    allow_memory is set and a small, streamable upload is still in memory.
+    """
+    if isinstance(file_storage.stream, UploadFile):
+        # Already written (or buffered) and hashed while the request body arrived
+        upload = file_storage.stream
+        data = upload.getvalue() if allow_memory else None
+        if data is not None and is_streamable(data, upload.container):
+            return data, upload.hexdigest()
+        return upload.keep(), upload.hexdigest()
+    
+    suffix = Path(file_storage.filename).suffix or '.mp4'
+    temp_fd, path = tempfile.mkstemp(prefix='upload_', suffix=suffix, dir=TEMP_ROOT)
+    os.close(temp_fd)
+    digest = hashlib.sha256()
+    with open(path, 'wb') as dst:
+        while True:
+            chunk = file_storage.stream.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            dst.write(chunk)
+    return path, digest.hexdigest()
+
+
+from artifact_registry import ArtifactRegistry, disk_usage
+from result_cache import ResultCache, make_key
+from artifact_store import ArtifactStore
+from transfers import TransferTracker
+
+# Files being sent to clients; their removal is deferred until the transfers end
+# (in any worker process with shared state)
+if SHARED_STATE:
+    transfers = SharedTransferTracker(shared_database, _remove_artifact)
+else:
+    transfers = TransferTracker(_remove_artifact)
+
+# Finished downloads, audio files and frames folders, removed whole when they
+# expire or when the temp storage quota is exceeded
+if SHARED_STATE:
+    artifact_registry = SharedArtifactRegistry(shared_database, transfers.remove, ttl=FILE_TTL_SECONDS)
+else:
+    artifact_registry = ArtifactRegistry(transfers.remove, ttl=FILE_TTL_SECONDS)
+
+# Results of repeated uploads and storyboards, keyed on (digest or video id, operation, parameters)
+if SHARED_STATE:
+    result_cache = SharedResultCache(shared_database, artifact_registry.remove, touch_artifact=artifact_registry.touch)
+else:
+    result_cache = ResultCache(artifact_registry.remove, touch_artifact=artifact_registry.touch)
+
+# YouTube downloads shared between identical requests (reference counts are
+# shared by all workers, so a delete on any of them sees every requester)
+if SHARED_STATE:
+    artifact_store = SharedArtifactStore(shared_database, artifact_registry.remove, exists=_artifact_exists,
+                                         touch_artifact=artifact_registry.touch)
+else:
+    artifact_store = ArtifactStore(artifact_registry.remove, exists=_artifact_exists,
+                                   touch_artifact=artifact_registry.touch)
+
+# Expired or evicted artifacts are dropped by their owners too
+artifact_registry.on_remove(result_cache.discard)
+artifact_registry.on_remove(artifact_store.discard)
+
+
+# Lock file naming the one process per host that sweeps the temp storage
+SWEEPER_LOCK_PATH = os.path.join(TEMP_ROOT, 'sweeper.lock')
+SWEEPER_TAKEOVER_SECONDS = 5.0
+
+# Bookkeeping files of the temp storage itself, never registered as artifacts
+_STATE_FILES = ('state.sqlite3', 'state.sqlite3-wal', 'state.sqlite3-shm', 'sweeper.lock')
+
+
+def _register_leftovers() -> None:
+    """Register unknown entries of the temp storage (e.g. from a previous run), aged by their mtime"""
+    with os.scandir(TEMP_ROOT) as entries:
+        leftovers = sorted((entry.stat().st_mtime, entry.name, entry.path) for entry in entries
+                           if entry.name not in _STATE_FILES)
+    for mtime, name, path in leftovers:
+        if artifact_registry.owner(name) is None:
+            artifact_registry.register(name, 'leftover', disk_usage(path), created=mtime)
+
+
+def _run_sweeper() -> None:
+    """Sweep the temp storage once this process holds the host lock (at once without shared state)"""
+    if SHARED_STATE:
+        host_lock = HostLock(SWEEPER_LOCK_PATH)
+        # Standby workers take over when the sweeping process exits
+        while not host_lock.acquire():
+            time.sleep(SWEEPER_TAKEOVER_SECONDS)
+        # Removals deferred by any worker are finished here
+        transfers.start()
+    _register_leftovers()
+    artifact_registry.start()
+
+
+def _prune_jobs() -> None:
     while True:
-        now = time.time()
-        try:
-            for path in Path(TEMP_ROOT).rglob('*'):
-                try:
-                    if path.is_file():
-                        if now - path.stat().st_mtime > FILE_TTL_SECONDS:
-                            path.unlink()
-                    elif path.is_dir():
-                        if now - path.stat().st_mtime > FILE_TTL_SECONDS and not any(path.iterdir()):
-                            path.rmdir()
-                except Exception:
-                    continue
-        except Exception:
-            pass
-        time.sleep(CLEANUP_INTERVAL_SECONDS)
+        time.sleep(JOB_PRUNE_INTERVAL_SECONDS)
+        job_queue.prune(FILE_TTL_SECONDS)
+
 
+# Every process prunes its own jobs; only one per host sweeps. Segmented frame
+# extraction spawns decoder processes, which re-import this module when it is
+# the main script (development server); they must not sweep
+if multiprocessing.parent_process() is None:
+    threading.Thread(target=_run_sweeper, name='sweeper-election', daemon=True).start()
+    threading.Thread(target=_prune_jobs, name='job-pruner', daemon=True).start()
+
+def _send_artifact(name: str, file_path: Path):
+    """
+    Serve a file of the temp artifact called name (the artifact itself or a file in
+    its folder), as an attachment unless ?inline=1 (for seekable previews).
+
+    Range (206), ETag and Last-Modified requests are answered by send_file, or
+    the transfer is handed to the front-end server when SENDFILE_HEADER is set.
+    ?name= sets the file name offered to the browser.
+    """
+    download_name = request.args.get('name') or file_path.name
+    as_attachment = request.args.get('inline') != '1'
+    if SENDFILE_HEADER:
+        # The front-end server handles ranges and conditional requests itself
+        response = send_file_offloaded(file_path, request.environ, as_attachment=as_attachment,
+                                       download_name=download_name, conditional=False,
+                                       use_x_sendfile=True, response_class=app.response_class)
+        if SENDFILE_HEADER.lower() == 'x-accel-redirect':
+            del response.headers['X-Sendfile']
+            response.headers['X-Accel-Redirect'] = ACCEL_REDIRECT_PREFIX + quote(
+                file_path.relative_to(Path(TEMP_ROOT).resolve()).as_posix())
+        transfers.hold(name, OFFLOAD_HOLD_SECONDS)
+        return response
+    
+    response = send_file(file_path, as_attachment=as_attachment, download_name=download_name, conditional=True)
+    if request.method != 'HEAD' and response.status_code in (200, 206):
+        # File responses bypass call_on_close (direct passthrough), so hook the body's
+        # close(), which the server calls when the transfer ends or is aborted; the body
+        # object itself stays the server's file wrapper (sendfile where supported)
+        body = response.response
+        close_body = body.close
+        
+        def close_transfer():
+            try:
+                close_body()
+            finally:
+                transfers.closed(name)
+        
+        transfers.opened(name)
+        body.close = close_transfer
+    return response
 
-_cleanup_thread = threading.Thread(target=_cleanup_temp_storage, daemon=True)
-_cleanup_thread.start()
 
 @app.route("/")
 def home():
@@ -69,116 +305,156 @@ def extract_youtube_info():
         if not url:
             return jsonify({'error': 'URL is required'}), 400
         
-        # Import the function from download_yt.py
-        from download_yt import check_ffmpeg
-        
         # Check if yt-dlp is available
         try:
             import yt_dlp
         except ImportError:
             return jsonify({'error': 'yt-dlp is not installed. Please install it with: pip install yt-dlp'}), 500
         
-        # Extract video info without downloading
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
+        # Import the functions from download_yt.py
+        from download_yt import check_ffmpeg, get_video_info
+        
+        # Extract video info without downloading (cached for the download step)
+        info = get_video_info(url)
+        
+        # Get the best thumbnail
+        thumbnail = None
+        if 'thumbnails' in info and info['thumbnails']:
+            # Get the highest quality thumbnail
+            thumbnail = max(info['thumbnails'], key=lambda x: x.get('height', 0) or 0)['url']
+        
+        video_info = {
+            'title': info.get('title', 'Unknown'),
+            'duration': info.get('duration', 0),
+            'uploader': info.get('uploader', 'Unknown'),
+            'view_count': info.get('view_count', 0),
+            'thumbnail': thumbnail,
+            'description': info.get('description', '')[:200] + '...' if info.get('description') else '',
+            'formats': len(info.get('formats', [])),
+            'ffmpeg_available': check_ffmpeg()
         }
         
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            
-            # Get the best thumbnail
-            thumbnail = None
-            if 'thumbnails' in info and info['thumbnails']:
-                # Get the highest quality thumbnail
-                thumbnail = max(info['thumbnails'], key=lambda x: x.get('height', 0) or 0)['url']
-            
-            video_info = {
-                'title': info.get('title', 'Unknown'),
-                'duration': info.get('duration', 0),
-                'uploader': info.get('uploader', 'Unknown'),
-                'view_count': info.get('view_count', 0),
-                'thumbnail': thumbnail,
-                'description': info.get('description', '')[:200] + '...' if info.get('description') else '',
-                'formats': len(info.get('formats', [])),
-                'ffmpeg_available': check_ffmpeg()
-            }
-            
-            return jsonify(video_info)
+        return jsonify(video_info)
             
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route("/api/youtube/download", methods=["POST"])
 def download_youtube_video():
-    """Download YouTube video with optional time range"""
+    """Queue a YouTube download with optional time range"""
     try:
         data = request.get_json()
         url = data.get('url')
         start_time = data.get('start_time') or None
         end_time = data.get('end_time') or None
+        exact_cut = _parse_flag(data.get('exact_cut'))
         
         if not url:
             return jsonify({'error': 'URL is required'}), 400
         
-        # Import the download function and yt-dlp
-        from download_yt import download_youtube_video, check_ffmpeg
-        import yt_dlp
-        
-        # Get video title first to construct filename
-        ydl_opts = {'quiet': True, 'no_warnings': True}
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            video_title = info.get('title', 'video')
+        # Optional network settings (they change how the file is fetched, not its content)
+        from download_yt import DEFAULT_CONCURRENT_FRAGMENTS, DEFAULT_HTTP_CHUNK_SIZE, network_options
+        network = {
+            'concurrent_fragments': data.get('concurrent_fragments', DEFAULT_CONCURRENT_FRAGMENTS),
+            'rate_limit': data.get('rate_limit'),
+            'chunk_size': data.get('chunk_size', DEFAULT_HTTP_CHUNK_SIZE),
+            'external_downloader': data.get('external_downloader'),
+            'keep_alive': _parse_flag(data.get('keep_alive'), default=True),
+        }
+        try:
+            network_options(**network)
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Clean filename
-        safe_title = "".join(c for c in video_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        job = job_queue.submit('youtube', _run_youtube_download, url, start_time, end_time, exact_cut, network)
+        return jsonify({'job_id': job.id, 'status': job.status}), 202
         
-        # Download the video to a dedicated temporary folder
-        yt_temp_dir = tempfile.mkdtemp(prefix='yt_', dir=TEMP_ROOT)
-        download_youtube_video(url, yt_temp_dir, start_time, end_time)
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def _run_youtube_download(job, url, start_time, end_time, exact_cut, network):
+    """Job body: fetch the shared download for this video and range"""
+    from download_yt import (FORMAT_WITH_FFMPEG, FORMAT_WITHOUT_FFMPEG, check_ffmpeg,
+                             convert_time_to_seconds, normalize_video_key)
+    
+    # Identical requests (video, format, range) share one download
+    key = (
+        normalize_video_key(url),
+        FORMAT_WITH_FFMPEG if check_ffmpeg() else FORMAT_WITHOUT_FFMPEG,
+        convert_time_to_seconds(start_time) if start_time else None,
+        convert_time_to_seconds(end_time) if end_time else None,
+        exact_cut,
+    )
+    
+    def produce(share_progress):
+        def set_progress(percent, **detail):
+            job.set_progress(percent, **detail)
+            share_progress(percent)
+        return _download_youtube_artifact(url, start_time, end_time, exact_cut, network, set_progress)
+    
+    return artifact_store.acquire(key, produce, on_progress=job.set_progress)
+
+
+def _download_youtube_artifact(url, start_time, end_time, exact_cut, network, set_progress):
+    """Download the video and move it into TEMP_ROOT"""
+    # Import the download helpers
+    from download_yt import download_youtube_video, get_video_info
+    
+    def progress_hook(d):
+        if d.get('status') == 'downloading':
+            total = d.get('total_bytes') or d.get('total_bytes_estimate')
+            if total:
+                set_progress(d.get('downloaded_bytes', 0) * 100.0 / total,
+                             downloaded_bytes=d.get('downloaded_bytes'), total_bytes=total,
+                             speed=d.get('speed'), eta=d.get('eta'))
+    
+    # Get video title first to construct filename (usually cached by the preview)
+    info = get_video_info(url)
+    video_title = info.get('title', 'video')
+    
+    # Clean filename
+    safe_title = "".join(c for c in video_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    
+    # Download the video to a dedicated temporary folder
+    yt_temp_dir = tempfile.mkdtemp(prefix='yt_', dir=TEMP_ROOT)
+    try:
+        downloaded = download_youtube_video(url, yt_temp_dir, start_time, end_time,
+                                            progress_hook=progress_hook, info=info, exact_cut=exact_cut,
+                                            **network)
         
-        # Find the downloaded file (most recent file in downloads folder)
+        # Use the path reported by yt-dlp, else the most recent file in the folder
         download_folder = Path(yt_temp_dir)
-        files = list(download_folder.glob("*.mp4"))
-        if not files:
-            files = list(download_folder.glob("*.mkv"))
+        if downloaded and Path(downloaded).is_file():
+            files = [Path(downloaded)]
+        else:
+            files = list(download_folder.glob("*.mp4"))
+            if not files:
+                files = list(download_folder.glob("*.mkv"))
+            if not files:
+                files = list(download_folder.glob("*.webm"))
+        
         if not files:
-            files = list(download_folder.glob("*.webm"))
+            raise RuntimeError('Download completed but file not found')
         
-        if files:
-            latest_file = max(files, key=lambda p: p.stat().st_mtime)
-            
-            # Create a safe filename for serving
-            download_name = safe_title[:100] + latest_file.suffix
-            file_id = f"yt_{uuid.uuid4().hex}{latest_file.suffix}"
-            safe_path = Path(TEMP_ROOT) / file_id
-            latest_file.rename(safe_path)
-
-            try:
-                shutil.rmtree(yt_temp_dir, ignore_errors=True)
-            except Exception:
-                pass
-
-            return jsonify({
-                'message': 'Download completed successfully',
-                'file_id': file_id,
-                'download_name': download_name
-            })
-        else:
-            try:
-                shutil.rmtree(yt_temp_dir, ignore_errors=True)
-            except Exception:
-                pass
-            return jsonify({'error': 'Download completed but file not found'}), 500
+        latest_file = max(files, key=lambda p: p.stat().st_mtime)
         
-    except Exception as e:
-        try:
-            if 'yt_temp_dir' in locals():
-                shutil.rmtree(yt_temp_dir, ignore_errors=True)
-        except Exception:
-            pass
-        return jsonify({'error': str(e)}), 500
+        # Create a safe filename for serving
+        download_name = safe_title[:100] + latest_file.suffix
+        file_id = f"yt_{uuid.uuid4().hex}{latest_file.suffix}"
+        safe_path = Path(TEMP_ROOT) / file_id
+        latest_file.rename(safe_path)
+        artifact_registry.register(file_id, 'download', safe_path.stat().st_size)
+    finally:
+        shutil.rmtree(yt_temp_dir, ignore_errors=True)
+    
+    return {
+        'message': 'Download completed successfully',
+        'file_id': file_id,
+        'download_name': download_name
+    }
 
 @app.route("/api/youtube/get-file/<path:filename>")
 def get_downloaded_file(filename):
@@ -189,12 +465,9 @@ def get_downloaded_file(filename):
         decoded_filename = unquote(filename)
         file_path = _resolve_temp_path(decoded_filename)
         
-        if file_path.exists():
-            return send_file(
-                file_path,
-                as_attachment=True,
-                download_name=decoded_filename
-            )
+        if file_path.is_file():
+            artifact_store.touch(decoded_filename)
+            return _send_artifact(decoded_filename, file_path)
         else:
             return jsonify({'error': f'File not found: {decoded_filename}'}), 404
     except Exception as e:
@@ -209,25 +482,137 @@ def delete_downloaded_file(filename):
         decoded_filename = unquote(filename)
         file_path = _resolve_temp_path(decoded_filename)
         
+        # The client's own download (or a resume of it) may still be starting
+        transfers.hold(decoded_filename)
+        
+        # Shared downloads are only removed once every requester has released them
+        if artifact_store.owns(decoded_filename):
+            if artifact_store.release(decoded_filename):
+                print(f"Scheduled deletion of file: {decoded_filename}")
+                return jsonify({'message': f'File will be deleted once its transfers finish: {decoded_filename}'})
+            return jsonify({'message': f'File released, still in use by other requests: {decoded_filename}'})
+        
         if file_path.exists():
-            # Try to delete with retries in case file is still being released
-            for attempt in range(5):
-                try:
-                    file_path.unlink()
-                    print(f"Deleted file: {decoded_filename}")
-                    return jsonify({'message': f'File deleted: {decoded_filename}'})
-                except PermissionError:
-                    time.sleep(0.5)
-            
-            return jsonify({'error': 'File is still in use, please try again'}), 500
+            artifact_registry.remove(decoded_filename)
+            print(f"Scheduled deletion of file: {decoded_filename}")
+            return jsonify({'message': f'File will be deleted once its transfers finish: {decoded_filename}'})
         else:
             return jsonify({'message': 'File already deleted or not found'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route("/api/youtube/storyboard", methods=["POST"])
+def create_youtube_storyboard():
+    """Queue a sprite-sheet storyboard of a YouTube video, for picking the cut range"""
+    try:
+        data = request.get_json()
+        url = data.get('url')
+
+        if not url:
+            return jsonify({'error': 'URL is required'}), 400
+
+        from download_yt import normalize_video_key
+        from get_frames import STORYBOARD_TILE_SIZE
+
+        # One storyboard per video, whatever range is eventually downloaded
+        cache_key = make_key(normalize_video_key(url), 'storyboard', interval=STORYBOARD_INTERVAL_SECONDS,
+                             max_tiles=STORYBOARD_MAX_TILES, tile_size=STORYBOARD_TILE_SIZE,
+                             proxy=STORYBOARD_KEEP_PROXY)
+        cached = result_cache.get(cache_key, exists=_artifact_exists)
+        if cached is not None:
+            job = job_queue.complete('storyboard', cached)
+            return jsonify({'job_id': job.id, 'status': job.status})
+
+        job = job_queue.submit('storyboard', _run_storyboard, url, cache_key)
+        return jsonify({'job_id': job.id, 'status': job.status}), 202
+
+    except QueueFullError as e:
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def _run_storyboard(job, url, cache_key):
+    """Job body: fetch the storyboard of this video, built once for concurrent requests"""
+    def produce(share_progress):
+        def set_progress(percent, **detail):
+            job.set_progress(percent, **detail)
+            share_progress(percent)
+        return _build_storyboard(url, cache_key, set_progress)
+
+    # Requests that missed the result cache while it is being built wait for it
+    return artifact_store.acquire(cache_key, produce, on_progress=job.set_progress)
+
+
+def _build_storyboard(url, cache_key, set_progress):
+    """Sample a storyboard from the video's lowest-bitrate stream into a TEMP_ROOT folder"""
+    from download_yt import download_proxy, get_video_info
+    from get_frames import FrameExtractor, get_video_duration
+
+    def progress_hook(d):
+        # The proxy download is most of the work; sampling takes the last 20%
+        if d.get('status') == 'downloading':
+            total = d.get('total_bytes') or d.get('total_bytes_estimate')
+            if total:
+                set_progress(d.get('downloaded_bytes', 0) * 80.0 / total,
+                             downloaded_bytes=d.get('downloaded_bytes'), total_bytes=total,
+                             speed=d.get('speed'), eta=d.get('eta'))
+
+    def progress_callback(done, total):
+        set_progress(80.0 + (done * 20.0 / total if total else 0), frames_done=done, frames_total=total)
+
+    info = get_video_info(url)
+    storyboard_folder = tempfile.mkdtemp(prefix='storyboard_', dir=TEMP_ROOT)
+    try:
+        proxy_path = download_proxy(url, storyboard_folder, progress_hook=progress_hook, info=info)
+        if not proxy_path or not os.path.isfile(proxy_path):
+            proxies = glob.glob(os.path.join(glob.escape(storyboard_folder), 'proxy.*'))
+            if not proxies:
+                raise RuntimeError('Download completed but file not found')
+            proxy_path = proxies[0]
+
+        duration = info.get('duration') or get_video_duration(proxy_path)
+        tiles = max(1, min(STORYBOARD_MAX_TILES, math.ceil(duration / STORYBOARD_INTERVAL_SECONDS)))
+        extractor = FrameExtractor(proxy_path, storyboard_folder, prefix='sheet', progress_callback=progress_callback,
+                                   backend=FRAME_DECODE_BACKEND, decode_threads=FRAME_DECODE_THREADS)
+        storyboard = extractor.extract_storyboard(tiles)
+
+        if not STORYBOARD_KEEP_PROXY:
+            os.remove(proxy_path)
+    except Exception:
+        shutil.rmtree(storyboard_folder, ignore_errors=True)
+        raise
+
+    # file_id names the artifact for artifact_store
+    result = dict(storyboard, message=f"Storyboard of {len(storyboard['times'])} frames created",
+                  storyboard_folder=os.path.basename(storyboard_folder), duration=duration,
+                  file_id=os.path.basename(storyboard_folder),
+                  proxy=os.path.basename(proxy_path) if STORYBOARD_KEEP_PROXY else None)
+    folder_size = disk_usage(storyboard_folder)
+    artifact_registry.register(result['storyboard_folder'], 'storyboard', folder_size)
+    result_cache.put(cache_key, result['storyboard_folder'], result, folder_size)
+    return result
+
+@app.route("/api/youtube/storyboard/<path:folder>/<path:filename>")
+def get_storyboard_file(folder, filename):
+    """Serve a storyboard sprite sheet or proxy video (?inline=1 to display it)"""
+    try:
+        from urllib.parse import unquote
+        decoded_folder = unquote(folder)
+        decoded_filename = unquote(filename)
+        file_path = _resolve_temp_path(decoded_folder, decoded_filename)
+
+        if file_path.is_file():
+            artifact_registry.touch(decoded_folder)
+            return _send_artifact(decoded_folder, file_path)
+        else:
+            return jsonify({'error': f'File not found: {decoded_filename}'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route("/api/audio/extract", methods=["POST"])
 def extract_audio():
-    """Extract audio from uploaded video file"""
+    """Queue audio extraction from an uploaded video file"""
     try:
         if 'video_file' not in request.files:
             return jsonify({'error': 'No video file provided'}), 400
@@ -236,52 +621,98 @@ def extract_audio():
         if video_file.filename == '':
             return jsonify({'error': 'No video file selected'}), 400
         
-        # Save uploaded file temporarily
-        suffix = Path(video_file.filename).suffix or '.mp4'
-        temp_fd, temp_video_path = tempfile.mkstemp(prefix='upload_', suffix=suffix, dir=TEMP_ROOT)
-        os.close(temp_fd)
-        video_file.save(temp_video_path)
+        # Get output parameters
+        from extractAduio import ENCODERS
+        audio_format = request.form.get('audio_format', 'mp3')
+        bitrate = request.form.get('bitrate', '192k')
+        if audio_format != 'auto' and audio_format not in ENCODERS:
+            return jsonify({'error': f'Unsupported audio format: {audio_format}'}), 400
         
-        # Import the audio extractor
-        from extractAduio import VideoAudioExtractor
+        # Keep the uploaded file (already streamed into the temp storage)
+        temp_video_path, digest = _save_upload(video_file)
         
-        # Extract audio
-        extractor = VideoAudioExtractor(temp_video_path)
-        base_name = os.path.splitext(video_file.filename)[0]
-        download_name = base_name + ".mp3"
-        file_id = f"audio_{uuid.uuid4().hex}.mp3"
-        audio_path = os.path.join(TEMP_ROOT, file_id)
-
-        extracted_path = extractor.extract_audio(audio_path)
+        # Answer repeated uploads from the result cache
+        cache_key = make_key(digest, 'audio', audio_format=audio_format, bitrate=bitrate)
+        cached = result_cache.get(cache_key, exists=_artifact_exists)
+        if cached is not None:
+            os.remove(temp_video_path)
+            cached['download_name'] = os.path.splitext(video_file.filename)[0] + os.path.splitext(cached['file_id'])[1]
+            job = job_queue.complete('audio', cached)
+            return jsonify({'job_id': job.id, 'status': job.status})
         
-        # Get audio file info
-        audio_size = os.path.getsize(extracted_path)
+        job = job_queue.submit('audio', _run_audio_extraction, temp_video_path, video_file.filename,
+                               audio_format, bitrate, cache_key)
+        return jsonify({'job_id': job.id, 'status': job.status}), 202
         
-        # Clean up temp video file after extraction
+    except QueueFullError as e:
         try:
             os.remove(temp_video_path)
         except Exception:
             pass
-
-        return jsonify({
-            'message': 'Audio extracted successfully',
-            'file_id': file_id,
-            'download_name': download_name,
-            'size': audio_size
-
-        })
-        
+        return jsonify({'error': str(e)}), 503
+    except UploadRejected as e:
+        return jsonify({'error': str(e)}), 415
+    except RequestEntityTooLarge:
+        limit_mb = app.config['MAX_CONTENT_LENGTH'] // 1024 ** 2
+        return jsonify({'error': f'Upload exceeds the {limit_mb} MB limit'}), 413
     except Exception as e:
         # Clean up temp file on error
         try:
             if 'temp_video_path' in locals() and os.path.exists(temp_video_path):
                 os.remove(temp_video_path)
-            if 'audio_path' in locals() and os.path.exists(audio_path):
-                os.remove(audio_path)
         except Exception:
             pass
         return jsonify({'error': str(e)}), 500
 
+
+def _run_audio_extraction(job, temp_video_path, original_filename, audio_format, bitrate, cache_key):
+    """Job body: extract the audio track of an uploaded video"""
+    try:
+        # Import the audio extractor
+        from extractAduio import VideoAudioExtractor
+        
+        # Extract audio (the extension may change when the stream is copied)
+        extractor = VideoAudioExtractor(temp_video_path)
+        audio_path = os.path.join(TEMP_ROOT, f"audio_{uuid.uuid4().hex}.{'mka' if audio_format == 'auto' else audio_format}")
+
+        def progress_callback(done, total):
+            if total:
+                job.set_progress(done * 100.0 / total, seconds_done=round(done, 1), seconds_total=round(total, 1))
+            else:
+                job.set_progress(0, seconds_done=round(done, 1))
+        
+        try:
+            extracted_path = extractor.extract_audio(audio_path, audio_format=audio_format, bitrate=bitrate,
+                                                     threads=AUDIO_FFMPEG_THREADS,
+                                                     progress_callback=progress_callback)
+        except Exception:
+            if os.path.exists(audio_path):
+                os.remove(audio_path)
+            raise
+        
+        file_id = os.path.basename(extracted_path)
+        base_name = os.path.splitext(original_filename)[0]
+        download_name = base_name + os.path.splitext(extracted_path)[1]
+        
+        # Get audio file info
+        audio_size = os.path.getsize(extracted_path)
+    finally:
+        # Clean up temp video file after extraction
+        try:
+            os.remove(temp_video_path)
+        except Exception:
+            pass
+
+    result = {
+        'message': 'Audio extracted successfully',
+        'file_id': file_id,
+        'download_name': download_name,
+        'size': audio_size
+    }
+    artifact_registry.register(file_id, 'audio', audio_size)
+    result_cache.put(cache_key, file_id, result, audio_size)
+    return result
+
 @app.route("/api/audio/get-file/<path:filename>")
 def get_audio_file(filename):
     """Serve the extracted audio file"""
@@ -290,12 +721,9 @@ def get_audio_file(filename):
         decoded_filename = unquote(filename)
         file_path = _resolve_temp_path(decoded_filename)
         
-        if file_path.exists():
-            return send_file(
-                file_path,
-                as_attachment=True,
-                download_name=decoded_filename
-            )
+        if file_path.is_file():
+            artifact_registry.touch(decoded_filename)
+            return _send_artifact(decoded_filename, file_path)
         else:
             return jsonify({'error': f'File not found: {decoded_filename}'}), 404
     except Exception as e:
@@ -309,16 +737,15 @@ def delete_audio_file(filename):
         decoded_filename = unquote(filename)
         file_path = _resolve_temp_path(decoded_filename)
         
+        if result_cache.owns(decoded_filename):
+            return jsonify({'message': f'File kept in result cache: {decoded_filename}'})
+        
         if file_path.exists():
-            for attempt in range(5):
-                try:
-                    file_path.unlink()
-                    print(f"Deleted audio file: {decoded_filename}")
-                    return jsonify({'message': f'File deleted: {decoded_filename}'})
-                except PermissionError:
-                    time.sleep(0.5)
-            
-            return jsonify({'error': 'File is still in use, please try again'}), 500
+            # Removed once the client's download (and any resume of it) has finished
+            transfers.hold(decoded_filename)
+            artifact_registry.remove(decoded_filename)
+            print(f"Scheduled deletion of audio file: {decoded_filename}")
+            return jsonify({'message': f'File will be deleted once its transfers finish: {decoded_filename}'})
         else:
             return jsonify({'message': 'File already deleted or not found'})
     except Exception as e:
@@ -326,7 +753,7 @@ def delete_audio_file(filename):
 
 @app.route("/api/frames/extract", methods=["POST"])
 def extract_frames():
-    """Extract frames from uploaded video file"""
+    """Queue frame extraction from an uploaded video file"""
     try:
         if 'video_file' not in request.files:
             return jsonify({'error': 'No video file provided'}), 400
@@ -344,80 +771,219 @@ def extract_frames():
         except ValueError:
             return jsonify({'error': 'Invalid parameter value'}), 400
         
-        # Save uploaded file temporarily
-        suffix = Path(video_file.filename).suffix or '.mp4'
-        temp_fd, temp_video_path = tempfile.mkstemp(prefix='upload_', suffix=suffix, dir=TEMP_ROOT)
-        os.close(temp_fd)
-        video_file.save(temp_video_path)
+        # Scene mode: param_value caps the frame count, threshold sets the sensitivity
+        threshold = None
+        if extraction_mode == 'scene':
+            from get_frames import SCENE_THRESHOLD
+            try:
+                threshold = float(request.form.get('threshold', SCENE_THRESHOLD))
+            except ValueError:
+                return jsonify({'error': 'Invalid threshold'}), 400
+            if not 0 <= threshold <= 1:
+                return jsonify({'error': 'Threshold must be between 0 and 1'}), 400
+        
+        # Output encoding of the saved frames
+        output_format = request.form.get('output_format', 'jpg').lower()
+        if output_format not in FRAME_FORMATS:
+            return jsonify({'error': f'Unsupported image format: {output_format}'}), 400
+        try:
+            quality = int(request.form['quality']) if request.form.get('quality') else None
+            max_dimension = int(request.form['max_dimension']) if request.form.get('max_dimension') else None
+        except ValueError:
+            return jsonify({'error': 'Invalid quality or maximum dimension'}), 400
+        if quality is not None and not 1 <= quality <= 100:
+            return jsonify({'error': 'Quality must be between 1 and 100'}), 400
+        if max_dimension is not None and max_dimension <= 0:
+            return jsonify({'error': 'Maximum dimension must be positive'}), 400
+        encoding = {
+            'extension': '.' + output_format,
+            'quality': quality,
+            'max_dimension': max_dimension,
+            'grayscale': _parse_flag(request.form.get('grayscale')),
+        }
+        
+        # Keep the uploaded video (a temp file, or bytes decoded straight from memory)
+        temp_video_path, digest = _save_upload(video_file, allow_memory=True)
         
+        # Answer repeated uploads from the result cache
+        cache_key = make_key(digest, 'frames', extraction_mode=extraction_mode,
+                             param_value=None if extraction_mode == 'all_frames' else param_value,
+                             threshold=threshold, **encoding)
+        cached = result_cache.get(cache_key, exists=_artifact_exists)
+        if cached is not None:
+            if isinstance(temp_video_path, str):
+                os.remove(temp_video_path)
+            job = job_queue.complete('frames', cached)
+            return jsonify({'job_id': job.id, 'status': job.status})
+        
+        job = job_queue.submit('frames', _run_frame_extraction, temp_video_path, video_file.filename,
+                               extraction_mode, param_value, cache_key, threshold, encoding)
+        return jsonify({'job_id': job.id, 'status': job.status}), 202
+        
+    except QueueFullError as e:
+        try:
+            if isinstance(temp_video_path, str):
+                os.remove(temp_video_path)
+        except Exception:
+            pass
+        return jsonify({'error': str(e)}), 503
+    except UploadRejected as e:
+        return jsonify({'error': str(e)}), 415
+    except RequestEntityTooLarge:
+        limit_mb = app.config['MAX_CONTENT_LENGTH'] // 1024 ** 2
+        return jsonify({'error': f'Upload exceeds the {limit_mb} MB limit'}), 413
+    except Exception as e:
+        # Clean up on error
+        try:
+            if 'temp_video_path' in locals() and isinstance(temp_video_path, str) and os.path.exists(temp_video_path):
+                os.remove(temp_video_path)
+        except:
+            pass
+        return jsonify({'error': str(e)}), 500
+
+
+def _run_frame_extraction(job, temp_video_path, original_filename, extraction_mode, param_value, cache_key,
+                          threshold=None, encoding=None):
+    """Job body: extract frames of an uploaded video (temp file path or bytes) into a TEMP_ROOT folder"""
+    frames_folder = None
+    try:
         # Create frames output folder
-        base_name = os.path.splitext(video_file.filename)[0]
+        base_name = os.path.splitext(original_filename)[0]
         safe_base = "".join(c for c in base_name if c.isalnum() or c in (' ', '-', '_')).strip() or "frames"
         frames_folder = tempfile.mkdtemp(prefix=f'frames_{safe_base}_', dir=TEMP_ROOT)
         
         # Import the frame extractor
-        from get_frames import FrameExtractor, get_total_frames
+        from get_frames import FrameExtractor
+        
+        def progress_callback(done, total):
+            job.set_progress(done * 100.0 / total if total else 0, frames_done=done, frames_total=total)
         
         # Extract frames based on mode
-        extractor = FrameExtractor(temp_video_path, frames_folder)
+        # Thumbnails for the preview grid are written in the same pass
+        encoding = encoding or {}
+        extractor = FrameExtractor(temp_video_path, frames_folder, progress_callback=progress_callback,
+                                   workers=FRAME_WRITER_THREADS, thumbnail_size=PREVIEW_THUMBNAIL_SIZE,
+                                   backend=FRAME_DECODE_BACKEND, decode_threads=FRAME_DECODE_THREADS,
+                                   **encoding)
         
         if extraction_mode == 'n_frames':
             frames_saved = extractor.extract_n_frames(param_value)
         elif extraction_mode == 'every_nth':
-            frames_saved = extractor.extract_every_nth(param_value)
+            frames_saved = extractor.extract_every_nth(param_value, segments=FRAME_DECODE_PROCESSES)
+        elif extraction_mode == 'scene':
+            frames_saved = extractor.extract_scene_changes(threshold, max_frames=param_value)
         else:  # all_frames
-            frames_saved = extractor.extract_frames()
+            frames_saved = extractor.extract_frames(segments=FRAME_DECODE_PROCESSES)
         
         # Get list of extracted frame files
-        frame_files = sorted([f for f in os.listdir(frames_folder) if f.endswith('.jpg')])
-        
+        extension = extractor.extension
+        frame_files = sorted([f for f in os.listdir(frames_folder) if f.endswith(extension)])
+    except Exception:
+        if frames_folder and os.path.exists(frames_folder):
+            shutil.rmtree(frames_folder, ignore_errors=True)
+        raise
+    finally:
         # Clean up temp video file
         try:
-            os.remove(temp_video_path)
-        except:
-            pass
-        
-        return jsonify({
-            'message': f'Extracted {frames_saved} frames successfully',
-            'frames_saved': frames_saved,
-            'frames_folder': os.path.basename(frames_folder),
-            'frame_files': frame_files[:100]  # Limit to first 100 for display
-        })
-        
-    except Exception as e:
-        # Clean up on error
-        try:
-            if 'temp_video_path' in locals() and os.path.exists(temp_video_path):
+            if isinstance(temp_video_path, str):
                 os.remove(temp_video_path)
-            if 'frames_folder' in locals() and os.path.exists(frames_folder):
-                shutil.rmtree(frames_folder, ignore_errors=True)
         except:
             pass
-        return jsonify({'error': str(e)}), 500
+    
+    result = {
+        'message': f'Extracted {frames_saved} frames successfully',
+        'frames_saved': frames_saved,
+        'frames_folder': os.path.basename(frames_folder),
+        'frame_files': frame_files[:100],  # Limit to first 100 for display
+        'thumbnails': True
+    }
+    folder_size = disk_usage(frames_folder)
+    artifact_registry.register(result['frames_folder'], 'frames', folder_size)
+    result_cache.put(cache_key, result['frames_folder'], result, folder_size)
+    return result
 
 @app.route("/api/frames/get-frame/<path:folder>/<path:filename>")
 def get_frame_file(folder, filename):
-    """Serve an extracted frame image"""
+    """Serve an extracted frame image (?size=thumb serves its preview thumbnail)"""
     try:
         from urllib.parse import unquote
+        from get_frames import FrameEncoding
         decoded_folder = unquote(folder)
         decoded_filename = unquote(filename)
         file_path = _resolve_temp_path(decoded_folder, decoded_filename)
         
-        if file_path.exists():
-            return send_file(file_path, mimetype='image/jpeg')
+        if request.args.get('size') == 'thumb':
+            thumb_path = Path(FrameEncoding.thumbnail_path(str(file_path)))
+            if thumb_path.exists():
+                file_path = thumb_path
+        
+        if file_path.is_file():
+            artifact_registry.touch(decoded_folder)
+            return send_file(file_path)
         else:
             return jsonify({'error': f'Frame not found: {decoded_filename}'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+class _ZipStreamBuffer:
+    """Unseekable sink for zipfile; the bytes written are drained by a generator"""
+    
+    def __init__(self):
+        self._chunks = []
+    
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _iter_zip_stream(files, on_close=None):
+    """
+    Yield a ZIP archive of the given files piece by piece.
+    
+    Entries are STORED (JPEGs do not compress further) and read in
+    ZIP_STREAM_CHUNK_SIZE blocks, so memory stays constant regardless of the
+    number of files. Zip64 records are written when sizes require them.
+    """
+    import zipfile
+    
+    sink = _ZipStreamBuffer()
+    try:
+        with zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED, allowZip64=True) as zf:
+            for path in files:
+                zinfo = zipfile.ZipInfo.from_file(path, path.name)
+                zinfo.compress_type = zipfile.ZIP_STORED
+                with open(path, 'rb') as src, zf.open(zinfo, 'w') as dst:
+                    while True:
+                        block = src.read(ZIP_STREAM_CHUNK_SIZE)
+                        if not block:
+                            break
+                        dst.write(block)
+                        data = sink.drain()
+                        if data:
+                            yield data
+                data = sink.drain()
+                if data:
+                    yield data
+        # Central directory
+        yield sink.drain()
+    finally:
+        if on_close is not None:
+            on_close()
+
+
 @app.route("/api/frames/download-all/<path:folder>", methods=["GET"])
 def download_all_frames(folder):
-    """Create and serve a zip file of all extracted frames"""
+    """Stream a zip file of all extracted frames"""
     try:
         from urllib.parse import unquote
-        import zipfile
-        import io
         
         decoded_folder = unquote(folder)
         frames_path = _resolve_temp_path(decoded_folder)
@@ -425,28 +991,22 @@ def download_all_frames(folder):
         if not frames_path.exists():
             return jsonify({'error': 'Frames folder not found'}), 404
         
-        # Create zip file in memory
-        memory_file = io.BytesIO()
-        with zipfile.ZipFile(memory_file, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for frame_file in frames_path.glob('*.jpg'):
-                zf.write(frame_file, frame_file.name)
+        # Full-size frames only (the thumbnails live in a subfolder)
+        frame_files = sorted(p for p in frames_path.iterdir() if p.is_file())
         
-        memory_file.seek(0)
+        def cleanup():
+            # A zip cannot be resumed, so nothing needs to linger after it
+            transfers.closed(decoded_folder, linger=0)
+            # Cleanup frames folder once the zip has been sent (unless it is cached)
+            if not result_cache.owns(decoded_folder):
+                artifact_registry.remove(decoded_folder)
         
-        response = send_file(
-            memory_file,
+        transfers.opened(decoded_folder)
+        return Response(
+            _iter_zip_stream(frame_files, on_close=cleanup),
             mimetype='application/zip',
-            as_attachment=True,
-            download_name=f'{decoded_folder}.zip'
+            headers={'Content-Disposition': f'attachment; filename="{decoded_folder}.zip"'}
         )
-
-        # Cleanup frames folder after creating the zip
-        try:
-            shutil.rmtree(frames_path, ignore_errors=True)
-        except Exception:
-            pass
-
-        return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -459,14 +1019,58 @@ def delete_frames_folder(folder):
         decoded_folder = unquote(folder)
         folder_path = _resolve_temp_path(decoded_folder)
         
+        if result_cache.owns(decoded_folder):
+            return jsonify({'message': f'Frames folder kept in result cache: {decoded_folder}'})
+        
         if folder_path.exists() and folder_path.is_dir():
-            shutil.rmtree(folder_path)
-            print(f"Deleted frames folder: {decoded_folder}")
-            return jsonify({'message': f'Frames folder deleted: {decoded_folder}'})
+            # Removed once a zip of it that is still being streamed has finished
+            artifact_registry.remove(decoded_folder)
+            print(f"Scheduled deletion of frames folder: {decoded_folder}")
+            return jsonify({'message': f'Frames folder will be deleted once its transfers finish: {decoded_folder}'})
         else:
             return jsonify({'message': 'Folder already deleted or not found'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def get_job_status(job_id):
+    """Report the status, progress and result of a queued job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': f'Job not found: {job_id}'}), 404
+    return jsonify(job.to_dict())
+
+@app.route("/api/jobs/<job_id>/events", methods=["GET"])
+def stream_job_events(job_id):
+    """Stream a job's status and progress as Server-Sent Events until it ends"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': f'Job not found: {job_id}'}), 404
+    
+    def generate():
+        version = None
+        last_sent = time.monotonic()
+        while True:
+            current = job.wait_for_change(version, JOB_EVENT_WAIT_SECONDS) if version is not None else job.version
+            if current != version:
+                version = current
+                data = job.to_dict()
+                # Terminal events are named after the status; everything else is "progress"
+                event = data['status'] if data['status'] in (FINISHED, FAILED) else 'progress'
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+                if event != 'progress':
+                    return
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent >= JOB_EVENT_HEARTBEAT_SECONDS:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+
 if __name__ == "__main__":
+    # Development server; see wsgi.py and gunicorn.conf.py for production
     app.run(debug=True)
@@ -0,0 +1,171 @@
+"""
+Index of the artifacts in the temp storage, with exact-time expiry.
+
+Every finished top-level entry of the temp storage (a download, an audio
+file or a frames folder) is registered once with its size, creation time and
+owner. Expiry deadlines are kept in a min-heap, so the sweeper sleeps until
+the next one is due instead of walking the tree, and an expired artifact is
+removed as a whole. A disk quota evicts the oldest artifacts first.
+"""
+
+import heapq
+import os
+import threading
+import time
+
+# Total size of registered artifacts before the oldest ones are evicted
+TEMP_QUOTA_BYTES = int(os.environ.get('VIDEOPY_TEMP_QUOTA_BYTES', str(20 * 1024 ** 3)))
+
+
+def disk_usage(path: str) -> int:
+    """Total size of a file, or of all files below a folder."""
+    try:
+        if not os.path.isdir(path):
+            return os.path.getsize(path)
+        total = 0
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    total += disk_usage(entry.path)
+                else:
+                    total += entry.stat(follow_symlinks=False).st_size
+        return total
+    except OSError:
+        return 0
+
+
+class _Record:
+    __slots__ = ('owner', 'size', 'created', 'expires')
+
+    def __init__(self, owner: str, size: int, created: float, expires: float):
+        self.owner = owner
+        self.size = size
+        self.created = created
+        self.expires = expires
+
+
+class ArtifactRegistry:
+    def __init__(self, remove_artifact, ttl: float, max_bytes: int = TEMP_QUOTA_BYTES):
+        """
+        Initializes the registry. Call start() to run the sweeper thread.
+
+        :param remove_artifact: Callable deleting an artifact (file or folder) by name.
+        :param ttl: Seconds an artifact is kept after its last access.
+        :param max_bytes: Disk quota of all registered artifacts together.
+        """
+        self._remove_artifact = remove_artifact
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._records = {}  # name -> _Record, oldest first
+        self._deadlines = []  # heap of (expires, name); stale entries are skipped or re-queued
+        self._total = 0
+        self._listeners = []
+        self._changed = threading.Condition()
+        self._thread = None
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def on_remove(self, callback) -> None:
+        """Registers ``callback(name)``, called after the registry removed an artifact."""
+        self._listeners.append(callback)
+
+    def register(self, name: str, owner: str, size: int, created: float = None) -> None:
+        """
+        Starts tracking an artifact; it expires ttl seconds after its last access.
+
+        :param name: Top-level name in the temp storage.
+        :param owner: Short label of what produced it (e.g. "audio").
+        :param size: Size in bytes (see disk_usage).
+        :param created: Creation time (defaults to now); older artifacts are evicted first.
+        """
+        created = time.time() if created is None else created
+        with self._changed:
+            previous = self._records.pop(name, None)
+            if previous is not None:
+                self._total -= previous.size
+            record = self._records[name] = _Record(owner, size, created, created + self.ttl)
+            self._total += size
+            heapq.heappush(self._deadlines, (record.expires, name))
+            self._changed.notify()  # the sweeper may need to wake earlier
+            evicted = self._over_quota(keep=name)
+        self._discard(evicted)
+
+    def touch(self, name: str) -> None:
+        """Postpones the expiry of an artifact to ttl seconds from now."""
+        with self._changed:
+            record = self._records.get(name)
+            if record is not None:
+                # Only ever later, so the heap entry is re-queued lazily when it comes due
+                record.expires = time.time() + self.ttl
+
+    def owner(self, name: str):
+        with self._changed:
+            record = self._records.get(name)
+            return record.owner if record is not None else None
+
+    def forget(self, name: str) -> None:
+        """Stops tracking an artifact that was deleted by other means."""
+        with self._changed:
+            record = self._records.pop(name, None)
+            if record is not None:
+                self._total -= record.size
+
+    def remove(self, name: str) -> None:
+        """Deletes an artifact now (whether registered or not)."""
+        self.forget(name)
+        self._discard([name])
+
+    def _over_quota(self, keep: str) -> list:
+        evicted = []
+        for name in list(self._records):
+            if self._total <= self.max_bytes:
+                break
+            if name != keep:
+                self._total -= self._records.pop(name).size
+                evicted.append(name)
+        return evicted
+
+    def _discard(self, names) -> None:
+        for name in names:
+            self._remove_artifact(name)
+            for callback in self._listeners:
+                callback(name)
+
+    def sweep(self) -> list:
+        """
+        Removes the artifacts whose expiry has passed.
+
+        :return: Names of the removed artifacts.
+        """
+        now = time.time()
+        expired = []
+        with self._changed:
+            while self._deadlines and self._deadlines[0][0] <= now:
+                _, name = heapq.heappop(self._deadlines)
+                record = self._records.get(name)
+                if record is None:
+                    continue  # forgotten or removed meanwhile
+                if record.expires > now:
+                    heapq.heappush(self._deadlines, (record.expires, name))  # touched
+                    continue
+                del self._records[name]
+                self._total -= record.size
+                expired.append(name)
+        self._discard(expired)
+        return expired
+
+    def _run(self) -> None:
+        while True:
+            self.sweep()
+            with self._changed:
+                # Sleep until the earliest deadline; register() wakes us for earlier ones
+                timeout = max(0.0, self._deadlines[0][0] - time.time()) if self._deadlines else None
+                self._changed.wait(timeout)
+
+    def start(self) -> None:
+        """Starts the sweeper thread (once)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='artifact-sweeper', daemon=True)
+            self._thread.start()
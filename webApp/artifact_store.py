@@ -0,0 +1,155 @@
+"""
+Shared store of downloaded artifacts with single-flight semantics.
+
+Identical requests (same key) share one download: the first requester
+produces the artifact while later ones wait for it. Finished artifacts are
+reference-counted so one client's delete does not remove a file another
+client is still fetching. Idle expiry is left to the artifact registry,
+which is told about every access.
+"""
+
+import threading
+
+
+class _Entry:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.artifact = None
+        self.refs = 0
+        self.progress = 0.0
+
+
+class ArtifactStore:
+    def __init__(self, remove_artifact, exists=None, touch_artifact=None):
+        """
+        Initializes the artifact store.
+
+        :param remove_artifact: Callable deleting an artifact by name once unreferenced.
+        :param exists: Optional callable checking that an artifact is still on disk.
+        :param touch_artifact: Optional callable told the name of every artifact accessed.
+        """
+        self._remove_artifact = remove_artifact
+        self._exists = exists
+        self._touch_artifact = touch_artifact
+        self._entries = {}  # key -> _Entry
+        self._by_artifact = {}  # artifact -> key
+        self._lock = threading.Lock()
+
+    def acquire(self, key, produce, on_progress=None) -> dict:
+        """
+        Returns the result for key, producing it at most once across concurrent callers.
+
+        :param key: Hashable identity of the artifact (e.g. video id, format, range).
+        :param produce: Callable ``produce(entry_progress)`` returning a result dict with
+                        the artifact name under ``'file_id'``; ``entry_progress(percent)``
+                        shares the producer's progress with waiting callers.
+        :param on_progress: Optional callable receiving the producer's progress while waiting.
+        :return: Copy of the result dict; the caller holds one reference until release().
+        :raises: Whatever produce() raised, for the producer and every waiter.
+        """
+        while True:
+            with self._lock:
+                result = self._claim(key)
+                if result is not None:
+                    break
+                entry = self._entries.get(key)
+                leader = entry is None
+                if leader:
+                    entry = self._entries[key] = _Entry()
+
+            if leader:
+                return self._produce(key, entry, produce)
+
+            # Someone else is producing this artifact; wait and share it
+            while not entry.event.wait(0.5):
+                if on_progress is not None:
+                    on_progress(entry.progress)
+            if entry.error is not None:
+                raise entry.error
+
+        if self._touch_artifact is not None:
+            self._touch_artifact(result['file_id'])
+        return result
+
+    def _claim(self, key):
+        """Takes a reference to the finished artifact of key; returns a copy of its result, or None."""
+        entry = self._entries.get(key)
+        if entry is None or not entry.event.is_set() or entry.error is not None:
+            return None
+        if self._exists is None or self._exists(entry.artifact):
+            entry.refs += 1
+            return dict(entry.result)
+        self._forget(key)
+        return None
+
+    def _finish(self, key, entry, result: dict) -> None:
+        """Records a produced artifact, referenced once by its producer."""
+        entry.result = dict(result)
+        entry.artifact = result['file_id']
+        entry.refs = 1
+        self._by_artifact[entry.artifact] = key
+
+    def _produce(self, key, entry, produce) -> dict:
+        def set_progress(percent):
+            entry.progress = percent
+
+        try:
+            result = produce(set_progress)
+        except Exception as e:
+            entry.error = e
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            raise
+        else:
+            with self._lock:
+                self._finish(key, entry, result)
+            return dict(result)
+        finally:
+            entry.event.set()
+
+    def owns(self, artifact: str) -> bool:
+        """Whether the artifact is managed by the store."""
+        with self._lock:
+            return artifact in self._by_artifact
+
+    def touch(self, artifact: str) -> None:
+        """Marks an artifact as recently accessed (e.g. when it is being fetched)."""
+        if self._touch_artifact is not None and self.owns(artifact):
+            self._touch_artifact(artifact)
+
+    def release(self, artifact: str) -> bool:
+        """
+        Drops one reference to an artifact and deletes it when none remain.
+
+        :return: True if the artifact was deleted.
+        """
+        with self._lock:
+            key = self._by_artifact.get(artifact)
+            if key is None:
+                return False
+            entry = self._entries[key]
+            entry.refs -= 1
+            if entry.refs > 0:
+                return False
+            self._forget(key)
+        self._remove_artifact(artifact)
+        return True
+
+    def discard(self, artifact: str) -> None:
+        """
+        Forgets an artifact that was deleted elsewhere (e.g. expired), even if
+        references remain (guards against clients that never release).
+        """
+        with self._lock:
+            key = self._by_artifact.get(artifact)
+            if key is not None:
+                self._forget(key)
+
+    def _forget(self, key):
+        entry = self._entries.pop(key)
+        if entry.artifact is not None:
+            self._by_artifact.pop(entry.artifact, None)
+        return entry.artifact
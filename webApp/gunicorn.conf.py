@@ -0,0 +1,31 @@
+"""
+Gunicorn settings for serving the web app in production.
+
+    cd webApp && gunicorn -c gunicorn.conf.py wsgi:app
+
+Overridable through the environment: VIDEOPY_BIND, VIDEOPY_WEB_WORKERS and
+VIDEOPY_WEB_THREADS (command-line flags such as --workers take precedence).
+"""
+
+import os
+
+chdir = os.path.dirname(os.path.abspath(__file__))
+bind = os.environ.get('VIDEOPY_BIND', '0.0.0.0:8000')
+
+# Processes serving requests; media work runs on each worker's job threads
+workers = int(os.environ.get('VIDEOPY_WEB_WORKERS', str(min(2 * (os.cpu_count() or 1) + 1, 8))))
+
+# Threaded workers, so long uploads and event streams do not block other requests
+worker_class = 'gthread'
+threads = int(os.environ.get('VIDEOPY_WEB_THREADS', '8'))
+
+# Large uploads and zip downloads can keep a request busy for a while
+timeout = 300
+graceful_timeout = 30
+keepalive = 5
+
+# Each worker imports the app after forking, so job threads and database
+# connections are never shared across processes
+preload_app = False
+
+accesslog = '-'
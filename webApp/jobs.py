@@ -0,0 +1,226 @@
+"""
+Bounded background job queue for the long-running media endpoints.
+
+Download, transcode and decode work is handed to a fixed pool of worker
+threads so the request thread can answer immediately with a job id. Clients
+then poll the job for its status and progress, or wait for changes to stream
+them as events. With a job store (see shared_state.py) every change is also
+published for the other worker processes of a production server.
+"""
+
+import os
+import queue
+import threading
+import time
+import uuid
+
+# Pool size and queue depth (override via environment to cap per-host work)
+JOB_WORKERS = int(os.environ.get('VIDEOPY_JOB_WORKERS', '2'))
+JOB_QUEUE_DEPTH = int(os.environ.get('VIDEOPY_JOB_QUEUE_DEPTH', '16'))
+
+# Minimum seconds between wake-ups of clients waiting on a job's progress
+PROGRESS_EMIT_INTERVAL = 0.25
+
+QUEUED = 'queued'
+RUNNING = 'running'
+FINISHED = 'finished'
+FAILED = 'failed'
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class Job:
+    def __init__(self, kind: str, store=None):
+        """
+        A single unit of background work and its observable state.
+
+        :param kind: Short label describing the work (e.g. "frames").
+        :param store: Optional JobStore receiving a snapshot whenever waiting clients are woken.
+        """
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.progress = 0.0
+        self.detail = {}
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.updated = self.created
+        self.version = 0
+        self._changed = threading.Condition()
+        self._last_notify = 0.0
+        self._store = store
+
+    def set_progress(self, percent: float, **detail) -> None:
+        """
+        Records the completion percentage of a running job.
+
+        Cheap enough to call from hot loops: waiting clients are woken at most
+        every PROGRESS_EMIT_INTERVAL seconds and pick up the latest values.
+
+        :param percent: Value between 0 and 100 (clamped).
+        :param detail: Optional extra fields reported with the progress (e.g. speed, eta).
+        """
+        self.progress = max(0.0, min(100.0, float(percent)))
+        if detail:
+            self.detail = detail
+        self.updated = time.time()
+        self.version += 1
+        if self.updated - self._last_notify >= PROGRESS_EMIT_INTERVAL:
+            self.notify()
+
+    def set_status(self, status: str) -> None:
+        """Records a status change and wakes waiting clients immediately."""
+        self.status = status
+        self.updated = time.time()
+        self.version += 1
+        self.notify()
+
+    def notify(self) -> None:
+        self._last_notify = time.time()
+        if self._store is not None:
+            self._store.save(self)
+        with self._changed:
+            self._changed.notify_all()
+
+    def wait_for_change(self, version: int, timeout: float) -> int:
+        """
+        Blocks until the job changes from the given version or the timeout expires.
+
+        :return: The current version.
+        """
+        with self._changed:
+            if self.version == version:
+                self._changed.wait(timeout)
+        return self.version
+
+    def to_dict(self) -> dict:
+        data = {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'progress': round(self.progress, 1),
+        }
+        if self.detail and self.status == RUNNING:
+            data['detail'] = self.detail
+        if self.status == FINISHED:
+            data['result'] = self.result
+        elif self.status == FAILED:
+            data['error'] = self.error
+        return data
+
+
+class JobQueue:
+    def __init__(self, workers: int = JOB_WORKERS, queue_depth: int = JOB_QUEUE_DEPTH, store=None):
+        """
+        Initializes the job queue. Worker threads are started on first submit.
+
+        :param workers: Number of jobs allowed to run concurrently.
+        :param queue_depth: Maximum number of jobs waiting to run.
+        :param store: Optional JobStore shared with other processes; get() then also
+                      finds jobs queued by them.
+        """
+        if workers <= 0:
+            raise ValueError("workers must be a positive integer.")
+        self.workers = workers
+        self._pending = queue.Queue(maxsize=max(queue_depth, 0))
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._threads = []
+        self._store = store
+
+    def _ensure_workers(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f'job-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _worker(self) -> None:
+        while True:
+            job, func, args, kwargs = self._pending.get()
+            job.set_status(RUNNING)
+            try:
+                job.result = func(job, *args, **kwargs)
+                job.progress = 100.0
+                job.set_status(FINISHED)
+            except (Exception, SystemExit) as e:
+                job.error = str(e) or e.__class__.__name__
+                job.set_status(FAILED)
+            finally:
+                self._pending.task_done()
+
+    def submit(self, kind: str, func, *args, **kwargs) -> Job:
+        """
+        Queues ``func(job, *args, **kwargs)`` to run on the worker pool.
+
+        The function's return value becomes the job result.
+
+        :param kind: Short label describing the work.
+        :param func: Callable receiving the Job as its first argument.
+        :return: The queued Job.
+        :raises: QueueFullError if the queue is at capacity.
+        """
+        self._ensure_workers()
+        job = Job(kind, self._store)
+        with self._lock:
+            self._jobs[job.id] = job
+        try:
+            self._pending.put_nowait((job, func, args, kwargs))
+        except queue.Full:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            raise QueueFullError("Server is busy, please try again shortly")
+        if self._store is not None:
+            self._store.save(job)
+        return job
+
+    def complete(self, kind: str, result) -> Job:
+        """
+        Records a job that is already finished (e.g. answered from a cache).
+
+        :param kind: Short label describing the work.
+        :param result: The job result.
+        :return: The finished Job.
+        """
+        job = Job(kind, self._store)
+        job.result = result
+        job.progress = 100.0
+        job.status = FINISHED
+        with self._lock:
+            self._jobs[job.id] = job
+        if self._store is not None:
+            self._store.save(job)
+        return job
+
+    def get(self, job_id: str):
+        """
+        Looks up a job by id.
+
+        :return: The Job (a read-only SharedJob when another process runs it),
+                 or None if it is unknown or has been pruned.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None and self._store is not None:
+            from shared_state import SharedJob
+            snapshot = self._store.load(job_id)
+            if snapshot is not None:
+                job = SharedJob(self._store, job_id, *snapshot)
+        return job
+
+    def prune(self, max_age: float) -> None:
+        """
+        Forgets finished or failed jobs that have not changed for max_age seconds.
+        """
+        cutoff = time.time() - max_age
+        with self._lock:
+            for job_id, job in list(self._jobs.items()):
+                if job.status in (FINISHED, FAILED) and job.updated < cutoff:
+                    del self._jobs[job_id]
+        if self._store is not None:
+            self._store.prune(cutoff, (FINISHED, FAILED))
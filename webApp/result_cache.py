@@ -0,0 +1,102 @@
+"""
+Content-addressed cache of processing results.
+
+Entries are keyed on (upload digest, operation, parameters) and point to an
+artifact in the temp storage (an audio file or a frames folder), so a repeat
+upload of the same video can be answered without reprocessing it. Idle
+expiry is left to the artifact registry, which is told about every hit.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Total size of cached artifacts before least-recently-used entries are evicted
+RESULT_CACHE_MAX_BYTES = int(os.environ.get('VIDEOPY_RESULT_CACHE_BYTES', str(2 * 1024 ** 3)))
+
+
+def make_key(digest: str, operation: str, **params) -> tuple:
+    """
+    Builds a cache key from an upload digest, an operation name and its parameters.
+    """
+    return (digest, operation, tuple(sorted(params.items())))
+
+
+class ResultCache:
+    def __init__(self, remove_artifact, max_bytes: int = RESULT_CACHE_MAX_BYTES, touch_artifact=None):
+        """
+        Initializes the result cache.
+
+        :param remove_artifact: Callable deleting an artifact by name when its entry is evicted.
+        :param max_bytes: Size bound of all cached artifacts together.
+        :param touch_artifact: Optional callable told the name of every artifact served from the cache.
+        """
+        self._remove_artifact = remove_artifact
+        self._touch_artifact = touch_artifact
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (artifact, result, size, last_used)
+        self._owners = {}  # artifact -> key
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, exists=None):
+        """
+        Returns a copy of the cached result for key, or None.
+
+        :param exists: Optional callable checking that the artifact still exists;
+                       entries whose artifact vanished are dropped.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            artifact, result, size, _ = entry
+            if exists is not None and not exists(artifact):
+                self._drop(key)
+                return None
+            self._entries[key] = (artifact, result, size, time.time())
+            self._entries.move_to_end(key)
+        if self._touch_artifact is not None:
+            self._touch_artifact(artifact)
+        return dict(result)
+
+    def put(self, key, artifact: str, result: dict, size: int) -> None:
+        """
+        Stores a result and takes ownership of its artifact.
+
+        An entry already stored under key is replaced and its artifact deleted
+        (unless it is the same artifact).
+        """
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                replaced = self._drop(key)
+                if replaced != artifact:
+                    evicted.append(replaced)
+            self._entries[key] = (artifact, dict(result), size, time.time())
+            self._owners[artifact] = key
+            self._total += size
+            while self._total > self.max_bytes and len(self._entries) > 1:
+                oldest = next(iter(self._entries))
+                evicted.append(self._drop(oldest))
+        for name in evicted:
+            self._remove_artifact(name)
+
+    def owns(self, artifact: str) -> bool:
+        """Whether the artifact is held by the cache (and must not be deleted by others)."""
+        with self._lock:
+            return artifact in self._owners
+
+    def discard(self, artifact: str) -> None:
+        """Drops the entry of an artifact that was deleted elsewhere (e.g. expired)."""
+        with self._lock:
+            key = self._owners.get(artifact)
+            if key is not None:
+                self._drop(key)
+
+    def _drop(self, key) -> str:
+        artifact, _, size, _ = self._entries.pop(key)
+        self._owners.pop(artifact, None)
+        self._total -= size
+        return artifact
@@ -0,0 +1,563 @@
+"""
+State shared by the worker processes of a production deployment.
+
+A WSGI server such as gunicorn runs several copies of the app. A job queued
+on one worker must be visible to all of them, and a delete request or the
+sweeper may land on a different worker than the one that produced a file.
+Job snapshots, the artifact registry, the reference counts of shared
+downloads, the result cache and the transfers in progress are therefore kept
+in a SQLite database in the temp storage, and the sweeper runs in whichever
+process holds an exclusive lock on a file next to it.
+"""
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: no multi-process servers, so every process leads
+    fcntl = None
+
+from artifact_registry import TEMP_QUOTA_BYTES
+from artifact_store import ArtifactStore
+from result_cache import RESULT_CACHE_MAX_BYTES
+from transfers import TRANSFER_LINGER_SECONDS
+
+# Seconds a connection waits for another process's write to finish
+SQLITE_TIMEOUT_SECONDS = 30.0
+
+# How often a client watching another worker's job re-reads it
+SHARED_JOB_POLL_SECONDS = 0.25
+
+# Longest sleep of the shared sweeper (artifacts registered by other processes
+# are only seen after a wake-up; their deadlines are a whole TTL away)
+SHARED_SWEEP_MAX_WAIT_SECONDS = 60.0
+
+# Accesses within this many seconds of the last recorded one are not written again
+TOUCH_WRITE_INTERVAL_SECONDS = 30.0
+
+# Shortest sleep of the shared transfer sweeper while a deferred removal waits
+# for transfers (possibly in other processes) to end
+SHARED_TRANSFER_MIN_WAIT_SECONDS = 5.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    updated REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS artifacts_expires ON artifacts (expires);
+CREATE INDEX IF NOT EXISTS artifacts_created ON artifacts (created);
+CREATE TABLE IF NOT EXISTS downloads (
+    artifact TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    result TEXT NOT NULL,
+    refs INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS downloads_key ON downloads (key);
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    artifact TEXT NOT NULL,
+    result TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_artifact ON results (artifact);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+CREATE TABLE IF NOT EXISTS transfers (
+    name TEXT NOT NULL,
+    pid INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transfers_name ON transfers (name);
+CREATE TABLE IF NOT EXISTS holds (
+    name TEXT PRIMARY KEY,
+    until REAL NOT NULL,
+    pending INTEGER NOT NULL
+);
+"""
+
+
+def _encode_key(key) -> str:
+    # Keys are tuples of plain values (see result_cache.make_key), identical across processes
+    return json.dumps(key)
+
+
+class HostLock:
+    def __init__(self, path: str):
+        """
+        Exclusive advisory lock held by at most one process on the host.
+
+        The lock is released by the operating system when its process exits,
+        so a standby process can take over.
+
+        :param path: Lock file (created if missing).
+        """
+        self.path = path
+        self._file = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def acquire(self) -> bool:
+        """Tries to take the lock without blocking; returns True if it is held."""
+        if self._file is not None:
+            return True
+        if fcntl is None:
+            self._file = True
+            return True
+        lock_file = open(self.path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+
+
+class SharedDatabase:
+    def __init__(self, path: str):
+        """
+        SQLite database opened once per thread, in WAL mode so readers never
+        wait for writers.
+
+        :param path: Database file (created with its tables if missing).
+        """
+        self.path = path
+        self._local = threading.local()
+        with self.connect() as db:
+            db.executescript(_SCHEMA)
+
+    def connect(self) -> sqlite3.Connection:
+        """The calling thread's connection; use it as a context manager to commit."""
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT_SECONDS)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+        return db
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        The calling thread's connection inside a write transaction taken at once,
+        for read-modify-write sequences that must not interleave with other processes.
+        """
+        db = self.connect()
+        with db:
+            db.execute('BEGIN IMMEDIATE')
+            yield db
+
+
+class JobStore:
+    def __init__(self, database: SharedDatabase):
+        """
+        Snapshots of jobs, readable by every worker process.
+
+        :param database: Shared database holding the jobs table.
+        """
+        self._database = database
+
+    def save(self, job) -> None:
+        with self._database.connect() as db:
+            db.execute('INSERT OR REPLACE INTO jobs (id, status, version, updated, data) VALUES (?, ?, ?, ?, ?)',
+                       (job.id, job.status, job.version, job.updated, json.dumps(job.to_dict())))
+
+    def load(self, job_id: str):
+        """
+        :return: (job dict, version), or None if the job is unknown.
+        """
+        row = self._database.connect().execute(
+            'SELECT data, version FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def prune(self, cutoff: float, statuses) -> None:
+        """Deletes jobs in one of the given statuses last updated before cutoff."""
+        marks = ', '.join('?' * len(statuses))
+        with self._database.connect() as db:
+            db.execute(f'DELETE FROM jobs WHERE updated < ? AND status IN ({marks})', (cutoff, *statuses))
+
+
+class SharedJob:
+    def __init__(self, store: JobStore, job_id: str, data: dict, version: int):
+        """
+        Read-only view of a job running in another worker process.
+
+        Offers the parts of the Job interface used to report on a job.
+        """
+        self.id = job_id
+        self._store = store
+        self._data = data
+        self.version = version
+
+    @property
+    def status(self) -> str:
+        return self._data['status']
+
+    def to_dict(self) -> dict:
+        return dict(self._data)
+
+    def wait_for_change(self, version: int, timeout: float) -> int:
+        """Polls the store until the job changes from the given version or the timeout expires."""
+        deadline = time.monotonic() + timeout
+        while True:
+            snapshot = self._store.load(self.id)
+            if snapshot is not None:
+                self._data, self.version = snapshot
+            remaining = deadline - time.monotonic()
+            if self.version != version or remaining <= 0:
+                return self.version
+            time.sleep(min(SHARED_JOB_POLL_SECONDS, remaining))
+
+
+class SharedArtifactRegistry:
+    def __init__(self, database: SharedDatabase, remove_artifact, ttl: float,
+                 max_bytes: int = TEMP_QUOTA_BYTES):
+        """
+        ArtifactRegistry kept in the shared database, so artifacts produced by any
+        worker are expired and counted against the quota by one sweeper per host.
+
+        Same interface as ArtifactRegistry; the on_remove callbacks only run in
+        the process that removed the artifact.
+
+        :param database: Shared database holding the artifacts table.
+        :param remove_artifact: Callable deleting an artifact (file or folder) by name.
+        :param ttl: Seconds an artifact is kept after its last access.
+        :param max_bytes: Disk quota of all registered artifacts together.
+        """
+        self._database = database
+        self._remove_artifact = remove_artifact
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._listeners = []
+        self._touched = {}  # name -> last recorded access, to rate-limit writes
+        self._changed = threading.Condition()
+        self._thread = None
+
+    @property
+    def total_bytes(self) -> int:
+        return self._database.connect().execute('SELECT COALESCE(SUM(size), 0) FROM artifacts').fetchone()[0]
+
+    def on_remove(self, callback) -> None:
+        """Registers ``callback(name)``, called after this process removed an artifact."""
+        self._listeners.append(callback)
+
+    def register(self, name: str, owner: str, size: int, created: float = None) -> None:
+        created = time.time() if created is None else created
+        with self._database.connect() as db:
+            db.execute('INSERT OR REPLACE INTO artifacts (name, owner, size, created, expires) VALUES (?, ?, ?, ?, ?)',
+                       (name, owner, size, created, created + self.ttl))
+            evicted = self._over_quota(db, keep=name)
+        with self._changed:
+            self._changed.notify()  # the sweeper may need to wake earlier
+        self._discard(evicted)
+
+    def _over_quota(self, db, keep: str) -> list:
+        total = db.execute('SELECT COALESCE(SUM(size), 0) FROM artifacts').fetchone()[0]
+        evicted = []
+        if total <= self.max_bytes:
+            return evicted
+        for name, size in db.execute('SELECT name, size FROM artifacts WHERE name != ? ORDER BY created',
+                                     (keep,)).fetchall():
+            if total <= self.max_bytes:
+                break
+            total -= size
+            evicted.append(name)
+        db.executemany('DELETE FROM artifacts WHERE name = ?', [(name,) for name in evicted])
+        return evicted
+
+    def touch(self, name: str) -> None:
+        now = time.time()
+        if now - self._touched.get(name, 0.0) < TOUCH_WRITE_INTERVAL_SECONDS:
+            return
+        self._touched[name] = now
+        with self._database.connect() as db:
+            db.execute('UPDATE artifacts SET expires = ? WHERE name = ?', (now + self.ttl, name))
+
+    def owner(self, name: str):
+        row = self._database.connect().execute('SELECT owner FROM artifacts WHERE name = ?', (name,)).fetchone()
+        return row[0] if row is not None else None
+
+    def forget(self, name: str) -> None:
+        self._touched.pop(name, None)
+        with self._database.connect() as db:
+            db.execute('DELETE FROM artifacts WHERE name = ?', (name,))
+
+    def remove(self, name: str) -> None:
+        self.forget(name)
+        self._discard([name])
+
+    def _discard(self, names) -> None:
+        for name in names:
+            self._touched.pop(name, None)
+            self._remove_artifact(name)
+            for callback in self._listeners:
+                callback(name)
+
+    def sweep(self) -> list:
+        """
+        Removes the artifacts whose expiry has passed.
+
+        :return: Names of the removed artifacts.
+        """
+        now = time.time()
+        with self._database.connect() as db:
+            expired = [row[0] for row in db.execute('SELECT name FROM artifacts WHERE expires <= ?', (now,))]
+            db.executemany('DELETE FROM artifacts WHERE name = ?', [(name,) for name in expired])
+        self._discard(expired)
+        return expired
+
+    def _run(self) -> None:
+        while True:
+            self.sweep()
+            row = self._database.connect().execute('SELECT MIN(expires) FROM artifacts').fetchone()
+            timeout = SHARED_SWEEP_MAX_WAIT_SECONDS
+            if row[0] is not None:
+                timeout = min(timeout, max(0.0, row[0] - time.time()))
+            with self._changed:
+                self._changed.wait(timeout)
+
+    def start(self) -> None:
+        """Starts the sweeper thread (once); run it in one process per host, see HostLock."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='artifact-sweeper', daemon=True)
+            self._thread.start()
+
+
+def _process_alive(pid: int) -> bool:
+    if fcntl is None:
+        return True  # single-process platforms; os.kill would terminate it
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class SharedTransferTracker:
+    def __init__(self, database: SharedDatabase, remove_artifact, linger: float = TRANSFER_LINGER_SECONDS):
+        """
+        TransferTracker kept in the shared database, so an artifact is not removed
+        while any worker process is sending it, whichever process removes it.
+
+        Same interface as TransferTracker. Deferred removals are recorded in the
+        database and finished by the sweeper (see start()), so they survive the
+        process that asked for them. Transfers of processes that died are dropped.
+
+        :param database: Shared database holding the transfers and holds tables.
+        :param remove_artifact: Callable deleting an artifact by name.
+        :param linger: Seconds an artifact stays busy after its last transfer ended.
+        """
+        self._database = database
+        self._remove_artifact = remove_artifact
+        self.linger = linger
+        self._thread = None
+
+    def opened(self, name: str) -> None:
+        with self._database.connect() as db:
+            db.execute('INSERT INTO transfers (name, pid) VALUES (?, ?)', (name, os.getpid()))
+
+    def closed(self, name: str, linger: float = None) -> None:
+        with self._database.transaction() as db:
+            db.execute('DELETE FROM transfers WHERE rowid = '
+                       '(SELECT rowid FROM transfers WHERE name = ? AND pid = ? LIMIT 1)', (name, os.getpid()))
+            self._hold(db, name, self.linger if linger is None else linger)
+
+    def hold(self, name: str, seconds: float = None) -> None:
+        with self._database.connect() as db:
+            self._hold(db, name, self.linger if seconds is None else seconds)
+
+    @staticmethod
+    def _hold(db, name: str, seconds: float) -> None:
+        db.execute('INSERT INTO holds (name, until, pending) VALUES (?, ?, 0) '
+                   'ON CONFLICT (name) DO UPDATE SET until = MAX(until, excluded.until)',
+                   (name, time.time() + seconds))
+
+    def busy(self, name: str) -> bool:
+        return self._busy(self._database.connect(), name)
+
+    @staticmethod
+    def _busy(db, name: str) -> bool:
+        if db.execute('SELECT 1 FROM transfers WHERE name = ? LIMIT 1', (name,)).fetchone() is not None:
+            return True
+        row = db.execute('SELECT until FROM holds WHERE name = ?', (name,)).fetchone()
+        return row is not None and row[0] > time.time()
+
+    def remove(self, name: str) -> bool:
+        with self._database.transaction() as db:
+            if self._busy(db, name):
+                db.execute('INSERT INTO holds (name, until, pending) VALUES (?, 0, 1) '
+                           'ON CONFLICT (name) DO UPDATE SET pending = 1', (name,))
+                return False
+            db.execute('DELETE FROM holds WHERE name = ?', (name,))
+        self._remove_artifact(name)
+        return True
+
+    def sweep(self) -> list:
+        """
+        Finishes the deferred removals of artifacts that are no longer busy.
+
+        :return: Names of the removed artifacts.
+        """
+        now = time.time()
+        with self._database.transaction() as db:
+            pids = [row[0] for row in db.execute('SELECT DISTINCT pid FROM transfers')]
+            db.executemany('DELETE FROM transfers WHERE pid = ?',
+                           [(pid,) for pid in pids if not _process_alive(pid)])
+            idle = 'until <= ? AND name NOT IN (SELECT name FROM transfers)'
+            removed = [row[0] for row in db.execute(f'SELECT name FROM holds WHERE pending = 1 AND {idle}', (now,))]
+            db.execute(f'DELETE FROM holds WHERE {idle}', (now,))
+        for name in removed:
+            self._remove_artifact(name)
+        return removed
+
+    def _run(self) -> None:
+        while True:
+            self.sweep()
+            row = self._database.connect().execute('SELECT MIN(until) FROM holds WHERE pending = 1').fetchone()
+            timeout = SHARED_SWEEP_MAX_WAIT_SECONDS
+            if row[0] is not None:
+                timeout = min(timeout, max(SHARED_TRANSFER_MIN_WAIT_SECONDS, row[0] - time.time()))
+            time.sleep(timeout)
+
+    def start(self) -> None:
+        """Starts the thread finishing deferred removals (once); run it in the sweeping process."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='transfer-sweeper', daemon=True)
+            self._thread.start()
+
+
+class SharedArtifactStore(ArtifactStore):
+    def __init__(self, database: SharedDatabase, remove_artifact, exists=None, touch_artifact=None):
+        """
+        ArtifactStore whose finished artifacts and reference counts live in the
+        shared database, so a download requested on one worker is reused by the
+        others and a release on any worker only deletes it once no requester
+        holds it. Production is still single-flight per process.
+
+        :param database: Shared database holding the downloads table.
+        """
+        super().__init__(remove_artifact, exists=exists, touch_artifact=touch_artifact)
+        self._database = database
+
+    def _claim(self, key):
+        if key in self._entries:
+            return None  # being produced here
+        with self._database.transaction() as db:
+            for artifact, result in db.execute('SELECT artifact, result FROM downloads WHERE key = ?',
+                                               (_encode_key(key),)).fetchall():
+                if self._exists is None or self._exists(artifact):
+                    db.execute('UPDATE downloads SET refs = refs + 1 WHERE artifact = ?', (artifact,))
+                    return json.loads(result)
+                db.execute('DELETE FROM downloads WHERE artifact = ?', (artifact,))
+        return None
+
+    def _finish(self, key, entry, result: dict) -> None:
+        with self._database.connect() as db:
+            db.execute('INSERT OR REPLACE INTO downloads (artifact, key, result, refs) VALUES (?, ?, ?, 1)',
+                       (result['file_id'], _encode_key(key), json.dumps(result)))
+        # Waiting callers take their references from the database
+        del self._entries[key]
+
+    def owns(self, artifact: str) -> bool:
+        row = self._database.connect().execute(
+            'SELECT 1 FROM downloads WHERE artifact = ?', (artifact,)).fetchone()
+        return row is not None
+
+    def release(self, artifact: str) -> bool:
+        with self._database.transaction() as db:
+            row = db.execute('SELECT refs FROM downloads WHERE artifact = ?', (artifact,)).fetchone()
+            if row is None:
+                return False
+            if row[0] > 1:
+                db.execute('UPDATE downloads SET refs = refs - 1 WHERE artifact = ?', (artifact,))
+                return False
+            db.execute('DELETE FROM downloads WHERE artifact = ?', (artifact,))
+        self._remove_artifact(artifact)
+        return True
+
+    def discard(self, artifact: str) -> None:
+        with self._database.connect() as db:
+            db.execute('DELETE FROM downloads WHERE artifact = ?', (artifact,))
+
+
+class SharedResultCache:
+    def __init__(self, database: SharedDatabase, remove_artifact, max_bytes: int = RESULT_CACHE_MAX_BYTES,
+                 touch_artifact=None):
+        """
+        ResultCache kept in the shared database, so a result computed on one worker
+        answers repeats on every worker and no worker deletes an artifact the
+        cache holds. Same interface as ResultCache.
+
+        :param database: Shared database holding the results table.
+        :param remove_artifact: Callable deleting an artifact by name when its entry is evicted.
+        :param max_bytes: Size bound of all cached artifacts together.
+        :param touch_artifact: Optional callable told the name of every artifact served from the cache.
+        """
+        self._database = database
+        self._remove_artifact = remove_artifact
+        self._touch_artifact = touch_artifact
+        self.max_bytes = max_bytes
+
+    def get(self, key, exists=None):
+        with self._database.connect() as db:
+            row = db.execute('SELECT artifact, result FROM results WHERE key = ?', (_encode_key(key),)).fetchone()
+            if row is None:
+                return None
+            artifact, result = row
+            if exists is not None and not exists(artifact):
+                db.execute('DELETE FROM results WHERE key = ?', (_encode_key(key),))
+                return None
+            db.execute('UPDATE results SET last_used = ? WHERE key = ?', (time.time(), _encode_key(key)))
+        if self._touch_artifact is not None:
+            self._touch_artifact(artifact)
+        return json.loads(result)
+
+    def put(self, key, artifact: str, result: dict, size: int) -> None:
+        with self._database.transaction() as db:
+            # A replaced entry's artifact is deleted, as in ResultCache.put
+            row = db.execute('SELECT artifact FROM results WHERE key = ?', (_encode_key(key),)).fetchone()
+            replaced = [row[0]] if row is not None and row[0] != artifact else []
+            evicted = []
+            db.execute('INSERT OR REPLACE INTO results (key, artifact, result, size, last_used) VALUES (?, ?, ?, ?, ?)',
+                       (_encode_key(key), artifact, json.dumps(result), size, time.time()))
+            total = db.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+            if total > self.max_bytes:
+                for old_key, old_artifact, old_size in db.execute(
+                        'SELECT key, artifact, size FROM results WHERE key != ? ORDER BY last_used',
+                        (_encode_key(key),)).fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    total -= old_size
+                    evicted.append((old_key, old_artifact))
+                db.executemany('DELETE FROM results WHERE key = ?', [(old_key,) for old_key, _ in evicted])
+        for name in replaced + [name for _, name in evicted]:
+            self._remove_artifact(name)
+
+    def owns(self, artifact: str) -> bool:
+        row = self._database.connect().execute(
+            'SELECT 1 FROM results WHERE artifact = ?', (artifact,)).fetchone()
+        return row is not None
+
+    def discard(self, artifact: str) -> None:
+        with self._database.connect() as db:
+            db.execute('DELETE FROM results WHERE artifact = ?', (artifact,))
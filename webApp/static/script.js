@@ -84,6 +84,20 @@ function selectTool(tool) {
                         </div>
                     </div>
                     
+                    <div class="input-row">
+                        <div class="input-group">
+                            <label for="audio-format">Output Format</label>
+                            <select id="audio-format" class="mode-select">
+                                <option value="mp3">MP3</option>
+                                <option value="auto">Original (no re-encode, fastest)</option>
+                                <option value="m4a">M4A (AAC)</option>
+                                <option value="opus">Opus</option>
+                                <option value="flac">FLAC</option>
+                                <option value="wav">WAV</option>
+                            </select>
+                        </div>
+                    </div>
+                    
                     <div class="button-group">
                         <button id="extract-audio-btn" class="extract-btn" onclick="extractAudio()">Extract Audio</button>
                         <button id="download-audio-btn" class="download-btn" onclick="downloadAudio()" style="display: none;">Download Audio</button>
@@ -143,6 +157,7 @@ function selectTool(tool) {
                             <select id="extraction-mode" class="mode-select" onchange="updateExtractionParam()">
                                 <option value="n_frames">Extract N Frames (Evenly Spaced)</option>
                                 <option value="every_nth">Extract Every Nth Frame</option>
+                                <option value="scene">Scene Changes (Skip Duplicates)</option>
                                 <option value="all_frames">Extract All Frames</option>
                             </select>
                         </div>
@@ -150,6 +165,33 @@ function selectTool(tool) {
                             <label for="param-value" id="param-label">Number of Frames</label>
                             <input type="number" id="param-value" value="10" min="1" class="param-input">
                         </div>
+                        <div class="input-group" id="threshold-group" style="display: none;">
+                            <label for="scene-threshold">Sensitivity Threshold (0-1)</label>
+                            <input type="number" id="scene-threshold" value="0.3" min="0" max="1" step="0.05" class="param-input">
+                        </div>
+                    </div>
+                    
+                    <div class="input-row">
+                        <div class="input-group">
+                            <label for="frame-format">Image Format</label>
+                            <select id="frame-format" class="mode-select">
+                                <option value="jpg">JPEG</option>
+                                <option value="webp">WebP (smaller)</option>
+                                <option value="png">PNG (lossless)</option>
+                            </select>
+                        </div>
+                        <div class="input-group">
+                            <label for="frame-quality">Quality (1-100)</label>
+                            <input type="number" id="frame-quality" value="90" min="1" max="100" class="param-input">
+                        </div>
+                        <div class="input-group">
+                            <label for="frame-max-dimension">Max Size (px, optional)</label>
+                            <input type="number" id="frame-max-dimension" min="16" placeholder="Original" class="param-input">
+                        </div>
+                        <label class="checkbox-label">
+                            <input type="checkbox" id="frame-grayscale">
+                            Grayscale
+                        </label>
                     </div>
                     
                     <div class="button-group">
@@ -193,6 +235,13 @@ function selectTool(tool) {
                         </div>
                     </div>
                     
+                    <div class="input-row">
+                        <label class="checkbox-label">
+                            <input type="checkbox" id="exact-cut">
+                            Exact cut (slower, re-encodes around start/end)
+                        </label>
+                    </div>
+                    
                     <div class="button-group">
                         <button id="extract-btn" class="extract-btn" onclick="extractVideoInfo()">Extract Video Info</button>
                         <button id="download-btn" class="download-btn" onclick="downloadVideo()">Download Video</button>
@@ -209,6 +258,24 @@ function selectTool(tool) {
                             <div class="play-text">Preview Only<br>(Cannot Play)</div>
                         </div>
                     </div>
+                    
+                    <div id="storyboard" class="storyboard" style="display: none;">
+                        <p id="storyboard-status" class="storyboard-status">Building timeline...</p>
+                        <div id="storyboard-view" style="display: none;">
+                            <div id="storyboard-tile" class="storyboard-tile"></div>
+                            <video id="storyboard-proxy" class="storyboard-proxy" muted preload="metadata" style="display: none;"></video>
+                            <input type="range" id="storyboard-scrubber" class="storyboard-scrubber" min="0" max="0" step="0.1" value="0">
+                            <div class="storyboard-controls">
+                                <button class="extract-btn" onclick="setCutPoint('start-time')">Set Start</button>
+                                <span id="storyboard-time" class="storyboard-time">00:00:00</span>
+                                <button class="extract-btn" onclick="setCutPoint('end-time')">Set End</button>
+                            </div>
+                        </div>
+                    </div>
+                </div>
+                
+                <div id="downloaded-video-container" class="audio-player-container" style="display: none;">
+                    <video id="downloaded-video" controls preload="metadata" style="width: 100%; margin-bottom: 10px;"></video>
                 </div>
                 
                 <div id="loading" class="loading" style="display: none;">
@@ -273,6 +340,101 @@ function closeTool() {
     preview.classList.remove("active");
 }
 
+// Background Job Functions
+const JOB_POLL_INTERVAL_MS = 1000;
+
+function waitForJob(jobId, onProgress) {
+    // Follow a queued job until it finishes, resolving with its result.
+    // Progress is streamed over Server-Sent Events, falling back to polling.
+    return new Promise((resolve, reject) => {
+        const settle = job => {
+            if (job.status === 'finished') {
+                resolve(job.result);
+                return true;
+            }
+            if (job.status === 'failed' || !job.status) {
+                reject(new Error(job.error || 'Job failed'));
+                return true;
+            }
+            if (onProgress) onProgress(job);
+            return false;
+        };
+        
+        const poll = () => {
+            fetch(`/api/jobs/${encodeURIComponent(jobId)}`)
+            .then(response => response.json())
+            .then(job => {
+                if (!settle(job)) setTimeout(poll, JOB_POLL_INTERVAL_MS);
+            })
+            .catch(reject);
+        };
+        
+        if (!window.EventSource) {
+            poll();
+            return;
+        }
+        
+        const source = new EventSource(`/api/jobs/${encodeURIComponent(jobId)}/events`);
+        const onEvent = event => {
+            if (settle(JSON.parse(event.data))) source.close();
+        };
+        source.addEventListener('progress', onEvent);
+        source.addEventListener('finished', onEvent);
+        source.addEventListener('failed', onEvent);
+        source.onerror = () => {
+            // Stream unavailable or dropped (e.g. by a proxy): poll instead
+            source.close();
+            poll();
+        };
+    });
+}
+
+// Let the browser download a server file itself (resumable, nothing buffered in the page),
+// then ask the server to delete it; deletion waits until the transfer has finished
+function saveServerFile(fileUrl, deleteUrl, downloadName) {
+    const downloadLink = document.createElement('a');
+    downloadLink.href = `${fileUrl}?name=${encodeURIComponent(downloadName)}`;
+    downloadLink.download = downloadName;
+    document.body.appendChild(downloadLink);
+    downloadLink.click();
+    document.body.removeChild(downloadLink);
+    
+    fetch(deleteUrl, { method: 'DELETE' })
+        .then(res => res.json())
+        .then(data => {
+            console.log('Server file cleanup:', data.message || data.error);
+        })
+        .catch(err => {
+            console.warn('Could not delete server file:', err);
+        });
+}
+
+function formatBytes(bytes) {
+    if (bytes >= 1024 * 1024) return `${(bytes / (1024 * 1024)).toFixed(1)} MB`;
+    return `${Math.round(bytes / 1024)} KB`;
+}
+
+function updateLoadingProgress(loadingId, label, job) {
+    const text = document.querySelector(`#${loadingId} p`);
+    if (!text) return;
+    
+    const detail = job.detail || {};
+    let extra = '';
+    if (detail.speed) {
+        extra = ` (${formatBytes(detail.speed)}/s${detail.eta != null ? `, ${detail.eta}s left` : ''})`;
+    } else if (detail.frames_done) {
+        extra = detail.frames_total ? ` (${detail.frames_done}/${detail.frames_total})` : ` (${detail.frames_done} frames)`;
+    }
+    
+    if (job.status === 'queued') {
+        text.textContent = `${label} (queued)...`;
+    } else if (job.progress > 0) {
+        text.textContent = `${label} ${Math.floor(job.progress)}%${extra}`;
+    } else {
+        text.textContent = `${label}...${extra}`;
+    }
+}
+
 // YouTube Video Downloader Functions
 function extractVideoInfo() {
     const url = document.getElementById('youtube-url').value.trim();
@@ -319,6 +481,9 @@ function extractVideoInfo() {
             document.getElementById('video-thumbnail').src = data.thumbnail;
         }
         
+        // Timeline for picking the start and end times (built in the background)
+        loadStoryboard(url);
+        
     })
     .catch(error => {
         document.getElementById('loading').style.display = 'none';
@@ -330,6 +495,114 @@ function extractVideoInfo() {
     });
 }
 
+// Storyboard scrubber: sprite-sheet tiles follow the slider instantly, and the
+// low-resolution proxy (when the server keeps one) shows the exact frame on release
+const STORYBOARD_DISPLAY_WIDTH = 320;
+let storyboard = null;
+
+function formatTimestamp(seconds) {
+    const total = Math.max(0, Math.floor(seconds));
+    const pad = n => n.toString().padStart(2, '0');
+    return `${pad(Math.floor(total / 3600))}:${pad(Math.floor(total % 3600 / 60))}:${pad(total % 60)}`;
+}
+
+function loadStoryboard(url) {
+    const status = document.getElementById('storyboard-status');
+    storyboard = null;
+    document.getElementById('storyboard').style.display = 'block';
+    document.getElementById('storyboard-view').style.display = 'none';
+    status.style.display = 'block';
+    status.textContent = 'Building timeline...';
+    
+    fetch('/api/youtube/storyboard', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ url: url })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.error) {
+            throw new Error(data.error);
+        }
+        return waitForJob(data.job_id, job => {
+            status.textContent = job.progress > 0 ? `Building timeline ${Math.floor(job.progress)}%...` : 'Building timeline...';
+        });
+    })
+    .then(data => {
+        // Ignore the result if another video was looked up meanwhile
+        const input = document.getElementById('youtube-url');
+        if (!input || input.value.trim() !== url) return;
+        
+        storyboard = data;
+        const base = `/api/youtube/storyboard/${encodeURIComponent(data.storyboard_folder)}/`;
+        storyboard.sheetUrls = data.sheets.map(name => `${base}${encodeURIComponent(name)}?inline=1`);
+        storyboard.sheetUrls.forEach(src => { new Image().src = src; });  // fetch all sheets up front
+        
+        const proxy = document.getElementById('storyboard-proxy');
+        proxy.removeAttribute('src');
+        if (data.proxy) {
+            proxy.src = `${base}${encodeURIComponent(data.proxy)}?inline=1`;
+        }
+        
+        const scrubber = document.getElementById('storyboard-scrubber');
+        scrubber.max = data.duration || data.times[data.times.length - 1] || 0;
+        scrubber.value = 0;
+        scrubber.oninput = () => showStoryboardTime(parseFloat(scrubber.value), false);
+        scrubber.onchange = () => showStoryboardTime(parseFloat(scrubber.value), true);
+        
+        status.style.display = 'none';
+        document.getElementById('storyboard-view').style.display = 'block';
+        showStoryboardTime(0, false);
+    })
+    .catch(error => {
+        status.textContent = `Timeline unavailable: ${error.message}`;
+    });
+}
+
+function showStoryboardTime(seconds, exact) {
+    if (!storyboard || !storyboard.times.length) return;
+    document.getElementById('storyboard-time').textContent = formatTimestamp(seconds);
+    
+    const tile = document.getElementById('storyboard-tile');
+    const proxy = document.getElementById('storyboard-proxy');
+    if (exact && proxy.getAttribute('src')) {
+        proxy.currentTime = seconds;
+        proxy.style.display = 'block';
+        tile.style.display = 'none';
+        return;
+    }
+    
+    // Last tile at or before the time (times are ascending)
+    const times = storyboard.times;
+    let low = 0, high = times.length - 1;
+    while (low < high) {
+        const mid = (low + high + 1) >> 1;
+        if (times[mid] <= seconds) low = mid; else high = mid - 1;
+    }
+    
+    const perSheet = storyboard.columns * storyboard.rows;
+    const slot = low % perSheet;
+    const scale = STORYBOARD_DISPLAY_WIDTH / storyboard.tile_width;
+    const x = (slot % storyboard.columns) * storyboard.tile_width * scale;
+    const y = Math.floor(slot / storyboard.columns) * storyboard.tile_height * scale;
+    tile.style.width = `${STORYBOARD_DISPLAY_WIDTH}px`;
+    tile.style.height = `${Math.round(storyboard.tile_height * scale)}px`;
+    tile.style.backgroundImage = `url("${storyboard.sheetUrls[Math.floor(low / perSheet)]}")`;
+    tile.style.backgroundSize = `${storyboard.columns * storyboard.tile_width * scale}px auto`;
+    tile.style.backgroundPosition = `-${x}px -${y}px`;
+    tile.style.display = 'block';
+    proxy.style.display = 'none';
+}
+
+function setCutPoint(inputId) {
+    if (!storyboard) return;
+    const seconds = parseFloat(document.getElementById('storyboard-scrubber').value);
+    // Times are whole seconds: round the end up so the picked frame stays inside the cut
+    document.getElementById(inputId).value = formatTimestamp(inputId === 'end-time' ? Math.ceil(seconds) : seconds);
+}
+
 function downloadVideo() {
     const url = document.getElementById('youtube-url').value.trim();
     const startTime = document.getElementById('start-time').value.trim();
@@ -343,6 +616,7 @@ function downloadVideo() {
     // Show loading
     document.getElementById('loading').style.display = 'block';
     document.getElementById('error-message').style.display = 'none';
+    document.getElementById('downloaded-video-container').style.display = 'none';
     
     // Disable buttons
     document.getElementById('extract-btn').disabled = true;
@@ -357,7 +631,8 @@ function downloadVideo() {
         body: JSON.stringify({ 
             url: url,
             start_time: startTime || null,
-            end_time: endTime || null
+            end_time: endTime || null,
+            exact_cut: document.getElementById('exact-cut').checked
         })
     })
     .then(response => response.json())
@@ -366,47 +641,25 @@ function downloadVideo() {
             throw new Error(data.error);
         }
         
+        // Wait for the queued download to finish
+        return waitForJob(data.job_id, job => updateLoadingProgress('loading', 'Downloading', job));
+    })
+    .then(data => {
         // Hide loading
         document.getElementById('loading').style.display = 'none';
         
         // Show success message
         showSuccess('Download completed! File is being saved to your Downloads folder.');
         
-        // Automatically trigger file download using fetch + blob for better control
+        // Seekable preview (ranged requests keep the file on the server while it plays)
         const fileId = data.file_id;
         const downloadName = data.download_name || data.file_id;
-        fetch(`/api/youtube/get-file/${encodeURIComponent(fileId)}`)
-            .then(response => {
-                if (!response.ok) throw new Error('Failed to download file');
-                return response.blob();
-            })
-            .then(blob => {
-                // Create download link from blob
-                const url = window.URL.createObjectURL(blob);
-                const downloadLink = document.createElement('a');
-                downloadLink.href = url;
-                downloadLink.download = downloadName;
-                document.body.appendChild(downloadLink);
-                downloadLink.click();
-                document.body.removeChild(downloadLink);
-                window.URL.revokeObjectURL(url);
-                
-                // Now delete the file from server since download is complete
-                fetch(`/api/youtube/delete-file/${encodeURIComponent(fileId)}`, {
-                    method: 'DELETE'
-                })
-                .then(res => res.json())
-                .then(delData => {
-                    console.log('Server file cleanup:', delData.message || delData.error);
-                })
-                .catch(err => {
-                    console.warn('Could not delete server file:', err);
-                });
-            })
-            .catch(err => {
-                console.error('Download error:', err);
-                showError('Failed to save file to your computer');
-            });
+        const fileUrl = `/api/youtube/get-file/${encodeURIComponent(fileId)}`;
+        document.getElementById('downloaded-video').src = `${fileUrl}?inline=1`;
+        document.getElementById('downloaded-video-container').style.display = 'block';
+        
+        // Save the file and let the server delete it once the transfers are done
+        saveServerFile(fileUrl, `/api/youtube/delete-file/${encodeURIComponent(fileId)}`, downloadName);
         
         // Re-enable buttons
         document.getElementById('extract-btn').disabled = false;
@@ -489,6 +742,7 @@ function extractAudio() {
     // Create FormData for file upload
     const formData = new FormData();
     formData.append('video_file', videoFile);
+    formData.append('audio_format', document.getElementById('audio-format').value);
     
     fetch('/api/audio/extract', {
         method: 'POST',
@@ -500,6 +754,10 @@ function extractAudio() {
             throw new Error(data.error);
         }
         
+        // Wait for the queued extraction to finish
+        return waitForJob(data.job_id, job => updateLoadingProgress('audio-loading', 'Extracting audio', job));
+    })
+    .then(data => {
         // Hide loading
         document.getElementById('audio-loading').style.display = 'none';
         
@@ -508,7 +766,7 @@ function extractAudio() {
         
         // Set audio source
         const audioPlayer = document.getElementById('audio-player');
-        audioPlayer.src = `/api/audio/get-file/${encodeURIComponent(data.file_id)}`;
+        audioPlayer.src = `/api/audio/get-file/${encodeURIComponent(data.file_id)}?inline=1`;
         
         // Update info
         document.getElementById('audio-filename').textContent = data.download_name || data.file_id;
@@ -540,41 +798,10 @@ function downloadAudio() {
         return;
     }
     
-    // Trigger download
-    fetch(`/api/audio/get-file/${encodeURIComponent(fileId)}`)
-        .then(response => {
-            if (!response.ok) throw new Error('Failed to download file');
-            return response.blob();
-        })
-        .then(blob => {
-            const url = window.URL.createObjectURL(blob);
-            const downloadLink = document.createElement('a');
-            downloadLink.href = url;
-            downloadLink.download = downloadName || fileId;
-            document.body.appendChild(downloadLink);
-            downloadLink.click();
-            document.body.removeChild(downloadLink);
-            window.URL.revokeObjectURL(url);
-            
-            // Show success message
-            showAudioSuccess('Audio downloaded successfully!');
-            
-            // Delete the audio file from server
-            fetch(`/api/audio/delete-file/${encodeURIComponent(fileId)}`, {
-                method: 'DELETE'
-            })
-            .then(res => res.json())
-            .then(data => {
-                console.log('Server file cleanup:', data.message || data.error);
-            })
-            .catch(err => {
-                console.warn('Could not delete server file:', err);
-            });
-        })
-        .catch(err => {
-            console.error('Download error:', err);
-            showAudioError('Failed to download audio file');
-        });
+    // Trigger download (the server keeps the file until the transfer has finished)
+    saveServerFile(`/api/audio/get-file/${encodeURIComponent(fileId)}`,
+                   `/api/audio/delete-file/${encodeURIComponent(fileId)}`, downloadName || fileId);
+    showAudioSuccess('Audio download started!');
 }
 
 function showAudioError(message) {
@@ -677,8 +904,12 @@ function updateExtractionParam() {
         } else if (mode === 'every_nth') {
             paramLabel.textContent = 'Extract Every Nth Frame';
             paramInput.value = '10';
+        } else if (mode === 'scene') {
+            paramLabel.textContent = 'Maximum Frames';
+            paramInput.value = '200';
         }
     }
+    document.getElementById('threshold-group').style.display = mode === 'scene' ? 'block' : 'none';
 }
 
 function extractFrames() {
@@ -710,6 +941,13 @@ function extractFrames() {
     formData.append('video_file', videoFile);
     formData.append('extraction_mode', extractionMode);
     formData.append('param_value', paramValue);
+    if (extractionMode === 'scene') {
+        formData.append('threshold', document.getElementById('scene-threshold').value);
+    }
+    formData.append('output_format', document.getElementById('frame-format').value);
+    formData.append('quality', document.getElementById('frame-quality').value);
+    formData.append('max_dimension', document.getElementById('frame-max-dimension').value);
+    formData.append('grayscale', document.getElementById('frame-grayscale').checked);
     
     fetch('/api/frames/extract', {
         method: 'POST',
@@ -721,6 +959,10 @@ function extractFrames() {
             throw new Error(data.error);
         }
         
+        // Wait for the queued extraction to finish
+        return waitForJob(data.job_id, job => updateLoadingProgress('frames-loading', 'Extracting frames', job));
+    })
+    .then(data => {
         // Hide loading
         document.getElementById('frames-loading').style.display = 'none';
         
@@ -738,7 +980,8 @@ function extractFrames() {
             frameItem.style.animationDelay = `${index * 0.03}s`;
             
             const img = document.createElement('img');
-            img.src = `/api/frames/get-frame/${encodeURIComponent(data.frames_folder)}/${encodeURIComponent(filename)}`;
+            img.src = `/api/frames/get-frame/${encodeURIComponent(data.frames_folder)}/${encodeURIComponent(filename)}` +
+                (data.thumbnails ? '?size=thumb' : '');
             img.alt = filename;
             img.className = 'frame-image';
             img.loading = 'lazy';
@@ -782,42 +1025,16 @@ function downloadAllFrames() {
         return;
     }
     
-    // Trigger download
-    const downloadUrl = `/api/frames/download-all/${encodeURIComponent(folder)}`;
+    // Let the browser save the zip as it streams (it is never buffered in the page);
+    // the server removes the folder once the stream has been sent
+    const downloadLink = document.createElement('a');
+    downloadLink.href = `/api/frames/download-all/${encodeURIComponent(folder)}`;
+    downloadLink.download = `${folder}.zip`;
+    document.body.appendChild(downloadLink);
+    downloadLink.click();
+    document.body.removeChild(downloadLink);
     
-    fetch(downloadUrl)
-        .then(response => {
-            if (!response.ok) throw new Error('Failed to download frames');
-            return response.blob();
-        })
-        .then(blob => {
-            const url = window.URL.createObjectURL(blob);
-            const downloadLink = document.createElement('a');
-            downloadLink.href = url;
-            downloadLink.download = `${folder}.zip`;
-            document.body.appendChild(downloadLink);
-            downloadLink.click();
-            document.body.removeChild(downloadLink);
-            window.URL.revokeObjectURL(url);
-            
-            showFramesSuccess('Frames downloaded successfully!');
-            
-            // Delete the frames folder from server
-            fetch(`/api/frames/delete-folder/${encodeURIComponent(folder)}`, {
-                method: 'DELETE'
-            })
-            .then(res => res.json())
-            .then(delData => {
-                console.log('Server folder cleanup:', delData.message || delData.error);
-            })
-            .catch(err => {
-                console.warn('Could not delete server folder:', err);
-            });
-        })
-        .catch(err => {
-            console.error('Download error:', err);
-            showFramesError('Failed to download frames');
-        });
+    showFramesSuccess('Frames download started!');
 }
 
 function showFramesError(message) {
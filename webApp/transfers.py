@@ -0,0 +1,117 @@
+"""
+Bookkeeping of artifacts that are being sent to clients.
+
+A download may be fetched as many ranged requests (resumes, seeking in a
+preview), so deleting the file as soon as a client asks for it, or as soon as
+it expires, could break a transfer that is still running. Removals requested
+while an artifact is busy are deferred until no transfer has touched it for
+TRANSFER_LINGER_SECONDS. State is per process; deployments with several
+worker processes use shared_state.SharedTransferTracker instead.
+"""
+
+import threading
+import time
+
+# Seconds an artifact stays after its last transfer ends (or a client asked to
+# delete it), so interrupted downloads can be resumed
+TRANSFER_LINGER_SECONDS = 5 * 60
+
+# Expired hold times are dropped once this many have accumulated
+_MAX_IDLE_HOLDS = 1024
+
+
+class TransferTracker:
+    def __init__(self, remove_artifact, linger: float = TRANSFER_LINGER_SECONDS):
+        """
+        Initializes the tracker.
+
+        :param remove_artifact: Callable deleting an artifact by name.
+        :param linger: Seconds an artifact stays busy after its last transfer ended.
+        """
+        self._remove_artifact = remove_artifact
+        self.linger = linger
+        self._active = {}  # name -> number of running transfers
+        self._busy_until = {}  # name -> time the artifact may be removed
+        self._pending = {}  # name -> timer of a deferred removal
+        self._lock = threading.Lock()
+
+    def opened(self, name: str) -> None:
+        """Records the start of a transfer served by this process."""
+        with self._lock:
+            self._active[name] = self._active.get(name, 0) + 1
+
+    def closed(self, name: str, linger: float = None) -> None:
+        """
+        Records the end (or abort) of a transfer started with opened().
+
+        :param linger: Seconds the artifact stays busy (default: linger); 0 for
+                       transfers that cannot be resumed.
+        """
+        with self._lock:
+            count = self._active.pop(name, 0) - 1
+            if count > 0:
+                self._active[name] = count
+            self._hold(name, self.linger if linger is None else linger)
+
+    def hold(self, name: str, seconds: float = None) -> None:
+        """
+        Keeps an artifact for at least the given time (default: linger), e.g. for
+        a transfer handed off to the front-end server.
+        """
+        with self._lock:
+            self._hold(name, self.linger if seconds is None else seconds)
+
+    def _hold(self, name: str, seconds: float) -> None:
+        now = time.time()
+        if len(self._busy_until) > _MAX_IDLE_HOLDS:
+            self._busy_until = {key: until for key, until in self._busy_until.items()
+                                if until > now or key in self._pending}
+        self._busy_until[name] = max(self._busy_until.get(name, 0.0), now + seconds)
+        if name in self._pending:
+            self._schedule(name)
+
+    def busy(self, name: str) -> bool:
+        with self._lock:
+            return self._busy(name)
+
+    def _busy(self, name: str) -> bool:
+        return name in self._active or self._busy_until.get(name, 0.0) > time.time()
+
+    def remove(self, name: str) -> bool:
+        """
+        Deletes an artifact now, or once it is no longer busy.
+
+        :return: True if it was deleted now, False if the removal was deferred.
+        """
+        with self._lock:
+            if self._busy(name):
+                self._schedule(name)
+                return False
+            self._forget(name)
+        self._remove_artifact(name)
+        return True
+
+    def _schedule(self, name: str) -> None:
+        timer = self._pending.pop(name, None)
+        if timer is not None:
+            timer.cancel()
+        delay = max(0.0, self._busy_until.get(name, 0.0) - time.time())
+        timer = self._pending[name] = threading.Timer(delay, self._retry, (name,))
+        timer.daemon = True
+        timer.start()
+
+    def _retry(self, name: str) -> None:
+        with self._lock:
+            if name not in self._pending or name in self._active:
+                return  # rescheduled, or closed() will reschedule
+            if self._busy(name):
+                self._schedule(name)
+                return
+            self._forget(name)
+        self._remove_artifact(name)
+
+    def _forget(self, name: str) -> None:
+        self._busy_until.pop(name, None)
+        timer = self._pending.pop(name, None)
+        if timer is not None:
+            timer.cancel()
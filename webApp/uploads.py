@@ -0,0 +1,194 @@
+"""
+Streaming ingestion of uploaded videos.
+
+Werkzeug normally spools each multipart file into its own temporary file,
+which the routes then copy into the temp storage. StreamingRequest instead
+writes every chunk straight to its final location under UPLOAD_FOLDER,
+hashing it on the way, and rejects the upload as soon as the first bytes show
+it is not a video container. Uploads up to UPLOAD_MEMORY_LIMIT bytes stay in
+memory until a route asks for a file.
+"""
+
+import hashlib
+import io
+import os
+import struct
+import uuid
+
+from flask import Request, current_app
+
+# MPEG-TS packets are this long and each starts with the sync byte 0x47
+TS_PACKET_SIZE = 188
+
+# Bytes needed to recognise the container format (three MPEG-TS sync bytes)
+SNIFF_BYTES = 2 * TS_PACKET_SIZE + 1
+
+
+class UploadRejected(RuntimeError):
+    """Raised while receiving an upload whose header is not a known video container."""
+
+
+def sniff_container(header: bytes):
+    """
+    Identifies a video container from the first bytes of a file.
+
+    :param header: At least SNIFF_BYTES bytes (fewer if the file is shorter).
+    :return: Short container name (e.g. "mp4"), or None if unrecognised.
+    """
+    if header[4:8] in (b'ftyp', b'moov', b'mdat', b'free', b'wide', b'skip'):
+        return 'mp4'
+    if header.startswith(b'\x1a\x45\xdf\xa3'):
+        return 'matroska'
+    if header.startswith(b'RIFF') and header[8:12] == b'AVI ':
+        return 'avi'
+    if header.startswith(b'FLV'):
+        return 'flv'
+    if header.startswith(b'\x00\x00\x01\xba') or header.startswith(b'\x00\x00\x01\xb3'):
+        return 'mpeg'
+    if header.startswith(b'\x30\x26\xb2\x75\x8e\x66\xcf\x11'):
+        return 'asf'
+    if header.startswith(b'OggS'):
+        return 'ogg'
+    if len(header) >= TS_PACKET_SIZE and all(header[i] == 0x47 for i in range(0, len(header), TS_PACKET_SIZE)):
+        return 'mpegts'  # a sync byte at the start of every packet
+    return None
+
+
+def is_streamable(data: bytes, container: str) -> bool:
+    """
+    Whether a complete in-memory video can be decoded front to back from a pipe.
+
+    MP4/MOV files are only streamable when the index (moov box) precedes the
+    media data; the other recognised containers always are.
+    """
+    if container != 'mp4':
+        return True
+    offset = 0
+    while offset + 8 <= len(data):
+        size, box = struct.unpack('>I4s', data[offset:offset + 8])
+        if box == b'moov':
+            return True
+        if box == b'mdat':
+            return False
+        if size == 1 and offset + 16 <= len(data):
+            size = struct.unpack('>Q', data[offset + 8:offset + 16])[0]
+        if size < 8:
+            return False
+        offset += size
+    return False
+
+
+class UploadFile:
+    def __init__(self, folder: str, filename: str = None, memory_limit: int = 0):
+        """
+        A file-like upload target that hashes and validates data as it is written.
+
+        The file is removed on close() unless keep() was called.
+
+        :param folder: Folder receiving the upload.
+        :param filename: Client-side name, used only for the extension.
+        :param memory_limit: Uploads up to this size are held in memory until keep();
+                             larger ones are written to disk as they arrive.
+        """
+        suffix = os.path.splitext(filename or '')[1] or '.mp4'
+        self.path = os.path.join(folder, f"upload_{uuid.uuid4().hex}{suffix}")
+        self.size = 0
+        self.container = None
+        self.memory_limit = memory_limit
+        self._file = io.BytesIO() if memory_limit > 0 else open(self.path, 'w+b')
+        self._digest = hashlib.sha256()
+        self._header = b''
+        self._kept = False
+
+    @property
+    def in_memory(self) -> bool:
+        return isinstance(self._file, io.BytesIO)
+
+    def write(self, data: bytes) -> int:
+        if self.container is None:
+            self._header += data[:SNIFF_BYTES - len(self._header)]
+            if len(self._header) >= SNIFF_BYTES:
+                self._check_header()
+        self._digest.update(data)
+        self.size += len(data)
+        written = self._file.write(data)
+        if self.in_memory and self.size > self.memory_limit:
+            self._spill()
+        return written
+
+    def _spill(self) -> None:
+        """Moves an in-memory upload to its file."""
+        position = self._file.tell()
+        disk = open(self.path, 'w+b')
+        disk.write(self._file.getbuffer())
+        disk.seek(position)
+        self._file = disk
+
+    def getvalue(self):
+        """The upload as bytes if it is held in memory (validated), else None."""
+        if not self.in_memory:
+            return None
+        self.finish()
+        return self._file.getvalue()
+
+    def _check_header(self) -> None:
+        self.container = sniff_container(self._header)
+        if self.container is None:
+            self.discard()
+            raise UploadRejected("Uploaded file is not a supported video format")
+
+    def finish(self) -> None:
+        """Validates uploads shorter than SNIFF_BYTES and flushes the file to disk."""
+        if self.container is None:
+            self._check_header()
+        self._file.flush()
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+    def keep(self) -> str:
+        """Takes ownership of the file (it survives close()) and returns its path."""
+        self.finish()
+        if self.in_memory:
+            self._spill()
+        self._file.flush()
+        self._kept = True
+        return self.path
+
+    def discard(self) -> None:
+        in_memory = self.in_memory
+        self._file.close()
+        if in_memory:
+            return
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        if self._kept:
+            self._file.close()
+        else:
+            self.discard()
+
+    def __getattr__(self, name):
+        # read/seek/tell/flush... for FileStorage consumers
+        return getattr(self._file, name)
+
+
+class StreamingRequest(Request):
+    """Request whose uploaded files are streamed into app.config['UPLOAD_FOLDER']."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        folder = current_app.config.get('UPLOAD_FOLDER')
+        if folder is None:
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        upload = UploadFile(folder, filename, current_app.config.get('UPLOAD_MEMORY_LIMIT', 0))
+        self.__dict__.setdefault('_uploads', []).append(upload)
+        return upload
+
+    def close(self) -> None:
+        super().close()
+        # Also covers uploads orphaned by an aborted parse (size limit, rejected header)
+        for upload in self.__dict__.pop('_uploads', ()):
+            upload.close()
@@ -0,0 +1,17 @@
+"""
+WSGI entry point for production servers.
+
+    cd webApp && gunicorn -c gunicorn.conf.py wsgi:app
+
+Every worker process imports the app on its own. Jobs, the artifact
+registry, the reference counts of shared downloads and the result cache are
+shared through SQLite (see shared_state.py), so a job queued on one worker can
+be polled or streamed from any other, a delete landing on any worker sees every
+requester of a file, and the temp storage is swept by a single process per host.
+"""
+
+import os
+
+os.environ.setdefault('VIDEOPY_SHARED_STATE', '1')
+
+from app import app  # noqa: E402